@@ -0,0 +1,72 @@
+"""
+Measures the delay between a callback message being put on the emit queue and
+the asyncio loop handling it, comparing the old 50 ms polling loop with the
+EmitBridge used by `Chart.show_async`.
+
+    python benchmarks/event_latency.py [num_messages]
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts.chart import EmitBridge  # noqa: E402
+
+
+def produce(emit_queue, total):
+    for _ in range(total):
+        time.sleep(random.uniform(0.001, 0.02))
+        emit_queue.put(str(time.perf_counter()))
+    emit_queue.put("exit")
+
+
+async def polling(emit_queue):
+    latencies = []
+    while True:
+        while emit_queue.empty():
+            await asyncio.sleep(0.05)
+        message = emit_queue.get()
+        if message == "exit":
+            return latencies
+        latencies.append(time.perf_counter() - float(message))
+
+
+async def bridged(emit_queue):
+    latencies = []
+    bridge = EmitBridge(emit_queue, asyncio.get_running_loop())
+    while True:
+        for message in await bridge.get():
+            if message == "exit":
+                return latencies
+            latencies.append(time.perf_counter() - float(message))
+
+
+def run(consumer, total):
+    emit_queue = mp.Queue()
+    threading.Thread(target=produce, args=(emit_queue, total), daemon=True).start()
+    cpu = time.process_time()
+    latencies = asyncio.run(consumer(emit_queue))
+    cpu = time.process_time() - cpu
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "cpu": cpu * 1000,
+    }
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    for name, consumer in (("polling (old)", polling), ("EmitBridge", bridged)):
+        r = run(consumer, total)
+        print(
+            f"{name:<15} mean {r['mean']:7.2f} ms   p50 {r['p50']:7.2f} ms   "
+            f"p99 {r['p99']:7.2f} ms   cpu {r['cpu']:7.1f} ms"
+        )
@@ -0,0 +1,59 @@
+"""
+Compares the payload sent to the browser for a large candle series with and
+without level-of-detail mode, zoomed all the way out and zoomed in.
+
+    python benchmarks/lod.py [num_rows]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts import Chart  # noqa: E402
+
+
+def sent_bytes(chart, start):
+    return sum(len(script) for script in chart.win.scripts[start:])
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2000-01-01", periods=rows, freq="1min"),
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": np.ones(rows),
+        }
+    )
+    first, last = df["time"].iloc[[0, -1]].astype("datetime64[s]").astype(np.int64)
+
+    for mode in ("full", "lod"):
+        chart = Chart()
+        if mode == "lod":
+            chart.lod()
+        start = len(chart.win.scripts)
+        t = time.perf_counter()
+        chart.set(df)
+        set_time = time.perf_counter() - t
+        print(f"{mode:>4}: set {set_time * 1000:7.1f} ms, {sent_bytes(chart, start) / 1e6:7.1f} MB")
+        if mode == "lod":
+            for name, (a, b) in {
+                "zoomed out": (first, last),
+                "one day": (last - 86400, last),
+            }.items():
+                start = len(chart.win.scripts)
+                t = time.perf_counter()
+                chart._lod_range(str(a), str(b))
+                print(
+                    f"      {name}: {(time.perf_counter() - t) * 1000:6.1f} ms, "
+                    f"{sent_bytes(chart, start) / 1e6:6.2f} MB, level {chart._lod.level}"
+                )
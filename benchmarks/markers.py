@@ -0,0 +1,62 @@
+"""
+Compares creating markers one at a time, as marker_list used to, with
+markers_from_frame, which formats the times and shapes of all the rows at once.
+
+    python benchmarks/markers.py [num_markers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts.abstract import Window  # noqa: E402
+from lightweight_charts.util import marker_position, marker_shape  # noqa: E402
+
+
+def baseline(chart, markers):
+    for marker in markers:
+        chart.markers[chart.win._id_gen.generate()] = {
+            "time": chart._single_datetime_format(marker["time"]),
+            "position": marker_position(marker["position"]),
+            "color": marker["color"],
+            "shape": marker_shape(marker["shape"]),
+            "text": marker["text"],
+        }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "time": pd.Timestamp("2020-01-01")
+            + pd.to_timedelta(rng.integers(0, 10**8, count), unit="s"),
+            "position": rng.choice(["above", "below"], count),
+            "color": "#2196F3",
+            "shape": rng.choice(["arrow_up", "arrow_down"], count),
+            "text": "trade",
+        }
+    )
+    markers = df.to_dict("records")
+
+    from lightweight_charts import Chart
+
+    chart = Chart()
+    old_time = timed(baseline, chart, markers)
+    Window._id_gen.clear()
+    chart.markers.clear()
+    chart.win.scripts.clear()
+    new_time = timed(chart.markers_from_frame, df)
+    print(f"{count} markers")
+    print(f"per marker: {old_time * 1000:8.1f} ms")
+    print(f"frame:      {new_time * 1000:8.1f} ms")
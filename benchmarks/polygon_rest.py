@@ -0,0 +1,82 @@
+"""
+Times fetching minute bars from a local stand-in for the Polygon.io aggregates
+endpoint, which answers after `latency` seconds with at most `limit` bars a
+page. The REST client (chunked, concurrent, keep-alive, paginated) is compared
+with one `urlopen` per page and `pd.DataFrame(results)`.
+
+    python benchmarks/polygon_rest.py [days] [latency]
+"""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pandas as pd
+from lightweight_charts import polygon
+
+LATENCY = float(sys.argv[2]) if len(sys.argv) > 2 else 0.03
+
+
+class Aggs(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        *_, start, end = url.path.split("/")
+        query = parse_qs(url.query)
+        cursor, limit = int(query.get("cursor", [0])[0]), int(query["limit"][0])
+        first = np.datetime64(start, "m").astype(np.int64)
+        count = int((np.datetime64(end, "m") - np.datetime64(start, "m")).astype(int)) + 1440
+        minutes = np.arange(first + cursor, first + min(cursor + limit, count))
+        price = 100 + np.sin(minutes / 100)
+        results = [
+            {"t": int(t) * 60_000, "o": p, "h": p + 1, "l": p - 1, "c": p, "v": 100.0, "vw": p, "n": 10}
+            for t, p in zip(minutes.tolist(), price.tolist())
+        ]
+        data = {"status": "OK", "results": results}
+        if cursor + limit < count:
+            host, port = self.server.server_address
+            data["next_url"] = f"http://{host}:{port}{url.path}?cursor={cursor + limit}&limit={limit}"
+        body = json.dumps(data).encode()
+        time.sleep(LATENCY)
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def urlopen_pages(url):
+    frames = []
+    while url:
+        with urllib.request.urlopen(url) as response:
+            data = json.loads(response.read())
+        frames.append(pd.DataFrame(data["results"]))
+        url = data.get("next_url")
+    return pd.concat(frames)
+
+
+if __name__ == "__main__":
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Aggs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    polygon.PolygonAPI.base_url(f"http://127.0.0.1:{server.server_port}")
+    start, end = "2023-01-01", str(np.datetime64("2023-01-01") + days - 1)
+
+    begin = time.perf_counter()
+    df = urlopen_pages(polygon._aggs_url("X:BTCUSD", 1, "minute", start, end, 5_000))
+    print(f"urlopen per page: {len(df)} bars in {time.perf_counter() - begin:.2f}s")
+
+    begin = time.perf_counter()
+    df = polygon.get_bar_data("X:BTCUSD", "1min", start, end)
+    print(f"     rest client: {len(df)} bars in {time.perf_counter() - begin:.2f}s")
+    server.shutdown()
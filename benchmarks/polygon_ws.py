@@ -0,0 +1,105 @@
+"""
+Replays websocket frames of quotes and second aggregates into charts, once
+with a Series built and `update_from_tick` called per message (as before
+frames were batched), and once through `polygon._handle_frame`. The frames
+are generated from a seed, or read from a file of one frame per line, which
+`--record` writes for later runs.
+
+    python benchmarks/polygon_ws.py [frames] [messages_per_frame] [--record path | --replay path]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pandas as pd
+from lightweight_charts import Chart, polygon
+
+SYMBOLS = ("AAPL", "MSFT", "NVDA", "TSLA", "AMZN")
+START_MS = 1_700_000_000_000
+
+
+def generate(frames, size, seed=0):
+    rng = np.random.default_rng(seed)
+    prices = dict(zip(SYMBOLS, rng.uniform(100, 500, len(SYMBOLS))))
+    t = START_MS
+    for _ in range(frames):
+        messages = []
+        for symbol in rng.choice(SYMBOLS, size):
+            t += 2
+            if rng.random() < 0.1:
+                messages.append({"ev": "A", "sym": symbol, "v": float(rng.integers(1, 500)), "s": t, "e": t + 1000})
+                continue
+            prices[symbol] += rng.normal(0, 0.05)
+            price = round(prices[symbol], 2)
+            messages.append({"ev": "Q", "sym": symbol, "bp": price - 0.01, "ap": price + 0.01, "t": t})
+        yield json.dumps(messages)
+
+
+def charts():
+    result = {}
+    for symbol in SYMBOLS:
+        chart = Chart()
+        chart.set(pd.DataFrame({"time": [pd.to_datetime(START_MS - 60_000, unit="ms")], "open": [1.0],
+                                "high": [1.0], "low": [1.0], "close": [1.0], "volume": [0.0]}), interval=60)
+        result[symbol] = chart
+    return result
+
+
+def per_message(frames):
+    # the handling before frames were batched
+    lasts = {symbol: {"price": 0, "volume": 0, "precision": 2, "chart": chart} for symbol, chart in charts().items()}
+    for frame in frames:
+        for data in json.loads(frame):
+            state = lasts[data["sym"]]
+            if data["ev"] == "Q":
+                price = (data["bp"] + data["ap"]) / 2
+                if abs(price - state["price"]) < 0.01:
+                    continue
+                state["price"], state["volume"] = price, 0
+                state["time"] = pd.to_datetime(data["t"], unit="ms")
+            else:
+                state["volume"] = data["v"]
+                if "time" not in state:
+                    continue
+            series = pd.Series({"time": state["time"], "price": state["price"], "volume": state["volume"]})
+            state["chart"].update_from_tick(series, True)
+
+
+async def batched(frames):
+    for symbol, chart in charts().items():
+        polygon._lasts[symbol] = {"price": 0, "volume": 0, "precision": 2, "funcs": [(chart.tick, (True,), True)]}
+    for frame in frames:
+        polygon._handle_frame(frame, "sym")
+        await asyncio.sleep(0)
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    path = None
+    if "--record" in args or "--replay" in args:
+        flag = "--record" if "--record" in args else "--replay"
+        i = args.index(flag)
+        path = args[i + 1]
+        del args[i:i + 2]
+    if path and flag == "--replay":
+        with open(path) as file:
+            frames = file.read().splitlines()
+    else:
+        frames = list(generate(int(args[0]) if args else 200, int(args[1]) if len(args) > 1 else 500))
+        if path:
+            with open(path, "w") as file:
+                file.write("\n".join(frames))
+    messages = sum(frame.count('"ev"') for frame in frames)
+
+    start = time.perf_counter()
+    per_message(frames)
+    print(f"per message: {messages / (time.perf_counter() - start):>12,.0f} messages/s")
+
+    start = time.perf_counter()
+    asyncio.run(batched(frames))
+    print(f"    batched: {messages / (time.perf_counter() - start):>12,.0f} messages/s")
@@ -0,0 +1,64 @@
+"""
+Measures how many scripts per second `PyWV.loop` can evaluate, without a real
+webview. The baseline writes every script to disk before evaluating it, as the
+loop used to.
+
+    python benchmarks/pywv_loop.py [num_scripts]
+"""
+import os
+import queue
+import sys
+import tempfile
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts.chart import PyWV  # noqa: E402
+
+SCRIPT = "window.abcdefgh.series.update({\"time\":1700000000,\"open\":1.0,\"high\":2.0,\"low\":0.5,\"close\":1.5})"
+
+
+class FakeWindow:
+    def __init__(self, pywv, total, write_to=None):
+        self.pywv = pywv
+        self.total = total
+        self.count = 0
+        self.write_to = write_to
+
+    def evaluate_js(self, script):
+        if self.write_to:
+            with open(self.write_to, "w") as f:
+                f.write(script)
+        self.count += 1
+        if self.count == self.total:
+            self.pywv.is_alive = False
+
+
+def run(total, script_capture=0, write_to=None):
+    pywv = PyWV.__new__(PyWV)
+    pywv.queue = queue.SimpleQueue()
+    pywv.is_alive = True
+    pywv.backlog = deque()
+    pywv.captured_scripts = None
+    if script_capture:
+        pywv.captured_scripts = deque(maxlen=script_capture)
+    pywv.windows = [FakeWindow(pywv, total, write_to)]
+    for _ in range(total):
+        pywv.queue.put((0, SCRIPT))
+
+    start = time.perf_counter()
+    pywv.loop()
+    return total / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {
+            "write script.js per script (old)": run(total, write_to=os.path.join(tmp, "script.js")),
+            "no capture (default)": run(total),
+            "capture last 100 scripts": run(total, script_capture=100),
+        }
+    for name, rate in results.items():
+        print(f"{name:<35} {rate:>12,.0f} scripts/s")
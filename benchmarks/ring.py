@@ -0,0 +1,100 @@
+"""
+Measures how many bar updates per second a producer process can feed a chart,
+sending pd.Series bars through a multiprocessing.Queue to `update`, compared
+with writing them to a BarRing polled by a RingFeed. Excludes the time the
+window takes to run the updates.
+
+    python benchmarks/ring.py [num_updates]
+"""
+import multiprocessing as mp
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts import BarRing, Chart, RingFeed  # noqa: E402
+
+START = pd.Timestamp("2024-01-01").value
+MINUTE = 60 * 10**9
+
+
+def bar(i):
+    # four updates per minute bar
+    return START + i // 4 * MINUTE, 100.0, 101.0 + i % 4, 99.0, 100.0 + i % 4, 10.0 * i
+
+
+def seeded():
+    chart = Chart()
+    chart.set(
+        pd.DataFrame(
+            {
+                "time": [pd.Timestamp(START - MINUTE)],
+                "open": 100.0,
+                "high": 101.0,
+                "low": 99.0,
+                "close": 100.0,
+                "volume": 1.0,
+            }
+        )
+    )
+    return chart
+
+
+def queue_producer(queue, count):
+    for i in range(count):
+        t, o, h, l, c, v = bar(i)
+        queue.put(
+            pd.Series(
+                {"time": pd.Timestamp(t), "open": o, "high": h, "low": l, "close": c, "volume": v}
+            )
+        )
+    queue.put(None)
+
+
+def ring_producer(name, count):
+    ring = BarRing.attach(name)
+    for i in range(count):
+        ring.update(*bar(i))
+    ring.close()
+
+
+def run_queue(chart, count):
+    queue = mp.Queue()
+    process = mp.Process(target=queue_producer, args=(queue, count))
+    start = time.perf_counter()
+    process.start()
+    while (series := queue.get()) is not None:
+        chart.update(series)
+        chart.win.scripts.clear()
+    elapsed = time.perf_counter() - start
+    process.join()
+    return count / elapsed
+
+
+def run_ring(chart, count):
+    ring = BarRing.create(count)
+    feed = RingFeed(chart, ring, interval=60)
+    # the ring is empty, so the chart keeps its data
+    feed.poll()
+    process = mp.Process(target=ring_producer, args=(ring.name, count))
+    start = time.perf_counter()
+    process.start()
+    while process.is_alive():
+        feed.poll()
+        chart.win.scripts.clear()
+    feed.poll()
+    elapsed = time.perf_counter() - start
+    process.join()
+    ring.close()
+    ring.unlink()
+    return count / elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    print(f"{count} updates")
+    print(f"Queue + update:    {run_queue(seeded(), count):10,.0f} updates/s")
+    print(f"BarRing + RingFeed:{run_ring(seeded(), count):10,.0f} updates/s")
@@ -0,0 +1,55 @@
+"""
+Compares interval inference on a large frame against the previous approach,
+which counted the values of the gaps and of five datetime components over
+the whole time column.
+
+    python benchmarks/set_interval.py [num_rows]
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts.util import infer_interval, time_ns  # noqa: E402
+
+
+def baseline(df):
+    common_interval = df["time"].diff().value_counts()
+    interval = pd.Timedelta(common_interval.index[0]).total_seconds()
+    units = [
+        pd.Timedelta(microseconds=df["time"].dt.microsecond.value_counts().index[0]),
+        pd.Timedelta(seconds=df["time"].dt.second.value_counts().index[0]),
+        pd.Timedelta(minutes=df["time"].dt.minute.value_counts().index[0]),
+        pd.Timedelta(hours=df["time"].dt.hour.value_counts().index[0]),
+        pd.Timedelta(days=df["time"].dt.day.value_counts().index[0]),
+    ]
+    offset = 0
+    for value in units:
+        value = value.total_seconds()
+        if value == 0:
+            continue
+        elif value < interval:
+            offset = value
+        break
+    return interval, offset
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df = pd.DataFrame(
+        {"time": pd.date_range("2000-01-01 00:00:30", periods=rows, freq="1min")}
+    )
+    old, old_time = timed(baseline, df)
+    new, new_time = timed(lambda: infer_interval(*time_ns(df["time"])))
+    print(f"{rows} rows")
+    print(f"baseline: {old_time * 1000:8.1f} ms  {old}")
+    print(f"inferred: {new_time * 1000:8.1f} ms  {new}")
@@ -0,0 +1,61 @@
+"""
+Compares the size and build time of the scripts sent by `Chart.set_many` with
+calling `Chart.set` and then `Line.set` for each line. The chart is never
+shown; its scripts are only built.
+
+    python benchmarks/set_many.py [num_rows] [num_lines]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import numpy as np
+import pandas as pd
+from lightweight_charts import Chart
+
+
+def frame(rows, lines):
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2000-01-01", periods=rows, freq="1min"),
+            "open": close + rng.standard_normal(rows),
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(1, 1000, rows).astype(float),
+        }
+    )
+    for i in range(lines):
+        df[f"line {i}"] = close + i
+    return df
+
+
+def measure(df, lines, transport, many):
+    chart = Chart()
+    chart.data_transport(transport)
+    created = [chart.create_line(f"line {i}") for i in range(lines)]
+    chart.win.scripts.clear()
+    start = time.perf_counter()
+    if many:
+        chart.set_many(df)
+    else:
+        chart.set(df)
+        for line in created:
+            line.set(df[["time", line.name]])
+    elapsed = time.perf_counter() - start
+    return sum(map(len, chart.win.scripts)), elapsed
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    lines = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    df = frame(rows, lines)
+    for transport in ("json", "binary"):
+        for many in (False, True):
+            size, elapsed = measure(df, lines, transport, many)
+            name = "set_many" if many else "set + Line.set"
+            print(f"{transport:>6} {name:>15}: {size / 1e6:7.1f} MB {elapsed:6.2f}s")
@@ -0,0 +1,57 @@
+"""
+Measures the peak memory used by `Chart.set` on a large OHLCV frame, beyond the
+memory holding the frame itself. Each measurement runs in its own process, so
+the peaks don't mix. The chart is never shown; its scripts are only built.
+
+    python benchmarks/set_memory.py [num_rows]
+"""
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def peak_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure(rows, copy):
+    import numpy as np
+    import pandas as pd
+    from lightweight_charts import Chart
+
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(rows).cumsum()
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2000-01-01", periods=rows, freq="1min"),
+            "open": close + rng.standard_normal(rows),
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(1, 1000, rows).astype(float),
+        }
+    )
+    chart = Chart()
+    chart.data_transport("binary")
+    before = peak_mb()
+    if copy:
+        chart.set(df)
+    else:
+        chart.set(df, copy=False)
+    print(f"{peak_mb() - before:.1f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        measure(int(sys.argv[1]), sys.argv[2] == "copy")
+        sys.exit()
+    rows = sys.argv[1] if len(sys.argv) > 1 else "2000000"
+    print(f"{rows} rows, peak RSS added by set():")
+    for mode in ("copy", "nocopy"):
+        out = subprocess.run(
+            [sys.executable, __file__, rows, mode], capture_output=True, text=True
+        )
+        print(f"{mode:>8}: {out.stdout.strip() or out.stderr.strip()} MB")
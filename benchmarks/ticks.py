@@ -0,0 +1,77 @@
+"""
+Measures how many ticks per second update_from_tick, tick and
+update_from_ticks can take, excluding the time the window takes to run
+the updates.
+
+    python benchmarks/ticks.py [num_ticks]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from lightweight_charts import Chart  # noqa: E402
+
+
+def bars():
+    times = pd.date_range("2024-01-01", periods=1000, freq="1min")
+    prices = np.linspace(100, 110, len(times))
+    return pd.DataFrame(
+        {
+            "time": times,
+            "open": prices,
+            "high": prices + 1,
+            "low": prices - 1,
+            "close": prices,
+            "volume": 100.0,
+        }
+    )
+
+
+def ticks(count):
+    rng = np.random.default_rng(0)
+    start = pd.Timestamp("2024-01-01").value + 1000 * 60 * 10**9
+    times = start + np.cumsum(rng.integers(1, 100, count)) * 10**6
+    prices = 110 + np.cumsum(rng.normal(0, 0.01, count))
+    volumes = rng.integers(1, 10, count).astype(float)
+    return times.tolist(), prices.tolist(), volumes.tolist()
+
+
+def run(chart, func, count):
+    chart.set(bars())
+    chart.win.scripts.clear()
+    data = ticks(count)
+    start = time.perf_counter()
+    func(*data)
+    elapsed = time.perf_counter() - start
+    return count / elapsed
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    chart = Chart()
+
+    def series_ticks(times, prices, volumes):
+        for t, price, volume in zip(times, prices, volumes):
+            chart.update_from_tick(
+                pd.Series({"time": pd.Timestamp(t), "price": price, "volume": volume}),
+                cumulative_volume=True,
+            )
+
+    def raw_ticks(times, prices, volumes):
+        for t, price, volume in zip(times, prices, volumes):
+            chart.tick(t, price, volume, cumulative_volume=True)
+
+    def batch_ticks(times, prices, volumes):
+        chart.update_from_ticks(
+            time=np.array(times), price=prices, volume=volumes, cumulative_volume=True
+        )
+
+    print(f"{count} ticks")
+    print(f"update_from_tick: {run(chart, series_ticks, count):10,.0f} ticks/s")
+    print(f"tick:             {run(chart, raw_ticks, count):10,.0f} ticks/s")
+    print(f"update_from_ticks:{run(chart, batch_ticks, count):10,.0f} ticks/s")
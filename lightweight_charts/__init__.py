@@ -2,3 +2,5 @@ from .abstract import AbstractChart, Window
 from .chart import Chart
 from .widgets import JupyterChart
 from .polygon import PolygonChart
+from .resampler import Resampler
+from .ring import BarRing, RingFeed
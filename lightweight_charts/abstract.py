@@ -1,10 +1,18 @@
+import asyncio
+import concurrent.futures
 import json
 import os
+import time
 from base64 import b64decode
 from datetime import datetime
 from typing import Callable, Union, Literal, List, Optional, Dict
+import numpy as np
 import pandas as pd
 
+from .bars import Bar, BarStore
+from .history import HistoryPager, LOADER
+from .indicators import Indicator
+from .lod import LODPyramid
 from .table import Table
 from .toolbox import ToolBox
 from .drawings import (
@@ -19,6 +27,7 @@ from .drawings import (
 from .topbar import TopBar
 from .util import (
     BulkRunScript,
+    UpdateScheduler,
     Pane,
     Events,
     IDGen,
@@ -28,6 +37,9 @@ from .util import (
     TIME,
     NUM,
     FLOAT,
+    TRANSPORT,
+    INTERVAL,
+    NS,
     LINE_STYLE,
     MARKER_POSITION,
     MARKER_SHAPE,
@@ -36,6 +48,12 @@ from .util import (
     marker_position,
     marker_shape,
     js_data,
+    js_columns,
+    js_set_many,
+    infer_interval,
+    seconds,
+    time_ns,
+    map_unique,
 )
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -45,6 +63,7 @@ INDEX = os.path.join(current_dir, "js", "index.html")
 class Window:
     _id_gen = IDGen()
     handlers = {}
+    transport: TRANSPORT = "json"
 
     def __init__(
         self,
@@ -57,6 +76,7 @@ class Window:
         self.scripts = []
         self.final_scripts = []
         self.bulk_run = BulkRunScript(script_func)
+        self.scheduler = UpdateScheduler(script_func)
 
         if run_script:
             self.run_script = run_script
@@ -69,9 +89,9 @@ class Window:
             return
         self.loaded = True
 
-        if hasattr(self, "_return_q"):
+        if hasattr(self, "_returns"):
             while not self.run_script_and_get('document.readyState == "complete"'):
-                continue  # scary, but works
+                time.sleep(0.01)
 
         self.scripts.extend(self.final_scripts)
         if self.script_func is None:
@@ -87,6 +107,8 @@ class Window:
         if self.script_func is None:
             raise AttributeError("script_func has not been set")
         if self.loaded:
+            # pending updates must reach the window before anything after them
+            self.scheduler.flush()
             if self.bulk_run.enabled:
                 self.bulk_run.add_script(script)
             else:
@@ -96,12 +118,53 @@ class Window:
         else:
             self.scripts.append(script)
 
-    def run_script_and_get(self, script: str):
-        if not hasattr(self, "_return_q"):
-            raise AttributeError("Window instance has no attribute '_return_q'")
-        self.run_script(f"_~_~RETURN~_~_{script}")
+    def coalesce_updates(self, rate: Optional[float] = 60):
+        """
+        Batches live updates (`update`, `update_from_tick`, markers) into a single
+        script sent at most `rate` times per second. Only the latest state of each
+        bar is sent. `None` disables batching.\n
+        :return: the scheduler, whose `metrics` count received and merged updates.
+        """
+        self.scheduler.flush()
+        self.scheduler.rate = rate
+        return self.scheduler
+
+    def _queue_update(self, key, script: str, append: bool = False):
+        if self.loaded and self.scheduler.enabled and not self.bulk_run.enabled:
+            self.scheduler.add(key, script, append)
+        else:
+            self.run_script(script)
+
+    def run_script_and_get(self, script: str, timeout: Optional[float] = None):
+        """
+        Evaluates JavaScript within the Webview and returns its value.\n
+        :param timeout: seconds to wait for the value before raising `TimeoutError`.
+        """
+        future = self._request(script)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"no value returned within {timeout} seconds") from None
+
+    async def run_script_and_get_async(
+        self, script: str, timeout: Optional[float] = None
+    ):
+        """
+        Awaitable version of `run_script_and_get`. Any number of requests can be
+        in flight at once, and cancelling the awaiting task cancels the request.
+        """
+        return await asyncio.wait_for(
+            asyncio.wrap_future(self._request(script)), timeout
+        )
+
+    def _request(self, script: str) -> concurrent.futures.Future:
+        if not hasattr(self, "_returns"):
+            raise AttributeError("Window instance has no attribute '_returns'")
         # Use getattr to avoid static analysis error if attribute is not declared
-        return getattr(self, "_return_q").get()
+        request_id, future = getattr(self, "_returns").request()
+        self.run_script(f"_~_~RETURN~_~_{request_id}~_~_{script}")
+        return future
 
     def create_table(
         self,
@@ -164,52 +227,209 @@ class Window:
 
 
 class SeriesCommon(Pane):
+    _lod_kind = "minmax"
+
     def __init__(
         self, chart: "AbstractChart", name: str = "", pane_index: Optional[int] = None
     ):
         super().__init__(chart.win)
         self._chart = chart
         self._interval = chart._interval if hasattr(chart, "_interval") else 1
+        # the last bar, while it's being built by `tick`
+        self._tick_bar: Optional[Bar] = None
         self._last_bar = None
         self.name = name
         self.num_decimals = 2
         self.offset = 0
-        self.data = pd.DataFrame()
+        self._inferred = None
+        self._store = BarStore()
+        self._lod: Optional[LODPyramid] = None
+        self._history: Optional[HistoryPager] = None
         self.markers = {}
         self.pane_index = pane_index if pane_index is not None else 0
 
-    def _set_interval(self, df: pd.DataFrame):
-        if not pd.api.types.is_datetime64_any_dtype(df["time"]):
-            df["time"] = pd.to_datetime(df["time"])
-        common_interval = df["time"].diff().value_counts()
-        if common_interval.empty:
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._store.frame()
+
+    @data.setter
+    def data(self, df: pd.DataFrame):
+        self._store.set(df)
+
+    @property
+    def _last_bar(self) -> Optional[pd.Series]:
+        if self._tick_bar is not None:
+            self._last_series = self._tick_bar.series()
+            self._tick_bar = None
+        return self._last_series
+
+    @_last_bar.setter
+    def _last_bar(self, series: Optional[pd.Series]):
+        self._tick_bar = None
+        self._last_series = series
+
+    def max_bars(self, max_length: Optional[int] = None):
+        """
+        Limits the number of bars kept in `data` to the most recent `max_length`.\n
+        Older bars are discarded from memory, but remain displayed on the chart.
+        """
+        self._store.max_length = max_length
+        self._store.set(self._store.frame())
+
+    def lod(self, max_points: Optional[int] = 2000, factor: int = 4):
+        """
+        Enables level-of-detail mode, in which only the bars in view are sent to
+        the browser, at a resolution of at most `max_points` bars per screen.\n
+        Lower resolutions are precomputed by merging `factor` bars at a time
+        (OHLC for candles, the minimum and maximum for lines), and swapped in as
+        the visible range changes. `None` disables the mode.
+        """
+        if max_points is None:
+            self._lod = None
+            self.win.handlers.pop(f"lod{self.id}", None)
+            self._subscribe_range("lodHandler", "VisibleTimeRangeChange", None)
+            self._send(self._store.frame())
             return
-        # Ensure common_interval.index[0] is a scalar, not a tuple
-        interval_index = common_interval.index[0]
-        if isinstance(interval_index, tuple):
-            interval_index = interval_index[0]
-        self._interval = pd.Timedelta(interval_index).total_seconds()
-
-        def get_first_index_value(series):
-            idx = series.value_counts().index[0]
-            return idx[0] if isinstance(idx, tuple) else idx
-
-        units = [
-            pd.Timedelta(microseconds=get_first_index_value(df["time"].dt.microsecond)),
-            pd.Timedelta(seconds=get_first_index_value(df["time"].dt.second)),
-            pd.Timedelta(minutes=get_first_index_value(df["time"].dt.minute)),
-            pd.Timedelta(hours=get_first_index_value(df["time"].dt.hour)),
-            pd.Timedelta(days=get_first_index_value(df["time"].dt.day)),
-        ]
-        self.offset = 0
-        for value in units:
-            value = value.total_seconds()
-            if value == 0:
-                continue
-            elif value >= self._interval:
-                break
-            self.offset = value
-            break
+        self._lod = LODPyramid(self._store, self._lod_kind, max_points, factor)
+        self.win.handlers[f"lod{self.id}"] = self._lod_range
+        self._subscribe_range("lodHandler", "VisibleTimeRangeChange", f"""
+            if (range) {self.id}.lodHandlerTimer = setTimeout(() => window.callbackFunction(`lod{self.id}_~_${{range.from}};;;${{range.to}}`), 50)
+        """)
+        if len(self._store):
+            self._send(self._lod_tail())
+
+    def history(
+        self,
+        loader: LOADER,
+        page_size: int = 500,
+        threshold: int = 100,
+        prefetch: int = 1,
+    ) -> HistoryPager:
+        """
+        Loads older bars as the user scrolls back, rather than setting the whole history up front.\n
+        :param loader: an async function `loader(before, limit)` returning up to `limit` bars before the timestamp `before` (the most recent bars if it is None). Once history runs out, it should return an empty DataFrame or None.
+        :param page_size: the number of bars requested at a time.
+        :param threshold: a page is shown once fewer than this many bars are left to the left of the visible range.
+        :param prefetch: the number of pages loaded ahead of those shown.
+        :return: the pager; `await pager.start()` sets the series to the most recent page.
+        """
+        if self._history is not None:
+            self._history.reset()
+        self._history = HistoryPager(self, loader, page_size, threshold, prefetch)
+        self.win.handlers[f"history{self.id}"] = self._history_range
+        self._subscribe_range("historyHandler", "VisibleLogicalRangeChange", f"""
+            {self.id}.historyHandlerTimer = setTimeout(() => {{
+                let barsInfo = range && {self.id}.series.barsInLogicalRange(range)
+                if (barsInfo) window.callbackFunction(`history{self.id}_~_${{barsInfo.barsBefore}}`)
+            }}, 50)
+        """)
+        return self._history
+
+    def _history_range(self, bars_before: str):
+        # the page loads in a task, so that other events are handled meanwhile
+        if self._history is not None:
+            self._history.schedule_range(float(bars_before))
+
+    def _subscribe_range(self, name: str, event: str, body: Optional[str]):
+        # the handler is kept on the series, so that it is only subscribed once
+        handler = f"{self.id}.{name}"
+        script = f"""
+        {{
+            let timeScale = {self._chart.id}.chart.timeScale()
+            if ({handler}) {{
+                clearTimeout({handler}Timer)
+                timeScale.unsubscribe{event}({handler})
+                {handler} = undefined
+            }}
+        """
+        if body is not None:
+            script += f"""
+            {handler} = (range) => {{
+                clearTimeout({handler}Timer)
+                {body.strip()}
+            }}
+            timeScale.subscribe{event}({handler})
+        """
+        self.run_script(script + "}")
+
+    def _page_format(self, df: pd.DataFrame) -> pd.DataFrame:
+        df = self._df_datetime_format(
+            df, exclude_lowercase=self.name, interval=self._interval, offset=self.offset
+        )
+        if self.name:
+            df.columns = ["value" if c == self.name else c for c in df.columns]
+        return df
+
+    def _prepend(self, df: pd.DataFrame):
+        # the visible range is moved with the bars, so the view doesn't jump
+        self._store.prepend(df)
+        self.run_script(f"""
+        {{
+            let timeScale = {self._chart.id}.chart.timeScale()
+            let logical = timeScale.getVisibleLogicalRange()
+            {self._prepend_script(df)}
+            if (logical) timeScale.setVisibleLogicalRange({{from: logical.from + {len(df)}, to: logical.to + {len(df)}}})
+        }}
+        """)
+
+    def _prepend_script(self, df: pd.DataFrame) -> str:
+        return f"{self.id}.series.setData({self._js_data(df)}.concat({self.id}.series.data()))"
+
+    def _lod_tail(self) -> pd.DataFrame:
+        self._lod.refresh()
+        return self._lod.tail()
+
+    def _lod_range(self, start_time: str, end_time: str):
+        if self._lod is None or not len(self._store):
+            return
+        start_time, end_time = float(start_time), float(end_time)
+        self._lod.refresh()
+        if not self._lod.needs_load(start_time, end_time):
+            return
+        self._send(self._lod.load(start_time, end_time))
+        self.run_script(
+            f"{self._chart.id}.chart.timeScale().setVisibleRange({{from: {start_time}, to: {end_time}}})"
+        )
+
+    def _send(self, df: pd.DataFrame):
+        self.run_script(f"{self.id}.series.setData({self._js_data(df)}); ")
+
+    def _set_stored(self, df: pd.DataFrame, copy: bool = True):
+        # for data sent to the browser along with other series
+        if self._history is not None:
+            self._history.reset()
+        self._store.set(df, copy=copy)
+        self._last_bar = df.iloc[-1] if len(df) else None
+
+    def _lod_bar(self, series: pd.Series) -> pd.Series:
+        # while a lower resolution is shown, updates go to its last bar
+        if self._lod is None:
+            return series
+        self._lod.refresh()
+        if self._lod.level == 0:
+            return series
+        return pd.Series(self._lod.last())
+
+    def _set_interval(
+        self,
+        utc: np.ndarray,
+        wall: np.ndarray,
+        interval: Optional[INTERVAL] = None,
+        offset: Optional[INTERVAL] = None,
+    ):
+        if interval is not None:
+            self._interval = seconds(interval)
+            self.offset = seconds(offset) if offset is not None else 0
+            return
+        # inference is skipped if the data spans the same bars as last time
+        key = (len(utc), int(utc[0]), int(utc[-1])) if len(utc) else None
+        if key is None or self._inferred is None or self._inferred[0] != key:
+            inferred = infer_interval(utc, wall)
+            self._inferred = None if inferred is None else (key, *inferred)
+        if self._inferred is not None:
+            self._interval, self.offset = self._inferred[1:]
+        if offset is not None:
+            self.offset = seconds(offset)
 
     @staticmethod
     def _format_labels(data, labels, index, exclude_lowercase):
@@ -227,13 +447,21 @@ class SeriesCommon(Pane):
             labels = [*labels, "time"]
         return labels
 
-    def _df_datetime_format(self, df: pd.DataFrame, exclude_lowercase=None):
-        df = df.copy()
+    def _df_datetime_format(
+        self,
+        df: pd.DataFrame,
+        exclude_lowercase=None,
+        interval: Optional[INTERVAL] = None,
+        offset: Optional[INTERVAL] = None,
+    ):
+        # a shallow copy; columns are replaced below, never written to
+        df = df.copy(deep=False)
         df.columns = self._format_labels(df, df.columns, df.index, exclude_lowercase)
-        self._set_interval(df)
         if not pd.api.types.is_datetime64_any_dtype(df["time"]):
             df["time"] = pd.to_datetime(df["time"])
-        df["time"] = df["time"].astype("int64") // 10**9
+        utc, wall = time_ns(df["time"])
+        self._set_interval(utc, wall, interval, offset)
+        df["time"] = utc // NS
         return df
 
     def _series_datetime_format(self, series: pd.Series, exclude_lowercase=None):
@@ -256,10 +484,23 @@ class SeriesCommon(Pane):
         arg = self._interval * (arg.timestamp() // self._interval) + self.offset
         return arg
 
-    def set(self, df: Optional[pd.DataFrame] = None, format_cols: bool = True, align_to: Optional[pd.Series] = None):
+    def _js_data(self, df: pd.DataFrame):
+        return js_columns(df) if self.win.transport == "binary" else js_data(df)
+
+    def set(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        format_cols: bool = True,
+        align_to: Optional[pd.Series] = None,
+        interval: Optional[INTERVAL] = None,
+        offset: Optional[INTERVAL] = None,
+        copy: bool = True,
+    ):
+        if self._history is not None:
+            self._history.reset()
         if df is None or df.empty:
             self.run_script(f"{self.id}.series.setData([])")
-            self.data = pd.DataFrame()
+            self._store.clear()
             return
         if align_to is not None:
             # align_to can be a Series (for example, df['date']) or a DataFrame with a 'time' column
@@ -269,31 +510,111 @@ class SeriesCommon(Pane):
                 align_index = align_to
             df = df.set_index('time').reindex(align_index).reset_index()
         if format_cols:
-            df = self._df_datetime_format(df, exclude_lowercase=self.name)
+            df = self._df_datetime_format(
+                df, exclude_lowercase=self.name, interval=interval, offset=offset
+            )
         if self.name:
             if self.name not in df:
                 raise NameError(f'No column named "{self.name}".')
-            df = df.rename(columns={self.name: "value"})
-        self.data = df.copy()
+            df = df.copy(deep=False)
+            df.columns = ["value" if c == self.name else c for c in df.columns]
+        self._store.set(df, copy=copy)
         self._last_bar = df.iloc[-1]
-        self.run_script(f"{self.id}.series.setData({js_data(df)}); ")
+        self._send(df if self._lod is None else self._lod_tail())
 
     def update(self, series: pd.Series):
         series = self._series_datetime_format(series, exclude_lowercase=self.name)
         if self.name in series.index:
             series.rename({self.name: "value"}, inplace=True)
-        if self._last_bar is not None and series["time"] != self._last_bar["time"]:
-            self.data.loc[self.data.index[-1]] = self._last_bar
-            self.data = pd.concat([self.data, series.to_frame().T], ignore_index=True)
+        if self._last_bar is not None and series["time"] == self._last_bar["time"]:
+            self._store.update_last(series)
+        else:
+            self._store.append(series)
         self._last_bar = series
-        self.run_script(f"{self.id}.series.update({js_data(series)})")
+        bar = self._lod_bar(series)
+        self.win._queue_update(
+            (self.id, bar["time"]), f"{self.id}.series.update({js_data(bar)})"
+        )
 
-    def _update_markers(self):
-        self.run_script(
-            f"LightweightCharts.createSeriesMarkers({self.id}.series, {json.dumps(list(self.markers.values()))});"
+    def _marker_script(self, method: str, *args) -> str:
+        args = ", ".join(json.dumps(arg) for arg in args)
+        return f"Lib.MarkerStore.of({self.id}.series).{method}({args});"
+
+    def _update_markers(self, method: str, *args):
+        # marker changes are deltas, so every one is kept until the next flush
+        self.win._queue_update(
+            (self.id, "markers"), self._marker_script(method, *args), append=True
         )
 
-        # f"{self.id}.series.setMarkers({json.dumps(list(self.markers.values()))})"
+    def _add_markers(self, markers: Dict[str, dict]):
+        self.markers.update(markers)
+        self._update_markers(
+            "add",
+            sorted(
+                ({"id": marker_id, **marker} for marker_id, marker in markers.items()),
+                key=lambda marker: marker["time"],
+            ),
+        )
+
+    def _times_format(self, column: pd.Series) -> np.ndarray:
+        # the vectorized form of _single_datetime_format
+        if not pd.api.types.is_datetime64_any_dtype(column):
+            if pd.api.types.is_numeric_dtype(column):
+                column = pd.to_datetime(column, unit="ms")
+            else:
+                column = pd.to_datetime(column)
+        utc, _ = time_ns(column)
+        return self._interval * (utc / NS // self._interval) + self.offset
+
+    def markers_from_frame(
+        self,
+        df: pd.DataFrame,
+        position: MARKER_POSITION = "below",
+        shape: MARKER_SHAPE = "arrow_up",
+        color: str = "#2196F3",
+        text: str = "",
+    ) -> List[str]:
+        """
+        Creates a marker for each row of the DataFrame.\n
+        :param df: A DataFrame with a time or date column (or a datetime index), and
+        optionally position, shape, color and text columns. The keyword arguments
+        are used for the columns not given.
+        :return: a list of marker ids, in the order of the rows.
+        """
+        df = df.copy(deep=False)
+        df.columns = self._format_labels(df, df.columns, df.index, None)
+        times = self._times_format(df["time"])
+        count = len(df)
+
+        def column(key, default, func=None):
+            if key not in df:
+                return np.full(count, default if func is None else func(default), dtype=object)
+            values = df[key].to_numpy(dtype=object)
+            # cells left empty take the default too
+            missing = pd.isna(values)
+            if missing.any():
+                values = np.where(missing, default, values)
+            return values if func is None else map_unique(values, func)
+
+        marker_ids = self.win._id_gen.generate_block(count)
+        # sent in time order, so that the browser can merge them in one pass
+        order = np.argsort(times, kind="stable")
+        columns = {
+            "id": np.array(marker_ids, dtype=object)[order].tolist(),
+            "time": times[order].astype(np.int64).tolist(),
+            "position": column("position", position, marker_position)[order].tolist(),
+            "color": column("color", color)[order].tolist(),
+            "shape": column("shape", shape, marker_shape)[order].tolist(),
+            "text": column("text", text)[order].tolist(),
+        }
+        self.markers.update(
+            {
+                marker_id: {"time": t, "position": p, "color": c, "shape": sh, "text": tx}
+                for marker_id, t, p, c, sh, tx in zip(*columns.values())
+            }
+        )
+        self._update_markers("addColumns", columns)
+        return marker_ids
 
     def marker_list(self, markers: list):
         """
@@ -306,20 +627,7 @@ class SeriesCommon(Pane):
         ]
         :return: a list of marker ids.
         """
-        markers = markers.copy()
-        marker_ids = []
-        for marker in markers:
-            marker_id = self.win._id_gen.generate()
-            self.markers[marker_id] = {
-                "time": self._single_datetime_format(marker["time"]),
-                "position": marker_position(marker["position"]),
-                "color": marker["color"],
-                "shape": marker_shape(marker["shape"]),
-                "text": marker["text"],
-            }
-            marker_ids.append(marker_id)
-        self._update_markers()
-        return marker_ids
+        return self.markers_from_frame(pd.DataFrame(markers))
 
     def marker(
         self,
@@ -348,23 +656,51 @@ class SeriesCommon(Pane):
         except TypeError as e:
             raise TypeError("Chart marker created before data was set.") from e
         marker_id = self.win._id_gen.generate()
-
-        self.markers[marker_id] = {
-            "time": int(formatted_time),
-            "position": marker_position(position),
-            "color": color,
-            "shape": marker_shape(shape),
-            "text": text,
-        }
-        self._update_markers()
+        self._add_markers(
+            {
+                marker_id: {
+                    "time": int(formatted_time),
+                    "position": marker_position(position),
+                    "color": color,
+                    "shape": marker_shape(shape),
+                    "text": text,
+                }
+            }
+        )
         return marker_id
 
+    def update_marker(
+        self,
+        marker_id: str,
+        time: Optional[TIME] = None,
+        position: Optional[MARKER_POSITION] = None,
+        shape: Optional[MARKER_SHAPE] = None,
+        color: Optional[str] = None,
+        text: Optional[str] = None,
+    ):
+        """
+        Changes the given fields of the marker with the given id.\n
+        """
+        fields = {}
+        if time is not None:
+            fields["time"] = int(self._single_datetime_format(time))
+        if position is not None:
+            fields["position"] = marker_position(position)
+        if shape is not None:
+            fields["shape"] = marker_shape(shape)
+        if color is not None:
+            fields["color"] = color
+        if text is not None:
+            fields["text"] = text
+        self.markers[marker_id].update(fields)
+        self._update_markers("patch", marker_id, fields)
+
     def remove_marker(self, marker_id: str):
         """
         Removes the marker with the given id.\n
         """
         self.markers.pop(marker_id)
-        self._update_markers()
+        self._update_markers("remove", [marker_id])
 
     def horizontal_line(
         self,
@@ -438,7 +774,7 @@ class SeriesCommon(Pane):
         Clears the markers displayed on the data.\n
         """
         self.markers.clear()
-        self._update_markers()
+        self._update_markers("clear")
 
     def price_line(
         self, label_visible: bool = True, line_visible: bool = True, title: str = ""
@@ -627,6 +963,23 @@ class Line(SeriesCommon):
         null'''
         )
 
+    def _push_value(self, time: float, value: float):
+        # the scalar form of `update`, for values computed in Python
+        self._store_value(time, value)
+        self.win._queue_update(
+            (self.id, time),
+            f'{self.id}.series.update({{"time": {time}, "value": {value}}})',
+        )
+
+    def _store_value(self, time: float, value: float):
+        row = {"time": time, "value": value}
+        last = self._last_series
+        if last is not None and last["time"] == time:
+            self._store.patch_last(row)
+        else:
+            self._store.append(row)
+        self._last_series = row
+
     # def _set_trend(self, start_time, start_value, end_time, end_value, ray=False, round=False):
     #     if round:
     #         start_time = self._single_datetime_format(start_time)
@@ -724,45 +1077,74 @@ class Histogram(SeriesCommon):
 
 
 class Candlestick(SeriesCommon):
+    _lod_kind = "ohlc"
+
     def __init__(self, chart: "AbstractChart"):
         super().__init__(chart)
         self._volume_up_color = "rgba(83,141,131,0.8)"
         self._volume_down_color = "rgba(200,127,130,0.8)"
+        # whether the volume bars are built by the chart window from the candles
+        self._derive_volume = False
 
-        self.candle_data = pd.DataFrame()
         self._lines = []
+        self._indicators: List[Indicator] = []
 
         # self.run_script(f'{self.id}.makeCandlestickSeries()')
 
-    def set(self, df: Optional[pd.DataFrame] = None, keep_drawings=False):
+    @property
+    def candle_data(self) -> pd.DataFrame:
+        return self._store.frame()
+
+    @candle_data.setter
+    def candle_data(self, df: pd.DataFrame):
+        self._store.set(df)
+
+    def set(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        keep_drawings=False,
+        interval: Optional[INTERVAL] = None,
+        offset: Optional[INTERVAL] = None,
+        copy: bool = True,
+    ):
         """
         Sets the initial data for the chart.\n
         :param df: columns: date/time, open, high, low, close, volume (if volume enabled).
         :param keep_drawings: keeps any drawings made through the toolbox. Otherwise, they will be deleted.
+        :param interval: the bar interval (seconds, or a string such as "5min"). Inferred from the data if not given.
+        :param offset: the offset of bar times within the interval. Inferred from the data if not given.
+        :param copy: if False, `data` references the given columns instead of copying them. They shouldn't be modified afterwards.
         """
+        if self._history is not None:
+            self._history.reset()
         if df is None or df.empty:
-            self.run_script(f"{self.id}.series.setData([])")
-            self.run_script(f"{self.id}.volumeSeries.setData([])")
-            self.candle_data = pd.DataFrame()
+            if self._derive_volume:
+                self.run_script(f"{self.id}.setCandles([])")
+            else:
+                self.run_script(f"{self.id}.series.setData([])")
+                self.run_script(f"{self.id}.volumeSeries.setData([])")
+            self._store.clear()
+            self._set_indicators()
             return
-        df = self._df_datetime_format(df)
-        self.candle_data = df.copy()
+        df = self._df_datetime_format(df, interval=interval, offset=offset)
+        self._store.set(df, copy=copy)
         self._last_bar = df.iloc[-1]
-        self.run_script(f"{self.id}.series.setData({js_data(df)})")
+        self._send(df if self._lod is None else self._lod_tail())
+        self._set_indicators()
 
         if "volume" not in df:
             return
-        volume = df.drop(columns=["open", "high", "low", "close"]).rename(
-            columns={"volume": "value"}
-        )
-        volume["color"] = self._volume_down_color
-        volume.loc[df["close"] > df["open"], "color"] = self._volume_up_color
-        self.run_script(f"{self.id}.volumeSeries.setData({js_data(volume)})")
 
         for line in self._lines:
             if line.name not in df.columns:
                 continue
-            line.set(df[["time", line.name]], format_cols=False)
+            line.set(
+                pd.DataFrame(
+                    {"time": df["time"], line.name: df[line.name]}, copy=False
+                ),
+                format_cols=False,
+                copy=copy,
+            )
         # set autoScale to true in case the user has dragged the price scale
         self.run_script(
             f"""
@@ -778,6 +1160,116 @@ class Candlestick(SeriesCommon):
         else:
             self.run_script(f"{self._chart.id}.toolBox?.clearDrawings()")
 
+    def set_many(
+        self,
+        df: Optional[pd.DataFrame],
+        lines: Optional[List["SeriesCommon"]] = None,
+        keep_drawings=False,
+        interval: Optional[INTERVAL] = None,
+        offset: Optional[INTERVAL] = None,
+        copy: bool = True,
+    ):
+        """
+        Sets the data of the chart, its volume, its indicators and its lines from
+        one DataFrame, in a single script holding the time column only once.\n
+        :param df: columns: date/time, open, high, low, close, volume (if volume enabled), and a column named after each line.
+        :param lines: The lines to set. By default, every line with a column in `df`.
+        """
+        empty = df is None or df.empty
+        if lines is None:
+            lines = [] if empty else [line for line in self._lines if line.name in df]
+        values = {line: None if empty else df[line.name].to_numpy() for line in lines}
+        if empty or any(s._lod is not None for s in (self, *lines)):
+            # the levels of detail are sent on their own
+            self.set(df, keep_drawings, interval, offset, copy)
+            for line, column in values.items():
+                if not empty and "volume" in df and line in self._lines:
+                    # already set along with the candles
+                    continue
+                line.set(
+                    None
+                    if empty
+                    else pd.DataFrame(
+                        {"time": self._store.column("time"), line.name: column}, copy=False
+                    ),
+                    format_cols=False,
+                )
+            return
+        if self._history is not None:
+            self._history.reset()
+        df = self._df_datetime_format(df, interval=interval, offset=offset)
+        self._store.set(df, copy=copy)
+        self._last_bar = df.iloc[-1]
+        time = df["time"]
+
+        keys = ("open", "high", "low", "close", "volume")[: 5 if self._derive_volume else 4]
+        series = [
+            (
+                self.id if self._derive_volume else f"{self.id}.series",
+                df[[key for key in keys if key in df]],
+            )
+        ]
+        if "volume" in df and not self._derive_volume:
+            series.append(
+                (f"{self.id}.volumeSeries", self._volume_frame(df).drop(columns="time"))
+            )
+        for line, column in values.items():
+            line._set_stored(pd.DataFrame({"time": time, "value": column}), copy)
+            series.append((f"{line.id}.series", pd.DataFrame({"value": column}, copy=False)))
+        columns = {key: self._store.column(key) for key in self._store.columns}
+        for indicator in self._indicators:
+            outputs = indicator._values(columns)
+            for output, line in indicator.lines.items():
+                column = outputs[output]
+                valid = ~np.isnan(column)
+                line._set_stored(
+                    pd.DataFrame({"time": time[valid], "value": column[valid]}), copy
+                )
+                series.append(
+                    (f"{line.id}.series", pd.DataFrame({"value": column}, copy=False))
+                )
+        self.run_script(js_set_many(time, series, self.win.transport == "binary"))
+
+        self.run_script(
+            f"""
+            if (!{self.id}.chart.priceScale("right")?.options?.autoScale)
+                {self.id}.chart.priceScale("right").applyOptions({{autoScale: true}})
+        """
+        )
+        if keep_drawings:
+            self.run_script(
+                f"{self._chart.id}.toolBox?._drawingTool.repositionOnTime()"
+            )
+        else:
+            self.run_script(f"{self._chart.id}.toolBox?.clearDrawings()")
+
+    def _volume_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        up = df["close"].to_numpy() > df["open"].to_numpy()
+        colors = np.array([self._volume_down_color, self._volume_up_color], dtype=object)
+        return pd.DataFrame(
+            {"time": df["time"], "value": df["volume"], "color": colors[up.view(np.int8)]},
+            copy=False,
+        )
+
+    def _send(self, df: pd.DataFrame):
+        if self._derive_volume:
+            self.run_script(f"{self.id}.setCandles({self._js_data(df)})")
+            return
+        self.run_script(f"{self.id}.series.setData({self._js_data(df)})")
+        if "volume" not in df:
+            return
+        volume = self._volume_frame(df)
+        self.run_script(f"{self.id}.volumeSeries.setData({self._js_data(volume)})")
+
+    def _prepend_script(self, df: pd.DataFrame) -> str:
+        if self._derive_volume:
+            return f"{self.id}.prependCandles({self._js_data(df)})"
+        script = super()._prepend_script(df)
+        if "volume" not in df:
+            return script
+        volume = self._volume_frame(df)
+        return f"{script}\n{self.id}.volumeSeries.setData({self._js_data(volume)}.concat({self.id}.volumeSeries.data()))"
+
     def update(self, series: pd.Series, _from_tick=False):
         """
         Updates the data from a bar;
@@ -786,25 +1278,36 @@ class Candlestick(SeriesCommon):
         """
         series = series if _from_tick else self._series_datetime_format(series)
         if series["time"] != self._last_bar["time"]:
-            self.candle_data.loc[self.candle_data.index[-1]] = self._last_bar
-            self.candle_data = pd.concat(
-                [self.candle_data, series.to_frame().T], ignore_index=True
-            )
+            self._store.append(series)
             self._chart.events.new_bar._emit(self)
+        else:
+            self._store.update_last(series)
 
         self._last_bar = series
-        self.run_script(f"{self.id}.series.update({js_data(series)})")
-        if "volume" not in series:
+        for indicator in self._indicators:
+            indicator._advance(series)
+        bar = self._lod_bar(series)
+        if self._derive_volume:
+            return self.win._queue_update(
+                (self.id, bar["time"]), f"{self.id}.updateCandle({js_data(bar)})"
+            )
+        self.win._queue_update(
+            (self.id, bar["time"]), f"{self.id}.series.update({js_data(bar)})"
+        )
+        if "volume" not in bar:
             return
-        volume = series.drop(["open", "high", "low", "close"]).rename(
+        volume = bar.drop(["open", "high", "low", "close"]).rename(
             {"volume": "value"}
         )
         volume["color"] = (
             self._volume_up_color
-            if series["close"] > series["open"]
+            if bar["close"] > bar["open"]
             else self._volume_down_color
         )
-        self.run_script(f"{self.id}.volumeSeries.update({js_data(volume)})")
+        self.win._queue_update(
+            (f"{self.id}.volumeSeries", bar["time"]),
+            f"{self.id}.volumeSeries.update({js_data(volume)})",
+        )
 
     def update_from_tick(self, series: pd.Series, cumulative_volume: bool = False):
         """
@@ -836,6 +1339,226 @@ class Candlestick(SeriesCommon):
                 bar["volume"] = series["volume"]
         self.update(bar, _from_tick=True)
 
+    def tick(
+        self,
+        time_ns: int,
+        price: float,
+        volume: Optional[float] = None,
+        cumulative_volume: bool = False,
+    ):
+        """
+        Updates the data from a tick, like `update_from_tick`, without creating
+        any pandas objects.\n
+        :param time_ns: The time of the tick, in nanoseconds since the epoch (UTC).
+        :param price: The price of the tick.
+        :param volume: The volume of the tick, if using volume.
+        :param cumulative_volume: Adds the given volume onto the latest bar.
+        """
+        time = self._interval * (time_ns / NS // self._interval) + self.offset
+        bar = self._current_bar()
+        if bar is not None and time < bar.time:
+            raise ValueError(
+                f'Trying to update tick of time "{pd.to_datetime(time, unit="s")}", which occurs before the last bar time of "{pd.to_datetime(bar.time, unit="s")}".'
+            )
+        if bar is not None and time == bar.time:
+            bar.tick(price, volume, cumulative_volume)
+            new = False
+        else:
+            bar = Bar(time, price, price, price, price, volume)
+            new = True
+        self._push_bar(bar, new)
+
+    def _current_bar(self) -> Optional[Bar]:
+        if self._tick_bar is None and self._last_series is not None:
+            return Bar.from_series(self._last_series)
+        return self._tick_bar
+
+    def _push_bar(self, bar: Bar, new: bool):
+        if self._lod is not None:
+            # the level shown decides what to send
+            return self.update(bar.series(), _from_tick=True)
+        if new:
+            self._store.append(bar.as_dict())
+        else:
+            # the time and open of the bar stay the same
+            row = {"high": bar.high, "low": bar.low, "close": bar.close}
+            if bar.volume is not None:
+                row["volume"] = bar.volume
+            self._store.patch_last(row)
+        self._tick_bar = bar
+        if new:
+            self._chart.events.new_bar._emit(self)
+        if self._indicators:
+            row = bar.as_dict()
+            for indicator in self._indicators:
+                indicator._advance(row)
+        candle = f'"time": {bar.time}, "open": {bar.open}, "high": {bar.high}, "low": {bar.low}, "close": {bar.close}'
+        if self._derive_volume:
+            if bar.volume is not None:
+                candle += f', "volume": {bar.volume}'
+            return self.win._queue_update(
+                (self.id, bar.time), f"{self.id}.updateCandle({{{candle}}})"
+            )
+        self.win._queue_update((self.id, bar.time), f"{self.id}.series.update({{{candle}}})")
+        if bar.volume is None:
+            return
+        color = (
+            self._volume_up_color if bar.close > bar.open else self._volume_down_color
+        )
+        self.win._queue_update(
+            (f"{self.id}.volumeSeries", bar.time),
+            f'{self.id}.volumeSeries.update({{"time": {bar.time}, "value": {bar.volume}, "color": "{color}"}})',
+        )
+
+    def update_from_ticks(
+        self,
+        df: Optional[pd.DataFrame] = None,
+        cumulative_volume: bool = False,
+        time: Optional[np.ndarray] = None,
+        price: Optional[np.ndarray] = None,
+        volume: Optional[np.ndarray] = None,
+    ):
+        """
+        Updates the data from many ticks at once, as `update_from_tick` would one
+        at a time, but only sends the final state of each bar.\n
+        :param df: columns: date/time, price, volume (if using volume). The
+        `time`, `price` and `volume` arrays can be given instead.
+        :param cumulative_volume: Adds the volume of the ticks onto their bar.
+        """
+        if df is not None:
+            df = df.copy(deep=False)
+            df.columns = self._format_labels(df, df.columns, df.index, None)
+            if not pd.api.types.is_datetime64_any_dtype(df["time"]):
+                df["time"] = pd.to_datetime(df["time"])
+            utc, _ = time_ns(df["time"])
+            price = df["price"].to_numpy(np.float64)
+            volume = df["volume"].to_numpy(np.float64) if "volume" in df else None
+        else:
+            utc = np.asarray(time)
+            if utc.dtype.kind == "M":
+                utc = utc.astype("datetime64[ns]").view(np.int64)
+            price = np.asarray(price, dtype=np.float64)
+            volume = None if volume is None else np.asarray(volume, dtype=np.float64)
+        if not len(utc):
+            return
+        times = self._interval * (utc / NS // self._interval) + self.offset
+        if (np.diff(times) < 0).any():
+            raise ValueError("Ticks must be in time order.")
+
+        starts = np.flatnonzero(np.diff(times, prepend=np.nan))
+        last = np.append(starts[1:], len(times)) - 1
+        bars = {
+            "open": price[starts],
+            "high": np.fmax.reduceat(price, starts),
+            "low": np.fmin.reduceat(price, starts),
+            "close": price[last],
+            "time": times[starts],
+        }
+        if volume is not None:
+            bars["volume"] = (
+                np.add.reduceat(volume, starts) if cumulative_volume else volume[last]
+            )
+
+        bar = self._current_bar()
+        if bar is not None and bars["time"][0] < bar.time:
+            raise ValueError(
+                f'Trying to update tick of time "{pd.to_datetime(bars["time"][0], unit="s")}", which occurs before the last bar time of "{pd.to_datetime(bar.time, unit="s")}".'
+            )
+        merged = bar is not None and bars["time"][0] == bar.time
+        if merged:
+            # the first bar continues the last one
+            bars["open"][0] = bar.open
+            bars["high"][0] = max(bar.high, bars["high"][0])
+            bars["low"][0] = min(bar.low, bars["low"][0])
+            if volume is None and bar.volume is not None:
+                bars["volume"] = np.full(len(starts), np.nan)
+                bars["volume"][0] = bar.volume
+            elif cumulative_volume and bar.volume is not None:
+                bars["volume"][0] += bar.volume
+        df = pd.DataFrame(bars, copy=False)
+        new = df.iloc[1:] if merged else df
+
+        if merged:
+            self._store.patch_last({key: values[0].item() for key, values in bars.items()})
+        if len(new):
+            self._store.extend(new)
+        self._tick_bar = Bar.from_series(df.iloc[-1])
+        # once for each bar the ticks started, as when they are given one at a time
+        for _ in range(len(new)):
+            self._chart.events.new_bar._emit(self)
+        points = {}
+        for row in df.to_dict("records") if self._indicators else ():
+            for indicator in self._indicators:
+                indicator._advance(row, points)
+        # the indicator lines are updated in the same script as the bars
+        lines = ""
+        for line, values in points.items():
+            data = pd.DataFrame({"time": list(values), "value": list(values.values())})
+            lines += f"\nfor (const point of {js_data(data)}) {line.id}.series.update(point);"
+
+        if self._lod is not None:
+            self._lod.refresh()
+            if self._lod.level:
+                if lines:
+                    self.run_script(lines.lstrip())
+                bar = pd.Series(self._lod.last())
+                update = "updateCandle" if self._derive_volume else "series.update"
+                return self.win._queue_update(
+                    (self.id, bar["time"]), f"{self.id}.{update}({js_data(bar)})"
+                )
+        if self._derive_volume:
+            return self.run_script(
+                f"for (const bar of {js_data(df)}) {self.id}.updateCandle(bar);{lines}"
+            )
+        script = f"for (const bar of {js_data(df.drop(columns='volume', errors='ignore'))}) {self.id}.series.update(bar);"
+        if "volume" in df:
+            volume = df[["time", "volume"]].rename(columns={"volume": "value"})
+            volume["color"] = np.where(
+                df["close"] > df["open"], self._volume_up_color, self._volume_down_color
+            )
+            volume = volume[volume["value"].notna()]
+            script += f"\nfor (const bar of {js_data(volume)}) {self.id}.volumeSeries.update(bar);"
+        self.run_script(script + lines)
+
+    def indicator(
+        self,
+        indicator: Indicator,
+        color: str = "rgba(214, 237, 255, 0.6)",
+        style: LINE_STYLE = "solid",
+        width: int = 2,
+        price_line: bool = False,
+        price_label: bool = True,
+        price_scale_id: Optional[str] = None,
+        pane_index: Optional[int] = None,
+    ) -> Indicator:
+        """
+        Shows an indicator of the data, such as `SMA(20)`, as lines which are
+        kept up to date with the bars.\n
+        Its values are computed for every bar when the data is set, and only the
+        latest value is computed and sent on each update.
+        """
+        for output in indicator.outputs:
+            name = indicator.name if len(indicator.outputs) == 1 else f"{indicator.name} {output}"
+            indicator.lines[output] = self.create_line(
+                name, color, style, width, price_line, price_label, price_scale_id, pane_index
+            )
+        self._indicators.append(indicator)
+        if len(self._store):
+            self._set_indicators([indicator])
+        return indicator
+
+    def _set_indicators(self, indicators: Optional[List[Indicator]] = None):
+        columns = {key: self._store.column(key) for key in self._store.columns}
+        if not columns:
+            columns = {"time": np.empty(0)}
+        for indicator in self._indicators if indicators is None else indicators:
+            indicator._set(columns)
+
+    def _prepend(self, df: pd.DataFrame):
+        super()._prepend(df)
+        if self._indicators:
+            self._set_indicators()
+
     def price_scale(
         self,
         auto_scale: bool = True,
@@ -897,16 +1620,22 @@ class Candlestick(SeriesCommon):
         scale_margin_bottom: float = 0.0,
         up_color="rgba(83,141,131,0.8)",
         down_color="rgba(200,127,130,0.8)",
+        derive: Optional[bool] = None,
     ):
         """
         Configure volume settings.\n
         Numbers for scaling must be greater than 0 and less than 1.\n
         Volume colors must be applied prior to setting/updating the bars.\n
+        :param derive: builds the volume bars and their colors in the chart window from the candles, rather than sending them separately. `None` keeps the current setting.
         """
         self._volume_up_color = up_color or self._volume_up_color
         self._volume_down_color = down_color or self._volume_down_color
+        if derive is not None:
+            self._derive_volume = derive
         self.run_script(
             f"""
+        {self.id}.volumeUpColor = "{self._volume_up_color}"
+        {self.id}.volumeDownColor = "{self._volume_down_color}"
         {self.id}.volumeSeries.priceScale().applyOptions({{
             scaleMargins: {{
             top: {scale_margin_top},
@@ -1014,6 +1743,14 @@ class AbstractChart(Candlestick, Pane):
         """
         return self._lines.copy()
 
+    def data_transport(self, mode: TRANSPORT = "json"):
+        """
+        Sets how bulk data from `set` is sent to the window.\n
+        :param mode: 'json' inlines the data as a JavaScript literal, 'binary' packs
+        numeric columns into typed arrays, which is faster for very large datasets.
+        """
+        self.win.transport = mode
+
     def set_visible_range(self, start_time: TIME, end_time: TIME):
         self.run_script(
             f"""
@@ -1028,6 +1765,18 @@ class AbstractChart(Candlestick, Pane):
         _visible_range = self.win.run_script_and_get(
             f"{self.id}.chart.timeScale().getVisibleRange()"
         )
+        return self._visible_range(_visible_range)
+
+    async def get_visible_range_async(
+        self, timeout: Optional[float] = None
+    ) -> Dict[str, datetime]:
+        _visible_range = await self.win.run_script_and_get_async(
+            f"{self.id}.chart.timeScale().getVisibleRange()", timeout
+        )
+        return self._visible_range(_visible_range)
+
+    @staticmethod
+    def _visible_range(_visible_range: dict) -> Dict[str, datetime]:
         return {
             "from": datetime.fromtimestamp(_visible_range["from"]),
             "to": datetime.fromtimestamp(_visible_range["to"]),
@@ -1281,6 +2030,15 @@ class AbstractChart(Candlestick, Pane):
         )
         return b64decode(serial_data.split(",")[1])
 
+    async def screenshot_async(self, timeout: Optional[float] = None) -> bytes:
+        """
+        Awaitable version of `screenshot`.
+        """
+        serial_data = await self.win.run_script_and_get_async(
+            f"{self.id}.chart.takeScreenshot().toDataURL()", timeout
+        )
+        return b64decode(serial_data.split(",")[1])
+
     def create_subchart(
         self,
         position: FLOAT = "left",
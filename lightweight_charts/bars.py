@@ -0,0 +1,349 @@
+from typing import Dict, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class BarStore:
+    """
+    Columnar storage for the bars of a series.
+
+    Bars are kept in preallocated NumPy arrays which grow geometrically, so
+    appending a bar is amortized O(1). If `max_length` is given, only the most
+    recent bars are kept. `frame()` returns a DataFrame view of the stored bars.
+    """
+
+    def __init__(self, max_length: Optional[int] = None):
+        self.max_length = max_length
+        self._columns: Dict[str, np.ndarray] = {}
+        self._start = 0
+        self._stop = 0
+        # whether the arrays belong to someone else, and must be copied before writing
+        self._shared = False
+        self._frame: Optional[pd.DataFrame] = None
+        # bumped whenever the bars are replaced rather than added after the last one
+        self.generation = 0
+        # the number of bars dropped from the front since then
+        self.offset = 0
+
+    def __len__(self):
+        return self._stop - self._start
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    def column(self, key: str) -> np.ndarray:
+        return self._columns[key][self._start : self._stop]
+
+    def frame(self) -> pd.DataFrame:
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                {key: self.column(key) for key in self._columns}, copy=False
+            )
+        return self._frame
+
+    def last(self) -> Optional[dict]:
+        if not len(self):
+            return None
+        i = self._stop - 1
+        return {
+            key: values[i].item() if isinstance(values[i], np.generic) else values[i]
+            for key, values in self._columns.items()
+        }
+
+    def set(self, df: pd.DataFrame, copy: bool = True):
+        """
+        Replaces the stored bars with the contents of the DataFrame.\n
+        :param copy: if False, the DataFrame's arrays are referenced rather than
+        copied, until the first write to the store.
+        """
+        if self.max_length is not None:
+            df = df.iloc[-self.max_length :]
+        length = len(df)
+        # sized to fit; room to grow is only made once bars are appended
+        capacity = length if self.max_length is None else self._capacity_for(length)
+        self._columns = {}
+        for key, column in df.items():
+            values = column.to_numpy()
+            if values.dtype.kind not in "biufM":
+                values = values.astype(object)
+            if copy:
+                array = np.empty(capacity, dtype=values.dtype)
+                array[:length] = values
+                values = array
+            self._columns[str(key)] = values
+        self._start, self._stop = 0, length
+        self._shared = not copy
+        self._frame = None
+        self._replaced()
+
+    def prepend(self, df: pd.DataFrame):
+        """
+        Adds bars before the first stored bar.
+        """
+        if not len(self):
+            return self.set(df)
+        if self.max_length is not None:
+            df = df.iloc[max(len(df) + len(self) - self.max_length, 0) :]
+        count, length = len(df), len(df) + len(self)
+        capacity = max(self._capacity_for(length), length)
+        columns = {}
+        for key in dict.fromkeys([*map(str, df.columns), *self._columns]):
+            old = self._columns.get(key)
+            new = df[key].to_numpy() if key in df else None
+            if new is not None and new.dtype.kind not in "biufM":
+                new = new.astype(object)
+            if old is None:
+                old = np.full(len(self), np.nan if new.dtype.kind in "biuf" else None)
+            else:
+                old = old[self._start : self._stop]
+            if new is None:
+                dtype = old.dtype if old.dtype.kind in "fO" else np.float64
+            elif old.dtype.kind == "O" or new.dtype.kind == "O":
+                dtype = object
+            else:
+                dtype = np.result_type(old.dtype, new.dtype)
+            array = np.empty(capacity, dtype=dtype)
+            if new is None:
+                array[:count] = np.nan if array.dtype.kind == "f" else None
+            else:
+                array[:count] = new
+            array[count:length] = old
+            columns[key] = array
+        self._columns = columns
+        self._start, self._stop = 0, length
+        self._shared = False
+        self._frame = None
+        self._replaced()
+
+    def extend(self, df: pd.DataFrame):
+        """
+        Adds bars after the last stored bar.
+        """
+        if not len(self):
+            return self.set(df)
+        before = len(self) + len(df)
+        if self.max_length is not None:
+            df = df.iloc[-self.max_length :]
+        count = len(df)
+        if self._shared or self._stop + count > self._capacity():
+            keep = len(self)
+            if self.max_length is not None:
+                keep = min(keep, self.max_length - count)
+            self._start = self._stop - keep
+            self._reserve(keep + count)
+        start, stop = self._stop, self._stop + count
+        for key in dict.fromkeys([*map(str, df.columns), *self._columns]):
+            values = self._columns.get(key)
+            new = df[key].to_numpy() if key in df else None
+            if new is not None and new.dtype.kind not in "biufM":
+                new = new.astype(object)
+            if values is None:
+                values = self._columns[key] = np.full(
+                    self._capacity(), np.nan if new.dtype.kind in "biuf" else None
+                )
+            if new is None:
+                if values.dtype.kind not in "fO":
+                    values = self._columns[key] = values.astype(np.float64)
+                values[start:stop] = np.nan if values.dtype.kind == "f" else None
+                continue
+            if values.dtype.kind in "iu" and new.dtype.kind == "f" and (new % 1 == 0).all():
+                # whole numbers keep an integer column, as with append
+                new = new.astype(values.dtype)
+            if values.dtype.kind == "O" or new.dtype.kind == "O":
+                dtype = np.dtype(object)
+            else:
+                dtype = np.result_type(values.dtype, new.dtype)
+            if dtype != values.dtype:
+                values = self._columns[key] = values.astype(dtype)
+            values[start:stop] = new
+        self._stop = stop
+        if self.max_length is not None and len(self) > self.max_length:
+            self._start = self._stop - self.max_length
+        self.offset += before - len(self)
+        self._frame = None
+
+    def clear(self):
+        self._columns = {}
+        self._start = self._stop = 0
+        self._shared = False
+        self._frame = None
+        self._replaced()
+
+    def append(self, row: Mapping):
+        """
+        Adds a bar after the last stored bar.
+        """
+        before = len(self) + 1
+        if self._shared or self._stop == self._capacity():
+            self._reserve(before)
+        self._stop += 1
+        if self.max_length is not None and len(self) > self.max_length:
+            self._start += 1
+        self.offset += before - len(self)
+        self._write(self._stop - 1, row)
+
+    def update_last(self, row: Mapping):
+        """
+        Overwrites the last stored bar, or adds it if the store is empty.
+        """
+        if not len(self):
+            return self.append(row)
+        if self._shared:
+            self._reserve(len(self))
+        self._write(self._stop - 1, row)
+
+    def patch_last(self, row: Mapping):
+        """
+        Overwrites the given fields of the last stored bar, leaving the others.
+        """
+        if not len(self):
+            return self.append(row)
+        if self._shared:
+            self._reserve(len(self))
+        self._frame = None
+        i = self._stop - 1
+        for key, value in row.items():
+            values = self._columns.get(key)
+            if values is not None and values.dtype.kind == "f" and isinstance(value, float):
+                values[i] = value
+            else:
+                self._write(i, {key: value}, fill=False)
+
+    def _replaced(self):
+        self.generation += 1
+        self.offset = 0
+
+    def _capacity(self):
+        return len(next(iter(self._columns.values()))) if self._columns else 0
+
+    def _capacity_for(self, length: int):
+        if self.max_length is not None:
+            return max(2 * self.max_length, 1)
+        return max(2 * length, 64)
+
+    def _reserve(self, length: int):
+        # Arrays are always reallocated rather than shifted in place, so that
+        # frames handed out earlier keep pointing at valid data.
+        if self.max_length is not None and length > self.max_length:
+            self._start = self._stop - (self.max_length - 1)
+        capacity = self._capacity_for(length)
+        for key, values in self._columns.items():
+            array = np.empty(capacity, dtype=values.dtype)
+            array[: len(self)] = values[self._start : self._stop]
+            self._columns[key] = array
+        self._stop -= self._start
+        self._start = 0
+        self._shared = False
+
+    def _write(self, i: int, row: Mapping, fill: bool = True):
+        self._frame = None
+        row = {str(key): value for key, value in row.items()}
+        for key, value in row.items():
+            if key not in self._columns:
+                self._columns[key] = self._empty_column(value)
+            values = self._columns[key]
+            if not self._fits(values, value):
+                values = self._columns[key] = values.astype(
+                    np.float64 if isinstance(value, (float, np.floating)) else object
+                )
+            values[i] = value
+        if not fill:
+            return
+        for key, values in self._columns.items():
+            if key in row:
+                continue
+            if values.dtype.kind not in "fO":
+                values = self._columns[key] = values.astype(np.float64)
+            values[i] = np.nan if values.dtype.kind == "f" else None
+
+    def _empty_column(self, value):
+        if len(self) <= 1 and isinstance(value, (int, np.integer)):
+            dtype = np.int64
+        elif isinstance(value, (int, float, np.number)):
+            dtype = np.float64
+        else:
+            dtype = object
+        array = np.empty(self._capacity() or self._capacity_for(1), dtype=dtype)
+        if dtype is not np.int64:
+            array[self._start : self._stop] = np.nan if dtype is np.float64 else None
+        return array
+
+    @staticmethod
+    def _fits(values: np.ndarray, value) -> bool:
+        kind = values.dtype.kind
+        if kind == "O":
+            return True
+        if kind == "M":
+            return isinstance(value, (np.datetime64, pd.Timestamp))
+        if not isinstance(value, (int, float, np.number, bool)):
+            return False
+        if kind in "iub":
+            return float(value) == int(value) if value == value else False
+        return True
+
+
+class Bar:
+    """
+    The state of the latest candle while it is built from ticks, held as plain
+    floats so that each tick is only a few comparisons.
+    """
+
+    __slots__ = ("time", "open", "high", "low", "close", "volume")
+
+    def __init__(
+        self,
+        time: float,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: Optional[float] = None,
+    ):
+        self.time = time
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> "Bar":
+        volume = series.get("volume")
+        return cls(
+            float(series["time"]),
+            float(series["open"]),
+            float(series["high"]),
+            float(series["low"]),
+            float(series["close"]),
+            None if volume is None or volume != volume else float(volume),
+        )
+
+    def tick(self, price: float, volume: Optional[float], cumulative: bool):
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        if volume is not None:
+            self.volume = (
+                self.volume + volume
+                if cumulative and self.volume is not None
+                else volume
+            )
+
+    def as_dict(self) -> dict:
+        bar = {
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "time": self.time,
+        }
+        if self.volume is not None:
+            bar["volume"] = self.volume
+        return bar
+
+    def series(self) -> pd.Series:
+        return pd.Series(self.as_dict(), dtype="float64")
@@ -1,13 +1,23 @@
 import asyncio
+import concurrent.futures
+import itertools
 import json
 import multiprocessing as mp
+import os
+import queue
+import threading
+import time
 import typing
+from collections import deque
 import webview
 from webview.errors import JavascriptException
 
 from lightweight_charts import abstract
 from .util import parse_event_message, FLOAT
 
+# put on a queue to stop the thread reading it
+STOP = "_~_~STOP~_~_"
+
 
 class CallbackAPI:
     def __init__(self, emit_queue):
@@ -17,6 +27,120 @@ class CallbackAPI:
         self.emit_queue.put(message)
 
 
+class EmitBridge:
+    """
+    Forwards messages from the emit queue to an asyncio loop as soon as they
+    arrive. A reader thread blocks on the queue and hands everything it can
+    take at once to the loop, which awaits `get`.
+    """
+
+    def __init__(self, emit_queue, loop: asyncio.AbstractEventLoop):
+        self.emit_queue = emit_queue
+        self.loop = loop
+        self.inbox: asyncio.Queue = asyncio.Queue()
+        self._thread = threading.Thread(target=self._read, daemon=True)
+        self._thread.start()
+
+    @property
+    def alive(self) -> bool:
+        return self._thread.is_alive()
+
+    def _read(self):
+        while True:
+            try:
+                messages = [self.emit_queue.get()]
+                while True:
+                    messages.append(self.emit_queue.get_nowait())
+            except queue.Empty:
+                pass
+            except (EOFError, OSError, ValueError):
+                messages = [STOP]
+            if STOP in messages:
+                # messages after the STOP are left for the next reader
+                stop = messages.index(STOP)
+                for message in messages[stop + 1 :]:
+                    self.emit_queue.put(message)
+                messages = messages[: stop + 1]
+            try:
+                self.loop.call_soon_threadsafe(self.inbox.put_nowait, messages)
+            except RuntimeError:  # the loop has been closed
+                return
+            if STOP in messages or "exit" in messages:
+                return
+
+    async def get(self) -> typing.List[str]:
+        return await self.inbox.get()
+
+    def close(self):
+        """
+        Stops the reader thread, once the messages before it have been handed on.
+        """
+        if self.alive:
+            self.emit_queue.put(STOP)
+            self._thread.join(timeout=1)
+
+
+class ReturnRouter:
+    """
+    Hands values returned by the webview process to the requests waiting for
+    them. Every request is tagged with an ID which comes back with its value,
+    so any number of requests can be in flight at once.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count()
+        self._pending: typing.Dict[int, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self.return_queue = None
+
+    def listen(self, return_queue):
+        self.return_queue = return_queue
+        threading.Thread(target=self._read, args=(return_queue,), daemon=True).start()
+
+    def request(self) -> typing.Tuple[int, concurrent.futures.Future]:
+        future = concurrent.futures.Future()
+        with self._lock:
+            request_id = next(self._ids)
+            self._pending[request_id] = future
+        # cancelled requests are forgotten; their values are dropped on arrival
+        future.add_done_callback(lambda _: self._forget(request_id))
+        return request_id, future
+
+    def _forget(self, request_id: int):
+        with self._lock:
+            self._pending.pop(request_id, None)
+
+    def _read(self, return_queue):
+        while True:
+            try:
+                message = return_queue.get()
+            except (EOFError, OSError, ValueError):
+                return
+            if message == STOP:
+                return
+            request_id, value, error = message
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+            if future is None or not future.set_running_or_notify_cancel():
+                continue
+            if error is not None:
+                future.set_exception(JavascriptException(error))
+            else:
+                future.set_result(value)
+
+    def close(self):
+        """
+        Stops listening and cancels every request still waiting for a value.
+        """
+        if self.return_queue is not None:
+            self.return_queue.put(STOP)
+            self.return_queue = None
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.cancel()
+
+
 class PyWV:
     def __init__(self, q, emit_q, return_q, loaded_event):
         self.queue = q
@@ -25,6 +149,10 @@ class PyWV:
         self.loaded_event = loaded_event
 
         self.is_alive = True
+        # the most recent scripts, written to disk when one of them fails
+        self.captured_scripts: typing.Optional[deque] = None
+        # messages taken off the queue while draining batches, handled next
+        self.backlog = deque()
 
         self.callback_api = CallbackAPI(emit_q)
         self.windows: typing.List[webview.Window] = []
@@ -60,19 +188,74 @@ class PyWV:
 
         self.windows[-1].events.loaded += lambda: self.loaded_event.set()
 
+    def dump_scripts(self, path: str = "script.js"):
+        """
+        Writes the captured scripts, oldest first, to the given file.
+        """
+        if not self.captured_scripts:
+            return
+        with open(path, "w") as f:
+            f.write("\n\n// ----\n\n".join(self.captured_scripts))
+        print(f"The last {len(self.captured_scripts)} scripts were written to {os.path.abspath(path)}")
+
+    @staticmethod
+    def join_scripts(scripts: typing.List[str]) -> str:
+        """
+        Joins scripts into one, isolating each in its own block so that one
+        failing script doesn't stop the others from running.
+        """
+        if len(scripts) == 1:
+            return scripts[0]
+        body = "\n".join(
+            f"try {{\n{script}\n}} catch (e) {{ _batchErrors.push(e) }}"
+            for script in scripts
+        )
+        return f"{{\nconst _batchErrors = []\n{body}\nif (_batchErrors.length) throw _batchErrors[0]\n}}"
+
+    def evaluate_batch(self, batch: typing.List[typing.Tuple[int, str]]):
+        # take every batch already waiting, so a backed-up queue is cleared
+        # with one evaluate_js per window rather than one per script
+        while True:
+            try:
+                message = self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if message[0] != "batch":
+                self.backlog.append(message)
+                break
+            batch.extend(message[1])
+
+        scripts_by_window: typing.Dict[int, typing.List[str]] = {}
+        for i, script in batch:
+            scripts_by_window.setdefault(i, []).append(script)
+        for i, scripts in scripts_by_window.items():
+            if self.captured_scripts is not None:
+                self.captured_scripts.extend(scripts)
+            try:
+                self.windows[i].evaluate_js(self.join_scripts(scripts))
+            except JavascriptException as e:
+                print(f"JavaScript Error: {e}")
+                self.dump_scripts()
+
     def loop(self):
         # self.loaded_event.set()
         while self.is_alive:
-            i, arg = self.queue.get()
+            i, arg = self.backlog.popleft() if self.backlog else self.queue.get()
 
             if i == "start":
-                webview.start(debug=arg, func=self.loop)
+                debug, script_capture = arg
+                if script_capture:
+                    self.captured_scripts = deque(maxlen=script_capture)
+                webview.start(debug=debug, func=self.loop)
                 self.is_alive = False
                 self.emit_queue.put("exit")
                 return
             if i == "create_window":
                 self.create_window(*arg)
                 continue
+            if i == "batch":
+                self.evaluate_batch(arg)
+                continue
 
             window = self.windows[i]
             if arg == "show":
@@ -81,32 +264,47 @@ class PyWV:
                 window.hide()
             else:
                 try:
-                    if "_~_~RETURN~_~_" in arg:
-                        self.return_queue.put(window.evaluate_js(arg[14:]))
+                    if arg.startswith("_~_~RETURN~_~_"):
+                        self.evaluate_return(window, arg[14:])
                     else:
+                        if self.captured_scripts is not None:
+                            self.captured_scripts.append(arg)
                         try:
-                            with open("script.js", "w") as f:
-                                f.write(arg)
-
                             window.evaluate_js(arg)
-
                         except JavascriptException as e:
-                            # print(f"Js: {str(arg)}")
-                            print(f"JavaScript Error 1: {e}")  # Debugging output
+                            print(f"JavaScript Error: {e}")
+                            self.dump_scripts()
                 except KeyError:
                     return
-                except JavascriptException as e:
-                    msg = json.loads(str(e))
-                    print(msg)
-                    raise JavascriptException(
-                        f"\n\nscript -> '{arg}',\nerror -> {msg['name']}[{msg['line']}:{msg['column']}]\n{msg['message']}"
-                    ) from e
+
+    def evaluate_return(self, window: webview.Window, arg: str):
+        # arg is "<request id>~_~_<script>"; the value goes back with the id,
+        # and errors are raised by whoever made the request
+        request_id, script = arg.split("~_~_", 1)
+        try:
+            value, error = window.evaluate_js(script), None
+        except JavascriptException as e:
+            value, error = None, self.format_error(script, e)
+        self.return_queue.put((int(request_id), value, error))
+
+    @staticmethod
+    def format_error(script: str, e: JavascriptException) -> str:
+        try:
+            msg = json.loads(str(e))
+            return f"\n\nscript -> '{script}',\nerror -> {msg['name']}[{msg['line']}:{msg['column']}]\n{msg['message']}"
+        except (ValueError, KeyError, TypeError):
+            return f"\n\nscript -> '{script}',\nerror -> {e}"
 
 
 class WebviewHandler:
     def __init__(self) -> None:
+        self.returns = ReturnRouter()
         self._reset()
         self.debug = False
+        self.script_capture = 0
+        self.max_batch_size = 256
+        self.max_latency = 0.005
+        self.emit_bridge: typing.Optional[EmitBridge] = None
 
     def _reset(self):
         self.loaded_event = mp.Event()
@@ -124,10 +322,50 @@ class WebviewHandler:
             daemon=True,
         )
         self.max_window_num = -1
+        self._batch: typing.List[typing.Tuple[int, str]] = []
+        self._batch_started = 0.0
+        self._batch_cond = threading.Condition()
+        self._flusher: typing.Optional[threading.Thread] = None
+
+    def batching(self, max_batch_size: int = 256, max_latency: float = 0.005):
+        """
+        Scripts are sent to the webview process in batches, which are sent once
+        `max_batch_size` scripts are waiting or `max_latency` seconds have passed
+        since the first of them. A `max_batch_size` of 1 sends every script alone.
+        """
+        self.flush()
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+    def flush(self):
+        with self._batch_cond:
+            self._send_batch()
+
+    def _send_batch(self):
+        # called with the batch condition held
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        self.function_call_queue.put(("batch", batch))
+
+    def _flush_loop(self, cond: threading.Condition):
+        # one thread sends each batch `max_latency` seconds after its first
+        # script, until the handler is reset with a new condition
+        with cond:
+            while self._batch_cond is cond:
+                if not self._batch:
+                    cond.wait()
+                    continue
+                remaining = self._batch_started + self.max_latency - time.monotonic()
+                if remaining > 0:
+                    cond.wait(remaining)
+                    continue
+                self._send_batch()
 
     def create_window(
         self, width, height, x, y, screen=None, on_top=False, maximize=False, title=""
     ):
+        self.flush()
         self.function_call_queue.put(
             ("create_window", (width, height, x, y, screen, on_top, maximize, title))
         )
@@ -136,24 +374,50 @@ class WebviewHandler:
 
     def start(self):
         self.loaded_event.clear()
+        self.returns.listen(self.return_queue)
         self.wv_process.start()
-        self.function_call_queue.put(("start", self.debug))
+        self.function_call_queue.put(("start", (self.debug, self.script_capture)))
         self.loaded_event.wait()
 
     def show(self, window_num):
+        self.flush()
         self.function_call_queue.put((window_num, "show"))
 
     def hide(self, window_num):
+        self.flush()
         self.function_call_queue.put((window_num, "hide"))
 
     def evaluate_js(self, window_num, script):
-        self.function_call_queue.put((window_num, script))
+        if self.max_batch_size <= 1 or script.startswith("_~_~RETURN~_~_"):
+            self.flush()
+            self.function_call_queue.put((window_num, script))
+            return
+        with self._batch_cond:
+            if not self._batch:
+                self._batch_started = time.monotonic()
+                if self._flusher is None:
+                    self._flusher = threading.Thread(
+                        target=self._flush_loop, args=(self._batch_cond,), daemon=True
+                    )
+                    self._flusher.start()
+                self._batch_cond.notify()
+            self._batch.append((window_num, script))
+            if len(self._batch) >= self.max_batch_size:
+                self._send_batch()
 
     def exit(self):
+        cond = self._batch_cond
+        if self.emit_bridge is not None:
+            self.emit_bridge.close()
+            self.emit_bridge = None
+        self.returns.close()
         if self.wv_process.is_alive():
             self.wv_process.terminate()
             self.wv_process.join()
         self._reset()
+        with cond:
+            # stops the flusher thread, which sees the new condition
+            cond.notify_all()
 
 
 class Chart(abstract.AbstractChart):
@@ -176,8 +440,10 @@ class Chart(abstract.AbstractChart):
         inner_height: float = 1.0,
         scale_candles_only: bool = False,
         position: FLOAT = "left",
+        script_capture: int = 0,
     ):
         Chart.WV.debug = debug
+        Chart.WV.script_capture = script_capture
         self._i = Chart.WV.create_window(
             width, height, x, y, screen, on_top, maximize, title
         )
@@ -187,7 +453,7 @@ class Chart(abstract.AbstractChart):
             js_api_code="pywebview.api.callback",
         )
 
-        setattr(abstract.Window, "_return_q", Chart.WV.return_queue)
+        setattr(abstract.Window, "_returns", Chart.WV.returns)
 
         self.is_alive = True
 
@@ -234,17 +500,22 @@ class Chart(abstract.AbstractChart):
                 asyncio.create_task(self.polygon.async_set(*args))
                 for args in polygon._set_on_load
             ]
-            while 1:
-                while Chart.WV.emit_queue.empty() and self.is_alive:
-                    await asyncio.sleep(0.05)
-                if not self.is_alive:
-                    return
-                response = Chart.WV.emit_queue.get()
-                if response == "exit":
-                    Chart.WV.exit()
-                    self.is_alive = False
-                    return
-                else:
+            loop = asyncio.get_running_loop()
+            bridge = Chart.WV.emit_bridge
+            if bridge is None or not bridge.alive or bridge.loop is not loop:
+                # only one reader may take messages from the emit queue
+                if bridge is not None:
+                    bridge.close()
+                bridge = EmitBridge(Chart.WV.emit_queue, loop)
+                Chart.WV.emit_bridge = bridge
+            while self.is_alive:
+                for response in await bridge.get():
+                    if response == STOP or not self.is_alive:
+                        return
+                    if response == "exit":
+                        Chart.WV.exit()
+                        self.is_alive = False
+                        return
                     func, args = parse_event_message(self.win, response)
                     (
                         await func(*args)
@@ -260,7 +531,7 @@ class Chart(abstract.AbstractChart):
 
         This method hides the chart window associated with this Chart instance.
         """
-        Chart.WV.function_call_queue.put((self._i, "hide"))
+        Chart.WV.hide(self._i)
 
     def exit(self):
         """
@@ -0,0 +1,135 @@
+import asyncio
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Optional, Set
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .abstract import SeriesCommon
+
+LOADER = Callable[[Optional[pd.Timestamp], int], Awaitable[Optional[pd.DataFrame]]]
+
+
+class HistoryPager:
+    """
+    Loads older bars into a series one page at a time, as the user scrolls back.
+
+    `loader(before, limit)` is awaited for up to `limit` bars ending before the
+    timestamp `before` (or the most recent bars if `before` is None), and
+    returns them as a DataFrame, empty or None once history runs out. Pages are
+    requested once per timestamp, and `prefetch` pages are kept loading ahead
+    of the oldest bar shown.
+    """
+
+    def __init__(
+        self,
+        series: "SeriesCommon",
+        loader: LOADER,
+        page_size: int = 500,
+        threshold: int = 100,
+        prefetch: int = 1,
+    ):
+        self.series = series
+        self.loader = loader
+        self.page_size = page_size
+        self.threshold = threshold
+        self.prefetch = prefetch
+        # pages loading or loaded but not shown, by the time they end before
+        self._pages: Dict[float, asyncio.Task] = {}
+        self._prepending = False
+        self._generation = 0
+        # range changes being handled, referenced so they aren't collected
+        self._ranges: Set[asyncio.Task] = set()
+        self.exhausted = False
+
+    async def start(self):
+        """
+        Sets the series to the most recent page.
+        """
+        page = await self.loader(None, self.page_size)
+        self.series.set(page)
+        self._prefetch()
+
+    def reset(self):
+        """
+        Cancels any pages loading, and forgets the pages loaded but not shown.
+        """
+        for task in self._pages.values():
+            task.cancel()
+        self._pages.clear()
+        self._generation += 1
+        self.exhausted = False
+
+    async def on_range(self, bars_before: float):
+        if bars_before >= self.threshold:
+            return
+        await self.prepend()
+
+    def schedule_range(self, bars_before: float) -> asyncio.Task:
+        """
+        Handles a change of the visible range in a task, without waiting for the page.
+        """
+        task = asyncio.ensure_future(self.on_range(bars_before))
+        self._ranges.add(task)
+        task.add_done_callback(self._ranges.discard)
+        return task
+
+    async def prepend(self):
+        """
+        Shows the page before the oldest bar, waiting for it if needed.
+        """
+        if self.exhausted or self._prepending or not len(self.series._store):
+            return
+        before, generation = self._oldest(), self._generation
+        self._prepending = True
+        try:
+            page = await self._request(before)
+        except asyncio.CancelledError:
+            return
+        finally:
+            self._prepending = False
+            self._pages.pop(before, None)
+        if generation != self._generation or before != self._oldest():
+            # the data was set again while the page was loading
+            return
+        if page is None or page.empty:
+            self.exhausted = True
+            return
+        self.series._prepend(page)
+        self._prefetch()
+
+    def _oldest(self) -> float:
+        return self.series._store.column("time")[0]
+
+    def _prefetch(self):
+        if self.prefetch > 0 and len(self.series._store):
+            self._ahead(self._oldest(), self.prefetch)
+
+    def _ahead(self, before: float, depth: int):
+        # requests `depth` pages, each once the one after it has arrived
+        task = self._request(before)
+        if depth <= 1:
+            return
+        generation = self._generation
+
+        def next_page(task: asyncio.Task):
+            if task.cancelled() or task.exception() is not None:
+                return
+            page = task.result()
+            if page is not None and generation == self._generation:
+                self._ahead(page["time"].iloc[0], depth - 1)
+
+        task.add_done_callback(next_page)
+
+    def _request(self, before: float) -> asyncio.Task:
+        task = self._pages.get(before)
+        if task is None:
+            task = self._pages[before] = asyncio.ensure_future(self._load(before))
+        return task
+
+    async def _load(self, before: float) -> Optional[pd.DataFrame]:
+        page = await self.loader(pd.to_datetime(before, unit="s"), self.page_size)
+        if page is None or page.empty:
+            return None
+        page = self.series._page_format(page)
+        page = page[page["time"] < before]
+        return None if page.empty else page
@@ -0,0 +1,366 @@
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .abstract import Line
+
+VALUES = Optional[Tuple[float, ...]]
+
+
+class Indicator(ABC):
+    """
+    An indicator computed for every bar at once when the data is set, and then
+    advanced one bar at a time.
+
+    `compute` returns the values of each output for every bar using NumPy, and
+    leaves the indicator's state covering every bar but the last, which may
+    still be updated. `peek` returns the values for a bar from that state
+    without changing it, and `commit` adds a final bar to it; both are O(1).
+    """
+
+    outputs: Tuple[str, ...] = ("value",)
+
+    def __init__(self, name: str):
+        self.name = name
+        self.lines: Dict[str, "Line"] = {}
+        self._row: Optional[Mapping] = None
+
+    @abstractmethod
+    def compute(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        ...
+
+    @abstractmethod
+    def peek(self, row: Mapping) -> VALUES:
+        ...
+
+    @abstractmethod
+    def commit(self, row: Mapping):
+        ...
+
+    def _values(self, columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        self._row = None
+        if not len(columns["time"]):
+            return {}
+        values = self.compute(columns)
+        self._row = {key: column[-1] for key, column in columns.items()}
+        return values
+
+    def _set(self, columns: Dict[str, np.ndarray]):
+        time = columns["time"]
+        values = self._values(columns)
+        for output, line in self.lines.items():
+            if output not in values:
+                line.set(None)
+                continue
+            valid = ~np.isnan(values[output])
+            line.set(
+                pd.DataFrame(
+                    {"time": time[valid], line.name: values[output][valid]}, copy=False
+                ),
+                format_cols=False,
+            )
+
+    def _advance(self, row: Mapping, points: Optional[Dict["Line", Dict[float, float]]] = None):
+        # with `points`, each line's values are collected there by time rather than sent
+        if self._row is not None and row["time"] != self._row["time"]:
+            # the previous bar is final
+            self.commit(self._row)
+        self._row = row
+        values = self.peek(row)
+        if values is None:
+            return
+        for line, value in zip(self.lines.values(), values):
+            if points is None:
+                line._push_value(row["time"], value)
+            else:
+                line._store_value(row["time"], value)
+                points.setdefault(line, {})[row["time"]] = value
+
+
+class _Window:
+    """
+    The last `size` values of a series, with their running sum and sum of squares.
+    """
+
+    __slots__ = ("values", "size", "sum", "sum_sq")
+
+    def __init__(self, values: np.ndarray, size: int):
+        values = values[len(values) - size :] if size else values[:0]
+        self.values = deque(values.tolist(), maxlen=size or None)
+        self.size = size
+        self.sum = float(values.sum())
+        self.sum_sq = float(np.square(values).sum())
+
+    @property
+    def full(self):
+        return len(self.values) == self.size
+
+    def push(self, value: float):
+        if not self.size:
+            return
+        if self.full:
+            oldest = self.values[0]
+            self.sum -= oldest
+            self.sum_sq -= oldest * oldest
+        self.values.append(value)
+        self.sum += value
+        self.sum_sq += value * value
+
+
+def _source(columns: Dict[str, np.ndarray], key: str) -> np.ndarray:
+    return columns[key].astype(np.float64)
+
+
+class SMA(Indicator):
+    """
+    The simple moving average of `source` over `period` bars.
+    """
+
+    def __init__(self, period: int = 20, source: str = "close"):
+        super().__init__(f"SMA {period}")
+        self.period = period
+        self.source = source
+        self._window = _Window(np.empty(0), period - 1)
+
+    def compute(self, columns):
+        x = _source(columns, self.source)
+        self._window = _Window(x[:-1], self.period - 1)
+        return {"value": pd.Series(x).rolling(self.period).mean().to_numpy()}
+
+    def peek(self, row):
+        if not self._window.full:
+            return None
+        return ((self._window.sum + row[self.source]) / self.period,)
+
+    def commit(self, row):
+        self._window.push(row[self.source])
+
+
+class EMA(Indicator):
+    """
+    The exponential moving average of `source` over `period` bars, starting from
+    the simple average of the first `period` bars.
+    """
+
+    def __init__(self, period: int = 20, source: str = "close"):
+        super().__init__(f"EMA {period}")
+        self.period = period
+        self.source = source
+        self.alpha = 2 / (period + 1)
+        self._count = 0
+        self._sum = 0.0
+        self._ema: Optional[float] = None
+
+    def compute(self, columns):
+        x = _source(columns, self.source)
+        values = _smoothed(x, self.period, self.alpha)
+        self._count = len(x) - 1
+        self._sum = float(x[: min(self._count, self.period - 1)].sum())
+        self._ema = _at(values, len(x) - 2)
+        return {"value": values}
+
+    def _next(self, x: float) -> Optional[float]:
+        if self._ema is not None:
+            return self._ema + self.alpha * (x - self._ema)
+        if self._count == self.period - 1:
+            return (self._sum + x) / self.period
+        return None
+
+    def peek(self, row):
+        value = self._next(row[self.source])
+        return None if value is None else (value,)
+
+    def commit(self, row):
+        x = row[self.source]
+        value = self._next(x)
+        if value is None:
+            self._sum += x
+        self._ema = value
+        self._count += 1
+
+
+class RSI(Indicator):
+    """
+    The relative strength index of `source` over `period` bars, with Wilder's
+    smoothing of the average gains and losses.
+    """
+
+    def __init__(self, period: int = 14, source: str = "close"):
+        super().__init__(f"RSI {period}")
+        self.period = period
+        self.source = source
+        self._previous: Optional[float] = None
+        self._count = 0
+        self._gains = self._losses = 0.0
+        self._average: Optional[Tuple[float, float]] = None
+
+    def compute(self, columns):
+        x = _source(columns, self.source)
+        change = np.diff(x)
+        gains, losses = np.clip(change, 0, None), np.clip(-change, 0, None)
+        average_gain = _smoothed(gains, self.period, 1 / self.period)
+        average_loss = _smoothed(losses, self.period, 1 / self.period)
+        # the changes into the bars before the last one
+        committed = len(change) - 1
+        self._previous = _at(x, len(x) - 2)
+        self._count = max(committed, 0)
+        seed = min(self._count, self.period - 1)
+        self._gains, self._losses = float(gains[:seed].sum()), float(losses[:seed].sum())
+        gain, loss = _at(average_gain, committed - 1), _at(average_loss, committed - 1)
+        self._average = None if gain is None else (gain, loss)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = _rsi(average_gain, average_loss)
+        # the first bar has no change
+        return {"value": np.concatenate(([np.nan], values))}
+
+    def _next(self, x: float) -> Optional[Tuple[float, float]]:
+        if self._previous is None:
+            return None
+        change = x - self._previous
+        gain, loss = max(change, 0.0), max(-change, 0.0)
+        if self._average is not None:
+            average_gain, average_loss = self._average
+            n = self.period
+            return (average_gain * (n - 1) + gain) / n, (average_loss * (n - 1) + loss) / n
+        if self._count == self.period - 1:
+            return (self._gains + gain) / self.period, (self._losses + loss) / self.period
+        return None
+
+    def peek(self, row):
+        average = self._next(row[self.source])
+        if average is None:
+            return None
+        gain, loss = average
+        return (100.0 if loss == 0 else 100 - 100 / (1 + gain / loss),)
+
+    def commit(self, row):
+        x = row[self.source]
+        average = self._next(x)
+        if average is None and self._previous is not None:
+            change = x - self._previous
+            self._gains += max(change, 0.0)
+            self._losses += max(-change, 0.0)
+        if self._previous is not None:
+            self._count += 1
+        self._average = average
+        self._previous = x
+
+
+class BollingerBands(Indicator):
+    """
+    The simple moving average of `source` over `period` bars, and the bands
+    `deviations` standard deviations above and below it.
+    """
+
+    outputs = ("upper", "middle", "lower")
+
+    def __init__(self, period: int = 20, deviations: float = 2, source: str = "close"):
+        super().__init__(f"BB {period}")
+        self.period = period
+        self.deviations = deviations
+        self.source = source
+        self._window = _Window(np.empty(0), period - 1)
+
+    def compute(self, columns):
+        x = pd.Series(_source(columns, self.source))
+        self._window = _Window(x.to_numpy()[:-1], self.period - 1)
+        rolling = x.rolling(self.period)
+        middle, deviation = rolling.mean().to_numpy(), rolling.std(ddof=0).to_numpy()
+        return {
+            "upper": middle + self.deviations * deviation,
+            "middle": middle,
+            "lower": middle - self.deviations * deviation,
+        }
+
+    def peek(self, row):
+        if not self._window.full:
+            return None
+        x = row[self.source]
+        mean = (self._window.sum + x) / self.period
+        variance = (self._window.sum_sq + x * x) / self.period - mean * mean
+        deviation = self.deviations * max(variance, 0.0) ** 0.5
+        return mean + deviation, mean, mean - deviation
+
+    def commit(self, row):
+        self._window.push(row[self.source])
+
+
+class VWAP(Indicator):
+    """
+    The volume-weighted average of the typical price (high + low + close) / 3,
+    restarting every `anchor` seconds (daily by default).
+    """
+
+    def __init__(self, anchor: float = 86400):
+        super().__init__("VWAP")
+        self.anchor = anchor
+        self._session: Optional[float] = None
+        self._price_volume = self._volume = 0.0
+
+    def compute(self, columns):
+        if "volume" not in columns:
+            raise ValueError("VWAP needs volume data.")
+        price = (
+            _source(columns, "high") + _source(columns, "low") + _source(columns, "close")
+        ) / 3
+        volume = np.nan_to_num(_source(columns, "volume"))
+        sessions = _source(columns, "time") // self.anchor
+        starts = np.flatnonzero(np.diff(sessions, prepend=np.nan))
+        lengths = np.diff(np.append(starts, len(sessions)))
+
+        def session_cumsum(values):
+            total = np.cumsum(values)
+            return total - np.repeat(total[starts] - values[starts], lengths)
+
+        price_volume, cumulative_volume = (
+            session_cumsum(price * volume),
+            session_cumsum(volume),
+        )
+        self._session = _at(sessions, len(sessions) - 2)
+        self._price_volume = _at(price_volume, len(sessions) - 2) or 0.0
+        self._volume = _at(cumulative_volume, len(sessions) - 2) or 0.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = price_volume / cumulative_volume
+        return {"value": np.where(cumulative_volume > 0, values, np.nan)}
+
+    def _next(self, row) -> Tuple[float, float, float]:
+        session = row["time"] // self.anchor
+        volume = row.get("volume")
+        if volume is None or volume != volume:
+            volume = 0.0
+        price_volume = (row["high"] + row["low"] + row["close"]) / 3 * volume
+        if session == self._session:
+            return session, self._price_volume + price_volume, self._volume + volume
+        return session, price_volume, volume
+
+    def peek(self, row):
+        _, price_volume, volume = self._next(row)
+        return (price_volume / volume,) if volume > 0 else None
+
+    def commit(self, row):
+        self._session, self._price_volume, self._volume = self._next(row)
+
+
+def _at(values: np.ndarray, i: int) -> Optional[float]:
+    if i < 0 or i >= len(values) or np.isnan(values[i]):
+        return None
+    return float(values[i])
+
+
+def _smoothed(x: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    # exponential smoothing started from the mean of the first `period` values
+    values = np.full(len(x), np.nan)
+    if len(x) < period:
+        return values
+    seeded = x[period - 1 :].copy()
+    seeded[0] = x[:period].mean()
+    values[period - 1 :] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean()
+    return values
+
+
+def _rsi(gain: np.ndarray, loss: np.ndarray) -> np.ndarray:
+    return np.where(loss == 0, 100.0, 100 - 100 / (1 + gain / loss))
@@ -0,0 +1,230 @@
+from typing import Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .bars import BarStore
+
+LOD_KIND = Literal["ohlc", "minmax"]
+
+
+class LODPyramid:
+    """
+    Holds a series at decreasing resolutions, so that only as many points as
+    can be seen need to be sent to the browser.
+
+    Level 0 is the full-resolution data in `store`; each level above it merges
+    `factor` times more bars per point. Candles are merged into OHLC bars
+    (volumes summed), and lines keep the minimum and maximum of each bucket.
+    Levels are added until the coarsest one fits the whole history within
+    `max_points`.
+
+    Buckets are aligned on the index of each bar counted from when the store
+    was last set, so bars dropped from the front of a store with a
+    `max_length` only redo the oldest bucket of each level.
+    """
+
+    def __init__(
+        self,
+        store: BarStore,
+        kind: LOD_KIND = "ohlc",
+        max_points: int = 2000,
+        factor: int = 4,
+    ):
+        if factor < 2:
+            raise ValueError("factor must be at least 2.")
+        self.store = store
+        self.kind = kind
+        self.max_points = max_points
+        self.factor = factor
+        # per level, the bucket values, starting at level 1
+        self.levels: List[Dict[str, np.ndarray]] = []
+        # per level, the index of its first bucket
+        self._firsts: List[int] = []
+        # the store's generation and offset, and the index after the last bar, when last refreshed
+        self._generation: Optional[int] = None
+        self._offset = 0
+        self._built = 0
+        # the level and bar indices [start, stop) last sent to the browser
+        self.level = 0
+        self.loaded: Tuple[int, int] = (0, 0)
+
+    def __len__(self):
+        return len(self.levels) + 1
+
+    def bucket_size(self, level: int) -> int:
+        return self.factor**level
+
+    def rebuild(self):
+        self._generation = None
+        self.refresh()
+
+    def refresh(self):
+        """
+        Brings the levels up to date with the store. Only the buckets holding
+        bars added or changed since the last refresh are recomputed.
+        """
+        store = self.store
+        if store.generation != self._generation:
+            # the store was set, prepended to or cleared
+            self.levels, self._firsts = [], []
+            self._generation, self._offset, self._built = store.generation, 0, 0
+        n, offset = len(store), store.offset
+        stop = offset + n
+        # the last bar may have been updated in place, so its bucket is redone
+        dirty = max(self._built - 1, offset)
+        level = 0
+        while n > self.max_points * self.bucket_size(level):
+            level += 1
+            size = self.bucket_size(level)
+            head = offset // size
+            if level > len(self.levels):
+                self.levels.append(self._buckets(head, stop, size))
+                self._firsts.append(head)
+                continue
+            first = max(dirty // size, head)
+            parts = [self._buckets(first, stop, size)]
+            # buckets which have lost their oldest bars since the last refresh
+            redo_head = offset != self._offset and offset % size and head < first
+            if redo_head:
+                parts.insert(0, self._buckets(head, (head + 1) * size, size))
+            old, old_first = self.levels[level - 1], self._firsts[level - 1]
+            keep = slice(head + bool(redo_head) - old_first, first - old_first)
+            parts.insert(int(bool(redo_head)), {key: values[keep] for key, values in old.items()})
+            self.levels[level - 1] = {
+                key: np.concatenate([part[key] for part in parts]) for key in parts[0]
+            }
+            self._firsts[level - 1] = head
+        del self.levels[level:], self._firsts[level:]
+        self._offset, self._built = offset, stop
+
+    def _buckets(self, bucket: int, stop: int, size: int) -> Dict[str, np.ndarray]:
+        # the buckets from index `bucket` which hold the bars before the index `stop`
+        offset = self.store.offset
+        stop = min(stop, offset + len(self.store)) - offset
+        starts = np.maximum(np.arange(bucket * size, offset + stop, size), offset) - offset
+        start = starts[0]
+        offsets = starts - start
+        time = self.store.column("time")
+        if self.kind == "ohlc":
+            buckets = {
+                "time": time[starts],
+                "open": self.store.column("open")[starts],
+                "high": np.fmax.reduceat(self.store.column("high")[start:stop], offsets),
+                "low": np.fmin.reduceat(self.store.column("low")[start:stop], offsets),
+                "close": self.store.column("close")[np.append(starts[1:], stop) - 1],
+            }
+            if "volume" in self.store.columns:
+                buckets["volume"] = np.add.reduceat(
+                    np.nan_to_num(self.store.column("volume")[start:stop]), offsets
+                )
+            return buckets
+
+        values = self.store.column("value")[start:stop].astype(np.float64)
+        # padded to whole buckets at either end
+        before = offset + start - bucket * size
+        after = -(before + len(values)) % size
+        lows, highs = (
+            np.concatenate(
+                (np.full(before, pad), np.where(np.isnan(values), pad, values), np.full(after, pad))
+            )
+            for pad in (np.inf, -np.inf)
+        )
+        bucket_starts = (np.arange(len(starts)) + bucket) * size
+        # bar indices counted as the buckets are, so that they outlast dropped bars
+        i_min = np.maximum(lows.reshape(-1, size).argmin(axis=1) + bucket_starts, offset + start)
+        i_max = np.maximum(highs.reshape(-1, size).argmax(axis=1) + bucket_starts, offset + start)
+        # the two extremes of each bucket, in time order
+        first, second = np.minimum(i_min, i_max), np.maximum(i_min, i_max)
+        return {"time": time[starts], "first": first, "second": second}
+
+    def times(self, level: int) -> np.ndarray:
+        if level == 0:
+            return self.store.column("time")
+        return self.levels[level - 1]["time"]
+
+    def level_for(self, start_time: float, end_time: float) -> int:
+        """
+        The finest level showing no more than `max_points` between the given times.
+        """
+        for level in range(len(self)):
+            times = self.times(level)
+            count = np.searchsorted(times, end_time, "right") - np.searchsorted(
+                times, start_time, "left"
+            )
+            if count <= self.max_points:
+                return level
+        return len(self) - 1
+
+    def needs_load(self, start_time: float, end_time: float) -> bool:
+        """
+        Whether the browser needs new data to show the given times: if the level
+        changes, or they come within half a screen of the edge of what is loaded.
+        """
+        level = self.level_for(start_time, end_time)
+        if level != self.level:
+            return True
+        times = self.times(level)
+        start = np.searchsorted(times, start_time, "left")
+        stop = np.searchsorted(times, end_time, "right")
+        margin = (stop - start) // 2
+        loaded_start, loaded_stop = self.loaded
+        return (loaded_start > 0 and start - loaded_start < margin) or (
+            loaded_stop < len(times) and loaded_stop - stop < margin
+        )
+
+    def load(self, start_time: float, end_time: float) -> pd.DataFrame:
+        """
+        Returns the bars to send for the given visible times: the matching
+        level, padded by a screen on either side.
+        """
+        level = self.level_for(start_time, end_time)
+        times = self.times(level)
+        start = np.searchsorted(times, start_time, "left")
+        stop = np.searchsorted(times, end_time, "right")
+        span = max(stop - start, 1)
+        return self._select(level, max(start - span, 0), min(stop + span, len(times)))
+
+    def tail(self) -> pd.DataFrame:
+        """
+        Returns the most recent `max_points` bars at full resolution.
+        """
+        n = len(self.store)
+        return self._select(0, max(n - self.max_points, 0), n)
+
+    def last(self) -> Optional[dict]:
+        """
+        Returns the last point of the loaded level.
+        """
+        if self.level == 0:
+            return self.store.last()
+        frame = self._frame(self.level, len(self.times(self.level)) - 1, len(self.times(self.level)))
+        return {key: values.iloc[-1] for key, values in frame.items()}
+
+    def _select(self, level: int, start: int, stop: int) -> pd.DataFrame:
+        self.level = level
+        self.loaded = (start, stop)
+        return self._frame(level, start, stop)
+
+    def _frame(self, level: int, start: int, stop: int) -> pd.DataFrame:
+        if level == 0:
+            return self.store.frame().iloc[start:stop]
+        buckets = self.levels[level - 1]
+        if self.kind == "ohlc":
+            return pd.DataFrame(
+                {key: values[start:stop] for key, values in buckets.items()}, copy=False
+            )
+        offset = self.store.offset
+        first = buckets["first"][start:stop] - offset
+        second = buckets["second"][start:stop] - offset
+        index = np.column_stack((first, second)).ravel()
+        keep = np.ones(len(index), dtype=bool)
+        keep[1::2] = second != first
+        index = index[keep]
+        return pd.DataFrame(
+            {
+                "time": self.store.column("time")[index],
+                "value": self.store.column("value")[index],
+            },
+            copy=False,
+        )
@@ -1,10 +1,20 @@
 import asyncio
+import gzip
+import http.client
+import inspect
 import logging
 import datetime as dt
+import os
 import re
 import json
-import urllib.request
-from typing import Literal, Union, List
+import tempfile
+import threading
+import urllib.parse
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from typing import Dict, Literal, Optional, Tuple, Union, List
+import numpy as np
 import pandas as pd
 
 from .chart import Chart
@@ -24,10 +34,15 @@ _log.setLevel(logging.ERROR)
 _log.addHandler(ch)
 
 api_key = ''
+base_url = 'https://api.polygon.io'
 _tickers = {}
 _set_on_load = []
 
 _lasts = {}
+# the tickers updated since their subscribers were last called, in order
+_pending: Dict[str, None] = {}
+_wake: Optional[asyncio.Event] = None
+_delivery: Optional[asyncio.Task] = None
 _ws = {'stocks': None, 'options': None, 'indices': None, 'crypto': None, 'forex': None}
 _subscription_type = {
     'stocks': ('Q', 'A'),
@@ -64,35 +79,374 @@ def _get_sec_type(ticker):
         return 'stocks'
 
 
-def _polygon_request(query_url):
-    query_url = 'https://api.polygon.io'+query_url
-    query_url += f'&apiKey={api_key}'
+class RestClient:
+    """
+    Requests JSON from Polygon.io over keep-alive connections, reusing up to
+    `max_connections` idle connections per host.
+
+    `pages` follows the `next_url` of each response, and `fetch` requests
+    several URLs at once, on at most `max_connections` threads.
+    """
+    headers = {'User-Agent': 'lightweight_charts/1.0', 'Accept-Encoding': 'gzip'}
+
+    def __init__(self, max_connections: int = 8, timeout: float = 30):
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._idle: Dict[Tuple[str, str], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_connections, thread_name_prefix='polygon')
+
+    def get(self, url: str) -> Optional[dict]:
+        parts = urllib.parse.urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        path = f'{parts.path}?{parts.query}' if parts.query else parts.path
+        connection, reused = self._connection(host)
+        try:
+            status, will_close, body = self._request(connection, path)
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            if not reused:
+                raise
+            # the server closed the idle connections, so start afresh
+            self._discard(host)
+            connection, _ = self._connection(host)
+            status, will_close, body = self._request(connection, path)
+        if will_close:
+            connection.close()
+        else:
+            self._release(host, connection)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+        if status != 200:
+            error = data.get('error') or data.get('message') if isinstance(data, dict) else body[:200]
+            _log.error(f'({status}) Request failed: {error}')
+            return None
+        return data
+
+    def pages(self, url: str) -> Optional[List[list]]:
+        """
+        Returns the results of every page from `url` on, or None if a request fails.
+        """
+        pages = []
+        while url:
+            data = self.get(_with_key(url))
+            if data is None or data.get('status') == 'ERROR':
+                return None
+            pages.append(data.get('results') or [])
+            url = data.get('next_url')
+        return pages
+
+    def fetch(self, urls: List[str]) -> List[Optional[List[list]]]:
+        """
+        Returns the pages from each URL, requesting them concurrently.
+        """
+        if len(urls) == 1:
+            return [self.pages(urls[0])]
+        return list(self._executor.map(self.pages, urls))
+
+    def close(self):
+        with self._lock:
+            hosts = list(self._idle)
+        for host in hosts:
+            self._discard(host)
+
+    def _request(self, connection: http.client.HTTPConnection, path: str):
+        connection.request('GET', path, headers=self.headers)
+        response = connection.getresponse()
+        body = response.read()
+        if response.getheader('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return response.status, response.will_close, body
+
+    def _connection(self, host: Tuple[str, str]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                return idle.pop(), True
+        scheme, netloc = host
+        cls = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return cls(netloc, timeout=self.timeout), False
+
+    def _release(self, host: Tuple[str, str], connection: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(host, [])
+            if len(idle) < self.max_connections:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _discard(self, host: Tuple[str, str]):
+        with self._lock:
+            idle = self._idle.pop(host, [])
+        for connection in idle:
+            connection.close()
+
+
+_client = RestClient()
+
+
+def _with_key(url: str) -> str:
+    return f"{url}{'&' if '?' in url else '?'}apiKey={api_key}"
+
+
+def _aggs_url(ticker, mult, span, start_date, end_date, limit):
+    return f"{base_url}/v2/aggs/ticker/{ticker}/range/{mult}/{span}/{start_date}/{end_date}?limit={limit}"
+
+
+BAR_KEYS = ('t', 'o', 'h', 'l', 'c', 'v')
 
-    request = urllib.request.Request(query_url, headers={'User-Agent': 'lightweight_charts/1.0'})
-    with urllib.request.urlopen(request) as response:
-        if response.status != 200:
-            error = response.json()
-            _log.error(f'({response.status}) Request failed: {error["error"]}')
-            return
-        data = json.loads(response.read())
-        if 'results' not in data:
-            _log.error(f'No results for {query_url}')
-            return
-        return data['results']
+
+def _day(date) -> int:
+    return int(np.datetime64(pd.Timestamp(date).date(), 'D').astype(np.int64))
+
+
+def _date(day: int) -> str:
+    return str(np.datetime64(day, 'D'))
+
+
+def _timezone(ticker: str) -> str:
+    # the time zone of the days in Polygon.io's date ranges
+    return 'UTC' if _get_sec_type(ticker) in ('forex', 'crypto') else 'America/New_York'
+
+
+def _day_ms(day: int, tz: str) -> int:
+    # the start of the day in the time zone, in milliseconds since the epoch
+    return pd.Timestamp(_date(day), tz=tz).value // 1_000_000
+
+
+def _today(tz: str) -> int:
+    return _day(pd.Timestamp.now(tz))
+
+
+def _missing(coverage: np.ndarray, start: int, end: int):
+    # the ranges of days from start to end (inclusive) outside the coverage
+    cursor = start
+    for first, last in coverage.tolist():
+        if last < cursor:
+            continue
+        if first > end:
+            break
+        if first > cursor:
+            yield cursor, first - 1
+        cursor = max(cursor, last + 1)
+    if cursor <= end:
+        yield cursor, end
+
+
+def _cover(coverage: np.ndarray, first: int, last: int) -> np.ndarray:
+    ranges = sorted(coverage.tolist() + [[first, last]])
+    merged = [ranges[0]]
+    for first, last in ranges[1:]:
+        if first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+    return np.array(merged, dtype=np.int64)
+
+
+# the bars in a day at a multiplier of 1, to split long ranges into requests of about `limit` bars
+_BARS_PER_DAY = {'second': 86_400, 'minute': 1_440, 'hour': 24, 'day': 1}
+
+
+def _chunks(start: int, end: int, mult, span: str, limit: int) -> List[Tuple[int, int]]:
+    if not _aligned(int(mult), span):
+        return [(start, end)]
+    days = max(1, limit * int(mult) // _BARS_PER_DAY[span])
+    return [(first, min(first + days - 1, end)) for first in range(start, end + 1, days)]
+
+
+def _decode(results: list) -> Dict[str, np.ndarray]:
+    if not results:
+        return {'t': np.empty(0, np.int64)}
+    columns = {}
+    for key in BAR_KEYS:
+        if key not in results[0]:
+            continue
+        dtype = np.int64 if key == 't' else np.float64
+        try:
+            columns[key] = np.fromiter(map(itemgetter(key), results), dtype, len(results))
+        except KeyError:
+            columns[key] = np.fromiter((bar.get(key, np.nan) for bar in results), dtype, len(results))
+    return columns
+
+
+def _fetch_bars(ticker, mult, span, start: int, end: int, limit: int) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Requests the bars from day `start` to `end` (inclusive) in chunks of about
+    `limit` bars at once, or returns None if a request fails.
+    """
+    urls = [
+        _aggs_url(ticker, mult, span, _date(first), _date(last), limit)
+        for first, last in _chunks(start, end, mult, span, limit)
+    ]
+    pages = []
+    for chunk in _client.fetch(urls):
+        if chunk is None:
+            return None
+        pages += [_decode(page) for page in chunk if page]
+    if not pages:
+        return _decode([])
+    keys = [key for key in pages[0] if all(key in page for page in pages)]
+    return {key: np.concatenate([page[key] for page in pages]) for key in keys}
+
+
+def _aligned(mult: int, span: str) -> bool:
+    # whether the bars within a day are the same however the days are split up
+    return span in ('second', 'minute', 'hour') or (span == 'day' and mult == 1)
+
+
+def _merge(columns: Optional[Dict[str, np.ndarray]], bars: Dict[str, np.ndarray]):
+    if columns is None:
+        return bars
+    keys = [key for key in BAR_KEYS if key in columns and key in bars]
+    merged = {key: np.concatenate((columns[key], bars[key])) for key in keys}
+    order = np.argsort(merged['t'], kind='stable')
+    time = merged['t'][order]
+    # a newer bar replaces the one with the same time
+    keep = order[np.append(time[1:] != time[:-1], True)]
+    return {key: values[keep] for key, values in merged.items()}
+
+
+class BarCache:
+    """
+    Aggregates from Polygon.io kept on disk, in one `.npz` file per ticker and
+    timeframe holding the bars and the ranges of days they cover.
+
+    A request only fetches the days missing from the file, and merges their
+    bars in. Bars spanning several days (weeks, months, or several days at
+    once) depend on the first day requested, so they are kept in a file per
+    request instead. Days are those of the exchange (New York, or UTC for forex and
+    crypto), as in Polygon.io's date ranges. Days from today on are never
+    marked as covered, since their bars can still change. Once the files take up more than `max_size` bytes, the
+    least recently used are deleted. When `offline`, nothing is fetched and
+    only the bars on disk are returned.
+    """
+
+    def __init__(self, directory: str, max_size: int = 512 * 2**20, offline: bool = False):
+        self.directory = directory
+        self.max_size = max_size
+        self.offline = offline
+        self._locks: Dict[str, threading.Lock] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def get(
+            self, ticker: str, mult, span: str, start_date: str, end_date: str, limit: int = 5_000
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Returns the bars from `start_date` to `end_date` (inclusive), by their
+        Polygon.io keys (t, o, h, l, c, v), or None if there are none.
+        """
+        start, end = _day(start_date), _day(end_date)
+        aligned = _aligned(int(mult), span)
+        # bars spanning several days start from the start of the request, so
+        # they are kept per request rather than merged with those of others
+        path = self._path(ticker, mult, span, None if aligned else (start, end))
+        tz = _timezone(ticker)
+        with self._locks.setdefault(path, threading.Lock()):
+            columns, coverage = self._load(path)
+            missing = [] if self.offline else list(_missing(coverage, start, end))
+            if missing and not aligned:
+                missing = [(start, end)]
+            today = _today(tz)
+            fetched = False
+            for first, last in missing:
+                page = self._fetch(ticker, mult, span, first, last, limit)
+                if page is None:
+                    continue
+                bars, last = page
+                if not aligned:
+                    columns = bars
+                elif bars is not None:
+                    columns = _merge(columns, bars)
+                last = min(last, today - 1)
+                if last >= first:
+                    coverage = _cover(coverage, first, last)
+                fetched = True
+            if fetched:
+                self._save(path, columns, coverage)
+                self._evict(path)
+            elif os.path.exists(path):
+                os.utime(path)
+        if columns is None:
+            return None
+        i, j = np.searchsorted(columns['t'], [_day_ms(start, tz), _day_ms(end + 1, tz)])
+        if i == j:
+            return None
+        return {key: values[i:j] for key, values in columns.items()}
+
+    def clear(self):
+        """
+        Deletes every file in the cache.
+        """
+        for path in self._files():
+            os.remove(path)
+
+    @staticmethod
+    def _fetch(ticker, mult, span, first, last, limit):
+        bars = _fetch_bars(ticker, mult, span, first, last, limit)
+        if bars is None:
+            return None
+        return bars if len(bars['t']) else None, last
+
+    def _path(self, ticker, mult, span, days: Optional[Tuple[int, int]] = None) -> str:
+        name = f"{urllib.parse.quote(ticker, safe='')}_{mult}_{span}"
+        if days is not None:
+            name += ''.join(f"_{_date(day)}" for day in days)
+        return os.path.join(self.directory, f"{name}.npz")
+
+    def _files(self) -> List[str]:
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith('.npz')]
+
+    @staticmethod
+    def _load(path):
+        try:
+            with np.load(path) as data:
+                columns = {key: data[key] for key in BAR_KEYS if key in data}
+                return columns or None, data['coverage']
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None, np.empty((0, 2), dtype=np.int64)
+
+    def _save(self, path, columns, coverage):
+        fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            np.savez(file, coverage=coverage, **(columns or {}))
+        os.replace(temp, path)
+
+    def _evict(self, keep: str):
+        files = sorted(self._files(), key=os.path.getmtime)
+        total = sum(map(os.path.getsize, files))
+        for path in files:
+            if total <= self.max_size:
+                break
+            if path != keep:
+                total -= os.path.getsize(path)
+                os.remove(path)
+
+
+_cache: Optional[BarCache] = None
 
 
 def get_bar_data(ticker: str, timeframe: str, start_date: str, end_date: str, limit: int = 5_000):
-    end_date = dt.datetime.now().strftime('%Y-%m-%d') if end_date == 'now' else end_date
     mult, span = _convert_timeframe(timeframe)
     if '-' in ticker:
         ticker = ticker.replace('-', '')
+    end_date = _date(_today(_timezone(ticker))) if end_date == 'now' else end_date
 
-    query_url = f"/v2/aggs/ticker/{ticker}/range/{mult}/{span}/{start_date}/{end_date}?limit={limit}"
-    results = _polygon_request(query_url)
-    if not results:
+    if _cache is not None:
+        columns = _cache.get(ticker, mult, span, start_date, end_date, limit)
+        return None if columns is None else _bar_frame(ticker, columns)
+
+    bars = _fetch_bars(ticker, mult, span, _day(start_date), _day(end_date), limit)
+    if bars is None or not len(bars['t']):
+        _log.error(f'No results for {ticker} from {start_date} to {end_date}')
         return None
+    return _bar_frame(ticker, bars)
+
 
-    df = pd.DataFrame(results)
+def _bar_frame(ticker, bars) -> pd.DataFrame:
+    df = pd.DataFrame(bars)
     df['t'] = pd.to_datetime(df['t'], unit='ms')
 
     rename = {'o': 'open', 'h': 'high', 'l': 'low', 'c': 'close', 't': 'time'}
@@ -115,7 +469,12 @@ async def _send(sec_type: SEC_TYPE, action: str, params: str):
     await ws.send(json.dumps({'action': action, 'params': params}))
 
 
-async def subscribe(ticker: str, sec_type: SEC_TYPE, func, args, precision=2):
+async def subscribe(ticker: str, sec_type: SEC_TYPE, func, args, precision=2, raw: bool = False):
+    """
+    Calls `func` with the latest quote and the volume traded since the last call,
+    at most once per websocket frame. If `raw`, it is called as
+    `func(time_ns, price, volume, *args)`, and otherwise with a Series.
+    """
     if not _ws[sec_type]:
         asyncio.create_task(_websocket_connect(sec_type))
 
@@ -140,14 +499,14 @@ async def subscribe(ticker: str, sec_type: SEC_TYPE, func, args, precision=2):
     await _send(sec_type, 'subscribe', f'{quotes}.{ticker}')
     await _send(sec_type, 'subscribe', f'{aggs}.{ticker}') if aggs else None
 
-    if func in data['funcs']:
+    if any(f == func for f, _, _ in data['funcs']):
         return
-    data['funcs'].append((func, args))
+    data['funcs'].append((func, args, raw))
 
 
 async def unsubscribe(func):
     for key, data in _lasts.items():
-        if val := next(((f, args) for f, args in data['funcs'] if f == func), None):
+        if val := next((entry for entry in data['funcs'] if entry[0] == func), None):
             break
     else:
         return
@@ -175,50 +534,89 @@ async def _websocket_connect(sec_type):
         _ws[sec_type] = ws
         await _send(sec_type, 'auth', api_key)
         while 1:
-            response = await ws.recv()
-            data_list: List[dict] = json.loads(response)
-            for i, data in enumerate(data_list):
-                if data['ev'] == 'status':
-                    _log.info(f'{data["message"]}')
-                    continue
-                _ticker_key = {
-                    'stocks': 'sym',
-                    'options': 'sym',
-                    'indices': 'T',
-                    'forex': 'p',
-                    'crypto': 'pair',
-                }
-                await _handle_tick(data[ticker_key], data)
-
-
-async def _handle_tick(ticker, data):
-    lasts = _lasts[ticker]
+            _handle_frame(await ws.recv(), ticker_key)
+
+
+def _handle_frame(frame: Union[str, bytes], ticker_key: str):
+    """
+    Applies every message of a frame to the state of its ticker, then wakes the
+    delivery task. While subscribers are busy, later frames are merged into the
+    same state, so only the latest quote of each ticker is waiting.
+    """
+    global _wake, _delivery
+    for data in json.loads(frame):
+        if data['ev'] == 'status':
+            _log.info(f'{data["message"]}')
+            continue
+        _handle_tick(data[ticker_key], data)
+    if not _pending:
+        return
+    loop = asyncio.get_running_loop()
+    if _delivery is None or _delivery.done() or _delivery.get_loop() is not loop:
+        _wake = asyncio.Event()
+        _delivery = loop.create_task(_deliver())
+        _delivery.add_done_callback(_delivery_done)
+    _wake.set()
+
+
+def _delivery_done(task: asyncio.Task):
+    # a subscriber raised; the next frame starts a new delivery task
+    if not task.cancelled() and task.exception() is not None:
+        _log.error('Subscriber failed', exc_info=task.exception())
+
+
+def _handle_tick(ticker, data):
+    lasts = _lasts.get(ticker)
+    if lasts is None:
+        return
     sec_type = _get_sec_type(ticker)
 
     if data['ev'] in ('Q', 'V', 'C', 'XQ'):
-        if sec_type == 'forex':
-            data['bp'] = data.pop('b')
-            data['ap'] = data.pop('a')
-        price = (data['bp'] + data['ap']) / 2 if sec_type != 'indices' else data['val']
+        if sec_type == 'indices':
+            price = data['val']
+        elif sec_type == 'forex':
+            price = (data['b'] + data['a']) / 2
+        else:
+            price = (data['bp'] + data['ap']) / 2
         if abs(price - lasts['price']) < (1/(10**lasts['precision'])):
             return
         lasts['price'] = price
-
-        if sec_type != 'indices':
-            lasts['volume'] = 0
-
-        if 't' not in data:
-            lasts['time'] = pd.to_datetime(data.pop('s'), unit='ms')
-        else:
-            lasts['time'] = pd.to_datetime(data['t'], unit='ms')
+        lasts['time'] = data['t'] if 't' in data else data['s']
 
     elif data['ev'] in ('A', 'CA', 'XA'):
-        lasts['volume'] = data['v']
         if not lasts.get('time'):
             return
-    lasts['symbol'] = ticker
-    for func, args in lasts['funcs']:
-        func(pd.Series(lasts), *args)
+        if 'volume' in lasts:
+            # the volume traded since the subscribers were last called
+            lasts['volume'] += data['v']
+    _pending[ticker] = None
+
+
+async def _deliver():
+    while 1:
+        await _wake.wait()
+        _wake.clear()
+        tickers = list(_pending)
+        _pending.clear()
+        for ticker in tickers:
+            lasts = _lasts[ticker]
+            time_ms, price, volume = lasts['time'], lasts['price'], lasts.get('volume')
+            if volume is not None:
+                lasts['volume'] = 0
+            series = None
+            for func, args, raw in list(lasts['funcs']):
+                if raw:
+                    result = func(time_ms * 1_000_000, price, volume, *args)
+                else:
+                    if series is None:
+                        series = pd.Series({'time': pd.to_datetime(time_ms, unit='ms'), 'price': price})
+                        if volume is not None:
+                            series['volume'] = volume
+                        series['symbol'] = ticker
+                    result = func(series.copy(), *args)
+                if inspect.isawaitable(result):
+                    # frames arriving meanwhile are merged into the pending state
+                    await result
 
 
 class PolygonAPI:
@@ -243,7 +641,7 @@ class PolygonAPI:
 
     async def async_set(self, sec_type: Literal['stocks', 'options', 'indices', 'forex', 'crypto'], ticker, timeframe,
                         start_date, end_date, limit, live):
-        await unsubscribe(self._chart.update_from_tick)
+        await unsubscribe(self._chart.tick)
 
         df = await async_get_bar_data(ticker, timeframe, start_date, end_date, limit)
 
@@ -252,7 +650,7 @@ class PolygonAPI:
 
         if not live:
             return True
-        await subscribe(ticker, sec_type, self._chart.update_from_tick, (True,), self._chart.num_decimals)
+        await subscribe(ticker, sec_type, self._chart.tick, (True,), self._chart.num_decimals, raw=True)
         return True
 
     def stock(
@@ -387,6 +785,28 @@ class PolygonAPI:
         global api_key
         api_key = key
 
+    @staticmethod
+    def base_url(url: str):
+        """
+        Sets the URL requests are sent to, instead of https://api.polygon.io.
+        """
+        global base_url
+        base_url = url.rstrip('/')
+
+    @staticmethod
+    def cache(
+            directory: Optional[str] = os.path.join(os.path.expanduser('~'), '.cache', 'lightweight_charts', 'polygon'),
+            max_size: int = 512 * 2**20, offline: bool = False
+    ):
+        """
+        Keeps the bars requested on disk, and only requests the days not yet kept.\n
+        :param directory:   The directory the bars are kept in, or None to stop caching.
+        :param max_size:    The size in bytes above which the least recently used bars are deleted.
+        :param offline:     If true, only the bars kept on disk are used, and nothing is requested.
+        """
+        global _cache
+        _cache = None if directory is None else BarCache(directory, max_size, offline)
+
 
 class PolygonChart(Chart):
     """
@@ -0,0 +1,151 @@
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .abstract import Candlestick, SeriesCommon
+from .bars import Bar
+from .util import INTERVAL, NS, seconds, time_ns
+
+
+class _Target:
+    __slots__ = ("chart", "interval", "offset", "closed", "base_time")
+
+    def __init__(self, chart: Candlestick, interval: float, offset: float):
+        self.chart = chart
+        self.interval = interval
+        self.offset = offset
+        # the bar built from the base bars before the current one, in its bucket
+        self.closed: Optional[Bar] = None
+        self.base_time: Optional[float] = None
+
+    def update(self, base_time: float, open, high, low, close, volume):
+        time = self.interval * (base_time // self.interval) + self.offset
+        last = self.chart._current_bar()
+        if base_time != self.base_time:
+            # the previous base bar is complete, and part of the last bar
+            self.closed = last if last is not None and last.time == time else None
+            self.base_time = base_time
+        closed = self.closed
+        if closed is None:
+            bar = Bar(time, open, high, low, close, volume)
+        else:
+            bar = Bar(
+                time,
+                closed.open,
+                max(closed.high, high),
+                min(closed.low, low),
+                close,
+                closed.volume if volume is None else volume + (closed.volume or 0),
+            )
+        self.chart._push_bar(bar, last is None or last.time != time)
+
+
+class Resampler:
+    """
+    Feeds one stream of ticks or bars to several charts, each showing it at its
+    own interval.
+
+    Each chart keeps the state of its latest bar, so a tick or base bar costs a
+    few comparisons per chart. `backfill` builds every chart's history from a
+    DataFrame of base bars at once.
+    """
+
+    def __init__(self):
+        self._targets: List[_Target] = []
+
+    def attach(self, chart: Candlestick, interval: INTERVAL, offset: INTERVAL = 0):
+        """
+        Adds a chart to feed, with bars of the given interval (seconds, or a
+        string such as "5min").
+        """
+        target = _Target(chart, seconds(interval), seconds(offset))
+        chart._interval, chart.offset = target.interval, target.offset
+        self._targets.append(target)
+        return chart
+
+    def backfill(self, df: pd.DataFrame):
+        """
+        Sets the data of every chart from a DataFrame of base bars.\n
+        :param df: columns: date/time, open, high, low, close, volume (if using volume).
+        """
+        if df.empty:
+            return
+        df = df.copy(deep=False)
+        df.columns = SeriesCommon._format_labels(df, df.columns, df.index, None)
+        if not pd.api.types.is_datetime64_any_dtype(df["time"]):
+            df["time"] = pd.to_datetime(df["time"])
+        utc, _ = time_ns(df["time"])
+        base_times = utc / NS
+        columns = {
+            key: df[key].to_numpy(np.float64)
+            for key in ("open", "high", "low", "close", "volume")
+            if key in df
+        }
+        for target in self._targets:
+            times = target.interval * (base_times // target.interval) + target.offset
+            starts = np.flatnonzero(np.diff(times, prepend=np.nan))
+            bars = _reduce(columns, starts)
+            bars["time"] = (times[starts] * NS).astype(np.int64).view("datetime64[ns]")
+            target.chart.set(
+                pd.DataFrame(bars, copy=False),
+                interval=target.interval,
+                offset=target.offset,
+            )
+            # live updates to the last base bar are merged with the bars before it
+            target.base_time = float(base_times[-1])
+            target.closed = None
+            if len(base_times) - starts[-1] > 1:
+                closed = _reduce(
+                    {key: values[starts[-1] : -1] for key, values in columns.items()},
+                    np.array([0]),
+                )
+                target.closed = Bar(
+                    float(times[-1]), *(values[0].item() for values in closed.values())
+                )
+
+    def tick(self, time_ns: int, price: float, volume: Optional[float] = None):
+        """
+        Updates every chart from a tick. The volume of each tick is added onto
+        the bars it falls in.
+        """
+        for target in self._targets:
+            target.chart.tick(time_ns, price, volume, cumulative_volume=True)
+
+    def update_from_ticks(self, df: pd.DataFrame):
+        """
+        Updates every chart from a DataFrame of ticks.
+        """
+        for target in self._targets:
+            target.chart.update_from_ticks(df, cumulative_volume=True)
+
+    def update(
+        self,
+        time_ns: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: Optional[float] = None,
+    ):
+        """
+        Updates every chart from a base bar. A base bar can be updated until the
+        next one starts, as with `update`.\n
+        :param time_ns: The open time of the base bar, in nanoseconds since the epoch (UTC).
+        """
+        base_time = time_ns / NS
+        for target in self._targets:
+            target.update(base_time, open, high, low, close, volume)
+
+
+def _reduce(columns: dict, starts: np.ndarray) -> dict:
+    last = np.append(starts[1:], len(columns["open"])) - 1
+    bars = {
+        "open": columns["open"][starts],
+        "high": np.fmax.reduceat(columns["high"], starts),
+        "low": np.fmin.reduceat(columns["low"], starts),
+        "close": columns["close"][last],
+    }
+    if "volume" in columns:
+        bars["volume"] = np.add.reduceat(np.nan_to_num(columns["volume"]), starts)
+    return bars
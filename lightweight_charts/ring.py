@@ -0,0 +1,281 @@
+import asyncio
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .abstract import Candlestick
+from .bars import Bar
+from .util import INTERVAL, NS, time_ns
+
+# capacity, count, version, magic
+_HEADER = 4
+_MAGIC = 0x676E69722D63776C
+# time (seconds), open, high, low, close, volume (NaN if none)
+_FIELDS = 6
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name, track=False)
+    except TypeError:
+        pass
+    # Before Python 3.13, attaching registers the block to be unlinked when this
+    # process exits, and the tracker may be shared with its creator. Only the
+    # registration of this block is skipped, so other threads are unaffected.
+    from multiprocessing import resource_tracker
+
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def skip(key: str, rtype: str):
+            if rtype != "shared_memory" or key.lstrip("/") != name.lstrip("/"):
+                register(key, rtype)
+
+        resource_tracker.register = skip
+        try:
+            return shared_memory.SharedMemory(name)
+        finally:
+            resource_tracker.register = register
+
+
+class BarRing:
+    """
+    A ring buffer of the latest `capacity` OHLCV bars in shared memory, written
+    by one process and read by any number of others.
+
+    Every slot has a sequence number which is odd while the slot is being
+    written, so readers copy a slot and retry if its number was odd or changed
+    meanwhile. `count` is the number of bars ever written, and `version` goes up
+    after every write.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory):
+        self._memory = memory
+        self._header = np.ndarray((_HEADER,), np.int64, memory.buf)
+        if self._header[3] != _MAGIC:
+            raise ValueError(f'"{memory.name}" is not a bar ring.')
+        self.capacity = int(self._header[0])
+        self._seq = np.ndarray((self.capacity,), np.int64, memory.buf, _HEADER * 8)
+        self._bars = np.ndarray(
+            (self.capacity, _FIELDS), np.float64, memory.buf, (_HEADER + self.capacity) * 8
+        )
+
+    @classmethod
+    def create(cls, capacity: int = 100_000, name: Optional[str] = None) -> "BarRing":
+        """
+        Creates a ring holding the latest `capacity` bars. It is removed once
+        the creating process calls `unlink`.
+        """
+        size = (_HEADER + capacity * (1 + _FIELDS)) * 8
+        memory = shared_memory.SharedMemory(name, create=True, size=size)
+        header = np.ndarray((_HEADER,), np.int64, memory.buf)
+        header[:] = (capacity, 0, 0, _MAGIC)
+        return cls(memory)
+
+    @classmethod
+    def attach(cls, name: str) -> "BarRing":
+        """
+        Opens a ring created by another process, by its name.
+        """
+        return cls(_attach(name))
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def count(self) -> int:
+        return int(self._header[1])
+
+    @property
+    def version(self) -> int:
+        return int(self._header[2])
+
+    def update(
+        self,
+        time_ns: int,
+        open: float,
+        high: float,
+        low: float,
+        close: float,
+        volume: Optional[float] = None,
+    ):
+        """
+        Writes a bar, replacing the latest bar if it has the same time.\n
+        :param time_ns: The open time of the bar, in nanoseconds since the epoch (UTC).
+        """
+        seconds = time_ns / NS
+        count = self.count
+        if count and self._bars[(count - 1) % self.capacity, 0] == seconds:
+            count -= 1
+        i = count % self.capacity
+        self._seq[i] += 1
+        self._bars[i] = (seconds, open, high, low, close, np.nan if volume is None else volume)
+        self._seq[i] += 1
+        self._header[1] = count + 1
+        self._header[2] += 1
+
+    def extend(self, df: pd.DataFrame):
+        """
+        Writes the bars of a DataFrame with the columns time, open, high, low,
+        close and volume (optional). The first bar replaces the latest bar if it
+        has the same time.
+        """
+        if df.empty:
+            return
+        column = df["time"]
+        if not pd.api.types.is_datetime64_any_dtype(column):
+            column = pd.to_datetime(column)
+        times = time_ns(column)[0] / NS
+        count = self.count
+        if count and self._bars[(count - 1) % self.capacity, 0] == times[0]:
+            count -= 1
+        rows = np.column_stack(
+            [times]
+            + [df[key].to_numpy(np.float64) for key in ("open", "high", "low", "close")]
+            + [df["volume"].to_numpy(np.float64) if "volume" in df else np.full(len(df), np.nan)]
+        )[-self.capacity :]
+        end = count + len(times)
+        slots = np.arange(end - len(rows), end) % self.capacity
+        self._seq[slots] += 1
+        self._bars[slots] = rows
+        self._seq[slots] += 1
+        self._header[1] = end
+        self._header[2] += 1
+
+    def read(self, start: int, stop: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns a consistent copy of the bars from `start` to `stop` (as counted
+        by `count`), and their sequence numbers. Bars which have been overwritten
+        are left out, so the copy may start later than `start`.
+        """
+        while True:
+            start = max(start, stop - self.capacity)
+            slots = np.arange(start, stop) % self.capacity
+            before = self._seq[slots]
+            bars = self._bars[slots]
+            after = self._seq[slots]
+            if np.array_equal(before, after) and not (before & 1).any():
+                break
+            time.sleep(0)
+        lapped = self.count - self.capacity - start
+        if lapped > 0:
+            return bars[lapped:], before[lapped:]
+        return bars, before
+
+    def frame(self) -> pd.DataFrame:
+        """
+        Returns the bars in the ring, oldest first.
+        """
+        bars, _ = self.read(0, self.count)
+        return _frame(bars)
+
+    def wait(self, version: int, timeout: Optional[float] = None, interval: float = 0.001) -> int:
+        """
+        Waits until `version` has changed, and returns the new version (which is
+        still `version` if `timeout` seconds passed first).
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.version == version:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            time.sleep(interval)
+        return self.version
+
+    def close(self):
+        """
+        Releases the ring in this process.
+        """
+        self._header = self._seq = self._bars = None
+        self._memory.close()
+
+    def unlink(self):
+        """
+        Removes the ring once every process has closed it. Called by the process which created it.
+        """
+        self._memory.unlink()
+
+
+def _frame(bars: np.ndarray) -> pd.DataFrame:
+    df = pd.DataFrame(bars, columns=["time", "open", "high", "low", "close", "volume"])
+    df["time"] = pd.to_datetime(df["time"], unit="s")
+    if df["volume"].isna().all():
+        return df.drop(columns="volume")
+    return df
+
+
+class RingFeed:
+    """
+    Pushes the bars written to a `BarRing` onto a chart.
+
+    `poll` reads the bars written since it was last called, as NumPy copies of
+    the shared memory. The bar last shown is only pushed again if its sequence
+    number changed. The first call sets the chart to every bar in the ring.
+    """
+
+    def __init__(
+        self,
+        chart: Candlestick,
+        ring: BarRing,
+        interval: Optional[INTERVAL] = None,
+    ):
+        self.chart = chart
+        self.ring = ring
+        self.interval = interval
+        self._count = 0
+        self._version: Optional[int] = None
+        self._last_seq: Optional[int] = None
+        self._running = False
+
+    def poll(self) -> int:
+        """
+        Pushes the bars written since the last call, and returns how many.
+        """
+        version = self.ring.version
+        if version == self._version:
+            return 0
+        count = self.ring.count
+        if self._version is None:
+            bars, seqs = self.ring.read(0, count)
+            if len(bars):
+                self.chart.set(_frame(bars), interval=self.interval)
+                self._last_seq = seqs[-1].item()
+            self._version, self._count = version, count
+            return len(bars)
+
+        start = max(self._count - 1, 0)
+        bars, seqs = self.ring.read(start, count)
+        # the index in the ring of the first bar read
+        first = count - len(bars)
+        pushed = 0
+        for i, (row, seq) in enumerate(zip(bars.tolist(), seqs.tolist())):
+            index = first + i
+            if index == self._count - 1 and seq == self._last_seq:
+                continue
+            volume = row[5]
+            bar = Bar(*row[:5], None if volume != volume else volume)
+            self.chart._push_bar(bar, index >= self._count)
+            pushed += 1
+        if len(bars):
+            self._last_seq = seqs[-1].item()
+        self._version, self._count = version, count
+        return pushed
+
+    async def run(self, interval: float = 0.01):
+        """
+        Polls every `interval` seconds until `stop` is called.
+        """
+        self._running = True
+        while self._running:
+            self.poll()
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        self._running = False
@@ -1,8 +1,10 @@
 import asyncio
 import json
+import threading
+from base64 import b64encode
 from datetime import datetime
 from random import choices
-from typing import Literal, Union
+from typing import Callable, Dict, Hashable, List, Literal, Optional, Tuple, Union
 from numpy import isin
 import pandas as pd
 import numpy as np
@@ -29,7 +31,14 @@ class IDGen(list):
         if var not in self:
             self.append(var)
             return f"window.{var}"
-        self.generate()
+        return self.generate()
+
+    def generate_block(self, count: int) -> List[str]:
+        """
+        Returns `count` unique ids sharing a single generated prefix.
+        """
+        prefix = self.generate()
+        return [f"{prefix}_{i}" for i in range(count)]
 
 
 def parse_event_message(window, string):
@@ -41,24 +50,227 @@ def parse_event_message(window, string):
     return func, args
 
 
-def js_data(data: Union[pd.DataFrame, pd.Series]):
-    def default(obj):
-        if isinstance(obj, (datetime, pd.Timestamp, np.datetime64)):
-            # np.datetime64 to pandas.Timestamp for timestamp()
-            if isinstance(obj, np.datetime64):
-                obj = pd.Timestamp(obj)
-            return int(obj.timestamp())
-        return str(obj)
-    if isinstance(data, pd.DataFrame):
-        d = data.to_dict(orient="records")
-        filtered_records = [
-            {k: v for k, v in record.items() if v is not None and not pd.isna(v)}
-            for record in d
+def _json_default(obj):
+    if isinstance(obj, (datetime, pd.Timestamp, np.datetime64)):
+        # np.datetime64 to pandas.Timestamp for timestamp()
+        if isinstance(obj, np.datetime64):
+            obj = pd.Timestamp(obj)
+        return int(obj.timestamp())
+    return str(obj)
+
+
+def _dump_tokens(values: np.ndarray) -> list:
+    # a single json.dumps over the column is much faster than formatting each cell
+    dumped = json.dumps(values.tolist(), separators=(",", ":"))
+    return dumped[1:-1].split(",") if len(values) else []
+
+
+def _column_tokens(column: pd.Series):
+    """
+    Encodes a column as a list of JSON tokens, along with a mask of the
+    cells which are null and should be left out of their record.
+    """
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        column = column.dt.tz_convert("UTC").dt.tz_localize(None)
+    values = column.to_numpy()
+    kind = values.dtype.kind
+    if kind in "iub":
+        return _dump_tokens(values), None
+    if kind == "f":
+        mask = np.isnan(values)
+        return _dump_tokens(values), mask if mask.any() else None
+    if kind == "M":
+        mask = np.isnat(values)
+        seconds = values.astype("datetime64[s]").astype(np.int64)
+        return _dump_tokens(seconds), mask if mask.any() else None
+    # strings and other objects are usually a handful of distinct values
+    # (colors etc.), so each unique value is only encoded once.
+    codes, uniques = pd.factorize(values)
+    encoded = np.array(
+        [
+            json.dumps(u.item() if isinstance(u, np.generic) else u, default=_json_default)
+            for u in uniques
         ]
+        + [""],
+        dtype=object,
+    )
+    mask = codes == -1
+    return encoded[codes].tolist(), mask if mask.any() else None
+
+
+def js_data(data: Union[pd.DataFrame, pd.Series]):
+    if isinstance(data, pd.Series):
+        return json.dumps(data.to_dict(), separators=(",", ":"), default=_json_default)
+    if data.empty:
+        return "[]"
+    keys = [json.dumps(str(k)) for k in data.columns]
+    columns = [_column_tokens(data.iloc[:, i]) for i in range(len(keys))]
+
+    if all(mask is None for _, mask in columns):
+        template = "{" + ",".join(f"{k.replace('%', '%%')}:%s" for k in keys) + "}"
+        return "[" + ",".join(map(template.__mod__, zip(*(t for t, _ in columns)))) + "]"
+
+    pieces = []
+    for key, (tokens, mask) in zip(keys, columns):
+        piece = [f"{key}:{token}," for token in tokens]
+        if mask is not None:
+            for i in np.flatnonzero(mask).tolist():
+                piece[i] = ""
+        pieces.append(piece)
+    return "[" + ",".join("{" + "".join(row)[:-1] + "}" for row in zip(*pieces)) + "]"
+
+
+def _pack_column(column: pd.Series, binary: bool = True) -> Tuple[str, object]:
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        column = column.dt.tz_convert("UTC").dt.tz_localize(None)
+    values = column.to_numpy()
+    kind = values.dtype.kind
+    if kind == "M":
+        nat = np.isnat(values)
+        values = values.astype("datetime64[s]").astype(np.float64)
+        values[nat] = np.nan
+        kind = "f"
+    if kind in "iub":
+        fits = len(values) == 0 or (values.min() >= -(2**31) and values.max() < 2**31)
+        dtype = "<i4" if fits else "<f8"
+    elif kind == "f":
+        dtype = "<f8"
+    else:
+        codes, uniques = pd.factorize(values)
+        lookup = np.array([*uniques.tolist(), None], dtype=object)
+        return "json", lookup[codes].tolist()
+    if not binary:
+        # NaN isn't JSON, but is read as a JavaScript expression
+        return "json", values.tolist()
+    packed = np.ascontiguousarray(values, dtype=dtype).tobytes()
+    return dtype[1:], b64encode(packed).decode("ascii")
+
+
+def _packed_columns(columns: Dict[str, Tuple[str, object]]) -> List[str]:
+    # joined in one go rather than through json.dumps, as the base64 strings
+    # can be large and every intermediate copy adds to the peak memory used
+    pieces = ["{"]
+    for i, (key, column) in enumerate(columns.items()):
+        pieces.extend(("," if i else "", json.dumps(key), ":", *_packed_column(column)))
+    pieces.append("}")
+    return pieces
+
+
+def _packed_column(column: Tuple[str, object]) -> Tuple[str, ...]:
+    kind, values = column
+    if kind == "json":
+        values = json.dumps(values, separators=(",", ":"), default=_json_default)
     else:
-        d = data.to_dict()
-        filtered_records = {k: v for k, v in d.items()}
-    return json.dumps(filtered_records, indent=2, default=default)
+        values = f'"{values}"'
+    return f'["{kind}",', values, "]"
+
+
+def js_columns(data: pd.DataFrame):
+    """
+    Packs each column of a DataFrame into a little-endian typed array (base64),
+    which `Lib.Handler.unpackColumns` turns back into row objects in the browser.
+    """
+    columns = {str(key): _pack_column(column) for key, column in data.items()}
+    pieces = [f'Lib.Handler.unpackColumns({{"length":{len(data)},"columns":']
+    pieces.extend(_packed_columns(columns))
+    pieces.append("})")
+    return "".join(pieces)
+
+
+def js_set_many(
+    time: pd.Series, series: List[Tuple[str, pd.DataFrame]], binary: bool = True
+) -> str:
+    """
+    Returns a script setting the data of several series, given as their
+    JavaScript objects and frames of their value columns, which share a single
+    time column. The time column is only sent once.
+    """
+    pieces = [
+        f'Lib.Handler.setMany({{"length":{len(time)},"time":',
+        *_packed_column(_pack_column(time, binary)),
+        ',"series":[',
+    ]
+    for i, (target, df) in enumerate(series):
+        columns = {str(key): _pack_column(column, binary) for key, column in df.items()}
+        pieces.extend(("," if i else "", f"[{target},", *_packed_columns(columns), "]"))
+    pieces.append("]})")
+    return "".join(pieces)
+
+
+NS = 10**9
+NAT = np.iinfo(np.int64).min
+
+
+def time_ns(column: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Returns a datetime column as int64 nanoseconds since the epoch in UTC, and
+    as nanoseconds of wall-clock time in the column's own timezone.
+    """
+    if isinstance(column.dtype, pd.DatetimeTZDtype):
+        utc, wall = column.dt.tz_convert(None), column.dt.tz_localize(None)
+    else:
+        utc = wall = column
+    utc = utc.to_numpy().astype("datetime64[ns]", copy=False).view(np.int64)
+    wall = wall.to_numpy().astype("datetime64[ns]", copy=False).view(np.int64)
+    return utc, wall
+
+
+def _mode(values: np.ndarray):
+    uniques, counts = np.unique(values, return_counts=True)
+    return uniques[counts.argmax()]
+
+
+def infer_interval(
+    utc: np.ndarray, wall: np.ndarray, sample_size: int = 4096
+) -> Optional[Tuple[float, float]]:
+    """
+    Infers the bar interval and offset, in seconds, from nanosecond timestamps.\n
+    The interval is the most common gap between consecutive bars. The offset is
+    the most common value of the smallest non-zero clock unit (microsecond,
+    second, minute, hour, day of month), if that is smaller than the interval.
+    Frames longer than `sample_size` are judged from evenly spaced samples.
+    """
+    valid = utc != NAT
+    if not valid.all():
+        utc, wall = utc[valid], wall[valid]
+    if len(utc) < 2:
+        return None
+    if len(utc) - 1 > sample_size:
+        idx = np.linspace(0, len(utc) - 2, sample_size).astype(np.intp)
+        gaps, wall = utc[idx + 1] - utc[idx], wall[idx]
+    else:
+        gaps = np.diff(utc)
+    interval = float(_mode(gaps)) / NS
+
+    units = (
+        lambda: _mode(wall // 1000 % 10**6) / 10**6,
+        lambda: _mode(wall // NS % 60),
+        lambda: _mode(wall // (60 * NS) % 60) * 60,
+        lambda: _mode(wall // (3600 * NS) % 24) * 3600,
+        lambda: _mode(
+            (
+                wall.view("datetime64[ns]").astype("datetime64[D]")
+                - wall.view("datetime64[ns]").astype("datetime64[M]")
+            ).astype(np.int64)
+            + 1
+        )
+        * 86400,
+    )
+    for unit in units:
+        value = float(unit())
+        if value == 0:
+            continue
+        return interval, value if value < interval else 0
+    return interval, 0
+
+
+def seconds(value: Union[float, str, pd.Timedelta]) -> float:
+    """
+    Converts a number of seconds, a Timedelta or a string such as "5min" to seconds.
+    """
+    if isinstance(value, (int, float, np.number)):
+        return float(value)
+    return pd.Timedelta(value).total_seconds()
 
 
 def snake_to_camel(s: str):
@@ -97,6 +309,10 @@ NUM = Union[float, int]
 
 FLOAT = Literal["left", "right", "top", "bottom"]
 
+TRANSPORT = Literal["json", "binary"]
+
+INTERVAL = Union[float, str, pd.Timedelta]
+
 
 def as_enum(value, string_types):
     types = string_types.__args__
@@ -118,6 +334,14 @@ def marker_position(p: MARKER_POSITION):
     }.get(p)
 
 
+def map_unique(values, func: Callable) -> np.ndarray:
+    """
+    Applies `func` once to each distinct value, rather than to every value.
+    """
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    return np.array([func(value) for value in uniques], dtype=object)[codes]
+
+
 class Emitter:
     def __init__(self):
         self._callable = None
@@ -266,3 +490,74 @@ class BulkRunScript:
 
     def add_script(self, script):
         self.scripts.append(script)
+
+
+class UpdateScheduler:
+    """
+    Coalesces series updates and sends them to the window as one script,
+    at most `rate` times per second.
+
+    Only the latest update for each key is kept until the next flush, unless it
+    is queued with `append`, in which case it runs after the updates before it.
+    Keys are flushed in the order they were first queued, except that appended
+    keys (such as marker deltas, which refer to bars) come after the others.
+    """
+
+    def __init__(self, script_func):
+        self.script_func = script_func
+        self.rate: Optional[float] = None
+        self.received = 0
+        self.merged = 0
+        self.flushes = 0
+        self._pending: Dict[Hashable, str] = {}
+        self._appended: Dict[Hashable, str] = {}
+        self._lock = threading.RLock()
+        self._scheduled = False
+
+    @property
+    def enabled(self):
+        return self.rate is not None
+
+    @property
+    def metrics(self) -> dict:
+        return {
+            "received": self.received,
+            "merged": self.merged,
+            "flushes": self.flushes,
+            "pending": len(self._pending) + len(self._appended),
+        }
+
+    def add(self, key: Hashable, script: str, append: bool = False):
+        with self._lock:
+            self.received += 1
+            if append:
+                previous = self._appended.get(key)
+                self._appended[key] = script if previous is None else f"{previous}\n{script}"
+            elif key not in self._pending:
+                self._pending[key] = script
+            else:
+                self.merged += 1
+                self._pending[key] = script
+            if self._scheduled:
+                return
+            self._scheduled = True
+        self._schedule()
+
+    def _schedule(self):
+        try:
+            asyncio.get_running_loop().call_later(1 / self.rate, self.flush)
+        except RuntimeError:
+            timer = threading.Timer(1 / self.rate, self.flush)
+            timer.daemon = True
+            timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._scheduled = False
+            if not self._pending and not self._appended:
+                return
+            script = "\n".join([*self._pending.values(), *self._appended.values()])
+            self._pending.clear()
+            self._appended.clear()
+            self.flushes += 1
+            self.script_func(script)
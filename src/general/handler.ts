@@ -45,6 +45,8 @@ export class Handler {
 
   public series: ISeriesApi<SeriesType>;
   public volumeSeries: ISeriesApi<SeriesType>;
+  public volumeUpColor: string = "rgba(83,141,131,0.8)";
+  public volumeDownColor: string = "rgba(200,127,130,0.8)";
 
   public legend: Legend;
   private _topBar: TopBar | undefined;
@@ -198,6 +200,41 @@ export class Handler {
     return volumeSeries;
   }
 
+  // The volume bar of a candle, colored by whether it closed up or down.
+  volumeBar(bar: any) {
+    const volume = bar.volume;
+    if (volume === undefined || volume === null || volume !== volume)
+      return { time: bar.time };
+    return {
+      time: bar.time,
+      value: volume,
+      color: bar.close > bar.open ? this.volumeUpColor : this.volumeDownColor,
+    };
+  }
+
+  // Sets the candles, and the volume bars derived from them if they hold
+  // volume.
+  setCandles(bars: any[]) {
+    this.series.setData(bars);
+    if (bars.length && !bars.some((bar) => "volume" in bar)) return;
+    this.volumeSeries.setData(bars.map((bar) => this.volumeBar(bar)));
+  }
+
+  // Adds older candles, and the volume bars derived from them, before the
+  // ones shown.
+  prependCandles(bars: any[]) {
+    this.series.setData(bars.concat(this.series.data()));
+    if (!bars.some((bar) => "volume" in bar)) return;
+    this.volumeSeries.setData(
+      bars.map((bar) => this.volumeBar(bar)).concat(this.volumeSeries.data())
+    );
+  }
+
+  updateCandle(bar: any) {
+    this.series.update(bar);
+    if ("volume" in bar) this.volumeSeries.update(this.volumeBar(bar));
+  }
+
   createLineSeries(
     name: string,
     options: DeepPartial<LineStyleOptions & SeriesOptionsCommon>,
@@ -422,4 +459,64 @@ export class Handler {
       rootStyle.setProperty(property, styles[valueKey]);
     }
   }
+
+  // Decodes a column packed as a little-endian typed array (base64), or
+  // given as a plain JSON array.
+  private static decodeColumn([type, data]: [string, any]): ArrayLike<any> {
+    if (type === "json") return data;
+    const raw = atob(data);
+    const bytes = new Uint8Array(raw.length);
+    for (let i = 0; i < raw.length; i++) bytes[i] = raw.charCodeAt(i);
+    return type === "i4"
+      ? new Int32Array(bytes.buffer)
+      : new Float64Array(bytes.buffer);
+  }
+
+  // Adds the cells of each column to the rows. Null and NaN cells are left
+  // out of their row.
+  private static fillRows(
+    rows: any[],
+    columns: { [key: string]: [string, any] }
+  ) {
+    for (const [key, column] of Object.entries(columns)) {
+      const values = Handler.decodeColumn(column);
+      for (let i = 0; i < values.length; i++) {
+        const value = values[i];
+        if (value === null || value !== value) continue;
+        rows[i][key] = value;
+      }
+    }
+  }
+
+  // Rebuilds row objects from columns packed as little-endian typed arrays
+  // (base64) or plain JSON arrays.
+  public static unpackColumns(payload: {
+    length: number;
+    columns: { [key: string]: [string, any] };
+  }) {
+    const rows: any[] = new Array(payload.length);
+    for (let i = 0; i < payload.length; i++) rows[i] = {};
+    Handler.fillRows(rows, payload.columns);
+    return rows;
+  }
+
+  // Sets the data of several series from one time column shared by all of
+  // them, and the value columns of each. A handler is given its candles.
+  public static setMany(payload: {
+    length: number;
+    time: [string, any];
+    series: [
+      ISeriesApi<SeriesType> | Handler,
+      { [key: string]: [string, any] }
+    ][];
+  }) {
+    const time = Handler.decodeColumn(payload.time);
+    for (const [target, columns] of payload.series) {
+      const rows: any[] = new Array(payload.length);
+      for (let i = 0; i < payload.length; i++) rows[i] = { time: time[i] };
+      Handler.fillRows(rows, columns);
+      if (target instanceof Handler) target.setCandles(rows);
+      else target.setData(rows);
+    }
+  }
 }
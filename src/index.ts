@@ -7,6 +7,7 @@ export * from './vertical-line/vertical-line';
 export * from './vertical-span/vertical-span';
 export * from './measure/measure';
 export * from './volume-profile/volume-profile';
+export * from './markers/marker-store';
 
 import { VolumeProfile } from './volume-profile/volume-profile';
 
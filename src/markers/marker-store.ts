@@ -0,0 +1,123 @@
+import {
+    createSeriesMarkers,
+    ISeriesApi,
+    ISeriesMarkersPluginApi,
+    SeriesMarker,
+    SeriesType,
+    Time,
+} from 'lightweight-charts';
+
+type Marker = SeriesMarker<Time> & { id: string };
+
+// Markers of a series, kept sorted by time in a single markers primitive.
+// Changes only touch the markers given, and are drawn once per task.
+export class MarkerStore {
+    private static _stores = new WeakMap<ISeriesApi<SeriesType>, MarkerStore>();
+
+    private _plugin: ISeriesMarkersPluginApi<Time>;
+    private _list: Marker[] = [];
+    private _byId = new Map<string, Marker>();
+    private _removed = false;
+    private _scheduled = false;
+
+    constructor(series: ISeriesApi<SeriesType>) {
+        this._plugin = createSeriesMarkers(series, []);
+    }
+
+    public static of(series: ISeriesApi<SeriesType>) {
+        let store = MarkerStore._stores.get(series);
+        if (!store) {
+            store = new MarkerStore(series);
+            MarkerStore._stores.set(series, store);
+        }
+        return store;
+    }
+
+    // `markers` must be sorted by time.
+    add(markers: Marker[]) {
+        for (const marker of markers) {
+            if (this._byId.has(marker.id)) this._removed = true;
+            this._byId.set(marker.id, marker);
+        }
+        const list = this._list;
+        if (!list.length || !markers.length || time(markers[0]) >= time(list[list.length - 1])) {
+            for (const marker of markers) list.push(marker);
+        } else {
+            this._list = merge(list, markers);
+        }
+        this._schedule();
+    }
+
+    // `columns` holds a list for each field, sorted by time.
+    addColumns(columns: { [key: string]: any[] }) {
+        const keys = Object.keys(columns);
+        const markers: Marker[] = new Array(columns.id.length);
+        for (let i = 0; i < markers.length; i++) {
+            const marker: any = {};
+            for (const key of keys) marker[key] = columns[key][i];
+            markers[i] = marker;
+        }
+        this.add(markers);
+    }
+
+    remove(ids: string[]) {
+        for (const id of ids) {
+            if (this._byId.delete(id)) this._removed = true;
+        }
+        this._schedule();
+    }
+
+    patch(id: string, fields: Partial<SeriesMarker<Time>>) {
+        const marker = this._byId.get(id);
+        if (!marker) return;
+        if (fields.time !== undefined && fields.time !== marker.time) {
+            this.add([{ ...marker, ...fields, id }]);
+            return;
+        }
+        Object.assign(marker, fields);
+        this._schedule();
+    }
+
+    clear() {
+        this._list = [];
+        this._byId.clear();
+        this._removed = false;
+        this._schedule();
+    }
+
+    markers() {
+        return this._plugin.markers();
+    }
+
+    private _schedule() {
+        if (this._scheduled) return;
+        this._scheduled = true;
+        queueMicrotask(() => {
+            this._scheduled = false;
+            this._apply();
+        });
+    }
+
+    private _apply() {
+        if (this._removed) {
+            // drop removed and replaced markers in one pass
+            this._list = this._list.filter(marker => this._byId.get(marker.id) === marker);
+            this._removed = false;
+        }
+        this._plugin.setMarkers(this._list);
+    }
+}
+
+// times are sent as UTC timestamps
+const time = (marker: Marker) => marker.time as number;
+
+function merge(a: Marker[], b: Marker[]) {
+    const merged: Marker[] = new Array(a.length + b.length);
+    let i = 0, j = 0, k = 0;
+    while (i < a.length && j < b.length) {
+        merged[k++] = time(b[j]) < time(a[i]) ? b[j++] : a[i++];
+    }
+    while (i < a.length) merged[k++] = a[i++];
+    while (j < b.length) merged[k++] = b[j++];
+    return merged;
+}
@@ -1,5 +1,5 @@
 import { PluginBase } from '../plugin-base';
-import { ISeriesApi, SeriesType, Time } from 'lightweight-charts';
+import { DataChangedScope, ISeriesApi, MismatchDirection, SeriesType, Time } from 'lightweight-charts';
 import { VolumeProfilePaneView } from './pane-view';
 
 export interface VolumeProfileOptions {
@@ -43,11 +43,80 @@ export interface VolumeProfileRenderMeta {
     maxPrice: number;
 }
 
+// Bars merged with their volume, as time-sorted columns.
+interface ProfileColumns {
+    time: Float64Array;
+    low: Float64Array;
+    high: Float64Array;
+    volume: Float64Array;
+    length: number;
+}
+
+// The profile of the bars in [start, end).
+interface ProfileCache {
+    start: number;
+    end: number;
+    bins: number;
+    minPrice: number;
+    maxPrice: number;
+    volumes: Float64Array;
+    counts: Int32Array;
+}
+
+// First index whose time is >= t.
+function lowerBound(time: Float64Array, length: number, t: number) {
+    let lo = 0, hi = length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (time[mid] < t) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+// First index whose time is > t.
+function upperBound(time: Float64Array, length: number, t: number) {
+    let lo = 0, hi = length;
+    while (lo < hi) {
+        const mid = (lo + hi) >> 1;
+        if (time[mid] <= t) lo = mid + 1;
+        else hi = mid;
+    }
+    return lo;
+}
+
+// The bins [first, last] overlapped by a bar, using the same edges as the rendered bins.
+function binRange(cache: ProfileCache, low: number, high: number): [number, number] {
+    const { minPrice, bins } = cache;
+    const size = (cache.maxPrice - minPrice) / bins;
+    if (!(size > 0) || !(low <= high)) return [0, -1];
+    let first = Math.max(0, Math.floor((low - minPrice) / size));
+    let last = Math.min(bins - 1, Math.ceil((high - minPrice) / size) - 1);
+    while (first > 0 && minPrice + (first - 1) * size + size > low) first--;
+    while (first <= last && !(minPrice + first * size + size > low)) first++;
+    while (last < bins - 1 && minPrice + (last + 1) * size < high) last++;
+    while (last >= first && !(minPrice + last * size < high)) last--;
+    return [first, last];
+}
+
 export class VolumeProfile extends PluginBase {
     private _options: VolumeProfileOptions;
     private _paneViews: VolumeProfilePaneView[];
     private _bars: VolumeProfileBar[] = [];
     private _renderMeta: VolumeProfileRenderMeta = { minPrice: 0, maxPrice: 1 };
+    private _columns: ProfileColumns = {
+        time: new Float64Array(0),
+        low: new Float64Array(0),
+        high: new Float64Array(0),
+        volume: new Float64Array(0),
+        length: 0,
+    };
+    private _cache: ProfileCache | null = null;
+    // 'full' when the columns must be rebuilt, 'update' when only the last bars changed
+    private _pending: DataChangedScope | null = 'full';
+    private _updates = 0;
+    private _scheduled = false;
+
     constructor(options: Partial<VolumeProfileOptions> = {}) {
         super();
         this._options = { ...defaultVolumeProfileOptions, ...options };
@@ -97,101 +166,260 @@ export class VolumeProfile extends PluginBase {
         );
     }
 
+    private _volumeSeries(): ISeriesApi<SeriesType> | undefined {
+        const handler = (window as any).mainHandler;
+        return handler && handler.volumeSeries ? handler.volumeSeries : undefined;
+    }
+
+    // Подписка на обновление данных свечей и объёма (однократно)
+    private _subscribe() {
+        for (const series of [this.series, this._volumeSeries()] as any[]) {
+            if (series && series.subscribeDataChanged && !series._vp_subscribed) {
+                series.subscribeDataChanged((scope: DataChangedScope) => this._dataChanged(scope));
+                series._vp_subscribed = true;
+            }
+        }
+    }
+
+    private _dataChanged(scope: DataChangedScope) {
+        if (scope === 'update' && this._pending !== 'full') {
+            this._pending = 'update';
+            this._updates++;
+        } else {
+            this._pending = 'full';
+        }
+        this._schedule();
+    }
+
+    // Changes arriving together (candles and volume, or a range change) are handled once.
+    private _schedule() {
+        if (this._scheduled) return;
+        this._scheduled = true;
+        Promise.resolve().then(() => {
+            this._scheduled = false;
+            this.updateProfile();
+        });
+    }
+
+    private _reserve(length: number) {
+        const c = this._columns;
+        if (c.time.length >= length) return;
+        const capacity = Math.max(length, c.time.length * 2, 64);
+        for (const key of ['time', 'low', 'high', 'volume'] as const) {
+            const array = new Float64Array(capacity);
+            array.set(c[key].subarray(0, c.length));
+            c[key] = array;
+        }
+    }
+
+    private _rebuild() {
+        const priceData = (this.series as ISeriesApi<SeriesType>).data ? (this.series as ISeriesApi<SeriesType>).data() : [];
+        const volumeSeries = this._volumeSeries();
+        const volumeData = volumeSeries && volumeSeries.data ? volumeSeries.data() : [];
+        const c = this._columns;
+        c.length = 0;
+        this._reserve(priceData.length);
+        // both series are sorted by time, so volumes are matched in one pass
+        let j = 0;
+        for (const bar of priceData) {
+            if (!this.isCandlestickBar(bar)) continue;
+            const t = Number(bar.time);
+            while (j < volumeData.length && Number(volumeData[j].time) < t) j++;
+            const v = volumeData[j];
+            c.time[c.length] = t;
+            c.low[c.length] = bar.low;
+            c.high[c.length] = bar.high;
+            c.volume[c.length] = v && Number(v.time) === t && this.isHistogramBar(v) ? v.value || 0 : 0;
+            c.length++;
+        }
+        this._cache = null;
+    }
+
+    // Applies an update() of the last bar, or a new bar after it. Returns false if a rebuild is needed.
+    private _patchLast(): boolean {
+        const series = this.series as ISeriesApi<SeriesType>;
+        if (!series.dataByIndex) return false;
+        const bar = series.dataByIndex(Number.MAX_SAFE_INTEGER, MismatchDirection.NearestLeft);
+        if (!this.isCandlestickBar(bar)) return false;
+        const c = this._columns;
+        const t = Number(bar.time);
+        let i = c.length - 1;
+        if (c.length === 0 || c.time[i] < t) {
+            this._reserve(c.length + 1);
+            i = c.length++;
+            c.time[i] = t;
+            c.low[i] = NaN;
+            c.high[i] = NaN;
+            c.volume[i] = 0;
+        } else if (c.time[i] !== t) {
+            return false;
+        }
+        const volumeSeries = this._volumeSeries();
+        const v = volumeSeries && volumeSeries.dataByIndex
+            ? volumeSeries.dataByIndex(Number.MAX_SAFE_INTEGER, MismatchDirection.NearestLeft)
+            : null;
+        const volume = v && Number(v.time) === t && this.isHistogramBar(v) ? v.value || 0 : 0;
+
+        const cache = this._cache;
+        if (cache && i >= cache.start && i < cache.end) {
+            const inside = bar.low >= cache.minPrice && bar.high <= cache.maxPrice;
+            // the old bar may have set the bounds, in which case they could shrink
+            const bounds = (c.low[i] > cache.minPrice || c.low[i] === bar.low) &&
+                (c.high[i] < cache.maxPrice || c.high[i] === bar.high);
+            if (inside && bounds) {
+                this._accumulateBar(cache, i, -1);
+            } else {
+                this._cache = null;
+            }
+        }
+        c.low[i] = bar.low;
+        c.high[i] = bar.high;
+        c.volume[i] = volume;
+        if (this._cache && i >= this._cache.start && i < this._cache.end) {
+            this._accumulateBar(this._cache, i, 1);
+        }
+        return true;
+    }
+
+    // Adds (sign 1) or removes (sign -1) the volume of bar i to every bin it overlaps.
+    private _accumulateBar(cache: ProfileCache, i: number, sign: number) {
+        const c = this._columns;
+        const [first, last] = binRange(cache, c.low[i], c.high[i]);
+        for (let b = first; b <= last; b++) {
+            cache.counts[b] += sign;
+            // empty bins are reset, so additions and removals don't leave residue
+            cache.volumes[b] = cache.counts[b] ? cache.volumes[b] + sign * c.volume[i] : 0;
+        }
+    }
+
+    // The bars [start, end) the profile is built from, depending on the range mode.
+    private _window(): [number, number] | null {
+        const visibleRange = this.chart.timeScale().getVisibleRange();
+        if (!visibleRange) return null;
+        const { time, length } = this._columns;
+        const mode = this._options.rangeMode || 'visible';
+        const lastN = Math.abs(this._options.lastN || 100);
+        if (mode === 'last_n_total') {
+            return [Math.max(0, length - lastN), length];
+        }
+        if (mode !== 'visible' && mode !== 'last_n_visible') {
+            return [0, length];
+        }
+        const start = lowerBound(time, length, Number(visibleRange.from));
+        const end = upperBound(time, length, Number(visibleRange.to));
+        return mode === 'last_n_visible' ? [Math.max(start, end - lastN), end] : [start, end];
+    }
+
+    private _build(start: number, end: number, bins: number): ProfileCache {
+        const { low, high, volume } = this._columns;
+        let minPrice = Infinity;
+        let maxPrice = -Infinity;
+        for (let i = start; i < end; i++) {
+            if (low[i] < minPrice) minPrice = low[i];
+            if (high[i] > maxPrice) maxPrice = high[i];
+        }
+        const cache: ProfileCache = {
+            start, end, bins, minPrice, maxPrice,
+            volumes: new Float64Array(bins),
+            counts: new Int32Array(bins),
+        };
+        // a difference array: each bar marks where its bins start and end
+        const volumeDiff = new Float64Array(bins + 1);
+        const countDiff = new Int32Array(bins + 1);
+        for (let i = start; i < end; i++) {
+            const [first, last] = binRange(cache, low[i], high[i]);
+            if (last < first) continue;
+            volumeDiff[first] += volume[i];
+            volumeDiff[last + 1] -= volume[i];
+            countDiff[first]++;
+            countDiff[last + 1]--;
+        }
+        let runningVolume = 0;
+        let runningCount = 0;
+        for (let b = 0; b < bins; b++) {
+            runningVolume += volumeDiff[b];
+            runningCount += countDiff[b];
+            cache.counts[b] = runningCount;
+            cache.volumes[b] = runningCount ? runningVolume : 0;
+        }
+        return cache;
+    }
+
+    // Moves the cached profile to a nearby range, if the bars entering and leaving it keep its bounds.
+    private _shift(cache: ProfileCache, start: number, end: number): boolean {
+        const { low, high } = this._columns;
+        const moved = Math.abs(start - cache.start) + Math.abs(end - cache.end);
+        if (moved > (cache.end - cache.start) / 4) return false;
+        const leaving: number[] = [];
+        const entering: number[] = [];
+        for (let i = cache.start; i < Math.min(start, cache.end); i++) leaving.push(i);
+        for (let i = Math.max(end, cache.start); i < cache.end; i++) leaving.push(i);
+        for (let i = start; i < Math.min(cache.start, end); i++) entering.push(i);
+        for (let i = Math.max(cache.end, start); i < end; i++) entering.push(i);
+        for (const i of entering) {
+            if (!(low[i] >= cache.minPrice && high[i] <= cache.maxPrice)) return false;
+        }
+        // a leaving bar on a bound may take it with it, unless another bar shares it
+        if (leaving.some(i => low[i] <= cache.minPrice || high[i] >= cache.maxPrice)) {
+            let minPrice = Infinity;
+            let maxPrice = -Infinity;
+            for (let i = start; i < end; i++) {
+                if (low[i] < minPrice) minPrice = low[i];
+                if (high[i] > maxPrice) maxPrice = high[i];
+            }
+            if (minPrice !== cache.minPrice || maxPrice !== cache.maxPrice) return false;
+        }
+        for (const i of leaving) this._accumulateBar(cache, i, -1);
+        for (const i of entering) this._accumulateBar(cache, i, 1);
+        cache.start = start;
+        cache.end = end;
+        return true;
+    }
+
+    private _clear() {
+        this._cache = null;
+        this._bars = [];
+        this._renderMeta = { minPrice: 0, maxPrice: 1 };
+        this.requestUpdate();
+    }
+
     public updateProfile() {
         if (!this._options.enabled) {
-            this._bars = [];
-            this._renderMeta = { minPrice: 0, maxPrice: 1 };
-            this.requestUpdate();
+            this._clear();
             return;
         }
-        const priceDataRaw = (this.series as ISeriesApi<SeriesType>).data ? (this.series as ISeriesApi<SeriesType>).data() : [];
-        const priceData = priceDataRaw.filter(this.isCandlestickBar);
-        // Получаем volumeSeries напрямую из window.mainHandler
-        let volumeSeries: ISeriesApi<SeriesType> | undefined = undefined;
-        const handler = (window as any).mainHandler;
-        if (handler && handler.volumeSeries) {
-            volumeSeries = handler.volumeSeries;
-        }
-        const volumeDataRaw = volumeSeries && volumeSeries.data ? volumeSeries.data() : [];
-        const volumeData = volumeDataRaw.filter(this.isHistogramBar);
-        // Подписка на обновление данных объёма (однократно)
-        if (volumeSeries && (volumeSeries as any).subscribeDataChanged && !(volumeSeries as any)._vp_subscribed) {
-            (volumeSeries as any).subscribeDataChanged(() => this.updateProfile());
-            (volumeSeries as any)._vp_subscribed = true;
-        }
-        const volumeByTime = new Map<number, number>();
-        for (const v of volumeData) {
-            // @ts-ignore
-            volumeByTime.set(Number(v.time), v.value);
-        }
-        // Объединяем OHLC и volume по времени
-        const mergedBars = priceData.map(bar => ({
-            ...bar,
-            // @ts-ignore
-            volume: volumeByTime.get(Number(bar.time)) ?? 0
-        }));
-        // Получаем видимый диапазон
-        const timeScale = this.chart.timeScale();
-        const visibleRange = timeScale.getVisibleRange();
-        if (!visibleRange) {
-            this._bars = [];
-            this._renderMeta = { minPrice: 0, maxPrice: 1 };
-            this.requestUpdate();
-            return;
+        this._subscribe();
+        if (this._pending === 'update' && (this._updates > 2 || !this._patchLast())) {
+            this._pending = 'full';
+        }
+        if (this._pending === 'full') {
+            this._rebuild();
         }
-        // Фильтруем бары по режиму
-        let filteredBars = mergedBars;
-        if (this._options.rangeMode === 'visible' || !this._options.rangeMode) {
-            // По видимому диапазону
-            filteredBars = mergedBars.filter(bar => {
-                // @ts-ignore
-                const t = Number(bar.time);
-                return (
-                    typeof t === 'number' &&
-                    t >= Number(visibleRange.from) &&
-                    t <= Number(visibleRange.to)
-                );
-            });
-        } else if (this._options.rangeMode === 'last_n_visible') {
-            // Последние N видимых баров (от правого края видимого диапазона)
-            const visibleBars = mergedBars.filter(bar => {
-                // @ts-ignore
-                const t = Number(bar.time);
-                return (
-                    typeof t === 'number' &&
-                    t >= Number(visibleRange.from) &&
-                    t <= Number(visibleRange.to)
-                );
-            });
-            filteredBars = visibleBars.slice(-Math.abs(this._options.lastN || 100));
-        } else if (this._options.rangeMode === 'last_n_total') {
-            // Последние N баров всего датасета
-            filteredBars = mergedBars.slice(-Math.abs(this._options.lastN || 100));
-        }
-        if (filteredBars.length === 0) {
-            this._bars = [];
-            this._renderMeta = { minPrice: 0, maxPrice: 1 };
-            this.requestUpdate();
+        const changed = this._pending !== null;
+        this._pending = null;
+        this._updates = 0;
+
+        const range = this._window();
+        if (!range || range[1] <= range[0]) {
+            this._clear();
             return;
         }
-        // Расчёт бинов по ценам
-        let minPrice = Math.min(...filteredBars.map(b => b.low));
-        let maxPrice = Math.max(...filteredBars.map(b => b.high));
-        if (!this._options.adaptiveVerticalBounds) {
-            // Если не адаптивно, используем границы окна (pane)
-            // (оставляем как есть, min/max по видимым свечам)
+        const [start, end] = range;
+        const bins = this._options.bins || 40;
+        let cache = this._cache;
+        if (cache && cache.bins === bins && cache.start === start && cache.end === end) {
+            if (!changed) return;
+        } else if (!cache || cache.bins !== bins || !this._shift(cache, start, end)) {
+            cache = this._cache = this._build(start, end, bins);
         }
+
+        const { minPrice, maxPrice, volumes } = cache;
         this._renderMeta = { minPrice, maxPrice };
-        const bins = this._options.bins || 40;
         const binSize = (maxPrice - minPrice) / bins;
-        const bars: VolumeProfileBar[] = [];
+        const bars: VolumeProfileBar[] = new Array(bins);
         for (let i = 0; i < bins; ++i) {
             const priceLow = minPrice + i * binSize;
-            const priceHigh = priceLow + binSize;
-            const volume = filteredBars
-                .filter(b => b.low < priceHigh && b.high > priceLow)
-                .reduce((sum, b) => sum + (b.volume || 0), 0);
-            bars.push({ priceLow, priceHigh, volume });
+            bars[i] = { priceLow, priceHigh: priceLow + binSize, volume: volumes[i] };
         }
         this._bars = bars;
         this.requestUpdate();
@@ -199,7 +427,7 @@ export class VolumeProfile extends PluginBase {
 
     // Для совместимости с pane-view
     public dataUpdated() {
-        this.updateProfile();
+        this._schedule();
     }
 
     public visible() {
@@ -209,8 +437,8 @@ export class VolumeProfile extends PluginBase {
     public attached({ chart }: { chart: any }) {
         super.attached.apply(this, arguments as any);
         if (chart && chart.timeScale && chart.timeScale().subscribeVisibleLogicalRangeChange) {
-            chart.timeScale().subscribeVisibleLogicalRangeChange(() => this.updateProfile());
+            chart.timeScale().subscribeVisibleLogicalRangeChange(() => this._schedule());
         }
         this.updateProfile();
     }
-} 
\ No newline at end of file
+}
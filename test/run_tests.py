@@ -7,7 +7,15 @@ from test_returns import TestReturns
 from test_table import TestTable
 from test_toolbox import TestToolBox
 from test_topbar import TestTopBar
-from test_chart import TestChart
+from test_chart import TestChart, TestWebviewHandler
+from test_util import TestUtil
+from test_bars import TestBarStore, TestChartBars
+from test_lod import TestLODPyramid, TestChartLOD
+from test_history import TestHistory
+from test_resampler import TestResampler
+from test_indicators import TestIndicators
+from test_polygon import TestPolygonCache, TestPolygonStream
+from test_ring import TestRing
 
 
 TEST_CASES = [
@@ -16,6 +24,18 @@ TEST_CASES = [
     TestToolBox,
     TestTopBar,
     TestChart,
+    TestWebviewHandler,
+    TestUtil,
+    TestBarStore,
+    TestChartBars,
+    TestLODPyramid,
+    TestChartLOD,
+    TestHistory,
+    TestResampler,
+    TestIndicators,
+    TestPolygonCache,
+    TestPolygonStream,
+    TestRing,
 ]
 
 if __name__ == "__main__":
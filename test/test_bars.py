@@ -0,0 +1,83 @@
+import unittest
+import numpy as np
+import pandas as pd
+
+from lightweight_charts.bars import BarStore
+from util import BARS, Tester
+
+
+class TestBarStore(unittest.TestCase):
+    def test_append_and_update_last(self):
+        store = BarStore()
+        store.set(pd.DataFrame({'time': [1, 2], 'close': [1.0, 2.0]}))
+        store.append({'time': 3, 'close': 3.0})
+        store.update_last({'time': 3, 'close': 3.5})
+        for i in range(100):
+            store.append({'time': 4 + i, 'close': float(i)})
+        self.assertEqual(len(store), 103)
+        self.assertEqual(store.frame()['close'].iloc[2], 3.5)
+        self.assertEqual(store.frame()['time'].iloc[-1], 103)
+
+    def test_max_length_keeps_recent_bars(self):
+        store = BarStore(max_length=10)
+        for i in range(35):
+            store.append({'time': i, 'close': float(i)})
+        self.assertEqual(store.frame()['time'].tolist(), list(range(25, 35)))
+
+    def test_new_columns_are_backfilled(self):
+        store = BarStore()
+        store.append({'time': 1, 'close': 1.0})
+        store.append({'time': 2, 'close': 2.0, 'volume': 5.0})
+        self.assertTrue(np.isnan(store.frame()['volume'].iloc[0]))
+        self.assertEqual(store.last(), {'time': 2, 'close': 2.0, 'volume': 5.0})
+
+    def test_set_without_copy_references_until_written(self):
+        df = pd.DataFrame({'time': [1, 2], 'close': [1.0, 2.0]})
+        store = BarStore()
+        store.set(df, copy=False)
+        self.assertTrue(np.shares_memory(store.column('close'), df['close'].to_numpy()))
+        store.update_last({'time': 2, 'close': 5.0})
+        self.assertEqual(df['close'].tolist(), [1.0, 2.0])
+        self.assertEqual(store.column('close').tolist(), [1.0, 5.0])
+
+    def test_prepend(self):
+        store = BarStore()
+        store.set(pd.DataFrame({'time': [3, 4], 'close': [3.0, 4.0]}))
+        store.prepend(pd.DataFrame({'time': [1, 2], 'close': [1, 2], 'volume': [5.0, 6.0]}))
+        self.assertEqual(store.column('time').tolist(), [1, 2, 3, 4])
+        self.assertEqual(store.column('close').tolist(), [1.0, 2.0, 3.0, 4.0])
+        self.assertTrue(np.isnan(store.column('volume')[3]))
+
+    def test_extend(self):
+        store = BarStore(max_length=5)
+        store.set(pd.DataFrame({'time': [1, 2, 3], 'close': [1, 2, 3]}))
+        store.extend(pd.DataFrame({'time': [4, 5, 6], 'close': [4.5, 5, 6], 'volume': [1.0, 2.0, 3.0]}))
+        self.assertEqual(store.column('time').tolist(), [2, 3, 4, 5, 6])
+        self.assertEqual(store.column('close').tolist(), [2.0, 3.0, 4.5, 5.0, 6.0])
+        self.assertTrue(np.isnan(store.column('volume')[:2]).all())
+        store.append({'time': 7, 'close': 7.0, 'volume': 4.0})
+        self.assertEqual(store.column('time').tolist(), [3, 4, 5, 6, 7])
+
+
+class TestChartBars(Tester):
+    def test_update_appends_to_candle_data(self):
+        self.chart.set(BARS)
+        last = self.chart.candle_data.iloc[-1]
+        bar = pd.Series({
+            'time': pd.to_datetime(last['time'], unit='s') + pd.Timedelta(days=1),
+            'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0,
+        })
+        self.chart.update(bar)
+        self.chart.update(bar.replace(1.5, 1.75))
+        self.assertEqual(len(self.chart.candle_data), len(BARS) + 1)
+        self.assertEqual(self.chart.candle_data['close'].iloc[-1], 1.75)
+
+    def test_set_leaves_frame_untouched(self):
+        df = BARS.copy()
+        self.chart.set(df, copy=False)
+        self.assertTrue(df.equals(BARS))
+        self.assertTrue(np.shares_memory(self.chart.candle_data['close'].to_numpy(), df['close'].to_numpy()))
+
+
+if __name__ == '__main__':
+    unittest.main()
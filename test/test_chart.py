@@ -1,5 +1,14 @@
+import asyncio
+import multiprocessing as mp
+import queue
+import threading
 import unittest
+from collections import deque
+import numpy as np
 import pandas as pd
+from lightweight_charts.abstract import Window
+from lightweight_charts.chart import EmitBridge, PyWV, ReturnRouter, WebviewHandler
+from lightweight_charts.indicators import SMA
 from util import BARS, Tester
 
 
@@ -20,16 +29,280 @@ class TestChart(Tester):
             list(result.columns), list(BARS.rename(columns={"date": "time"}).columns)
         )
 
+    def test_time_is_in_seconds(self):
+        self.chart.set(BARS)
+        self.assertEqual(self.chart.data['time'].iloc[0], pd.Timestamp(BARS['date'].iloc[0]).timestamp())
+        self.assertEqual(self.chart._interval, 86400)
+
+    def test_interval_override(self):
+        self.chart.set(BARS, interval='1h', offset=60)
+        self.assertEqual((self.chart._interval, self.chart.offset), (3600, 60))
+
     def test_line_in_list(self):
         result0 = self.chart.create_line()
         result1 = self.chart.create_line()
         self.assertEqual(result0, self.chart.lines()[0])
         self.assertEqual(result1, self.chart.lines()[1])
 
+    def test_set_many_sends_time_once(self):
+        df = pd.DataFrame(BARS.copy())
+        df['fast'], df['slow'] = df['close'] + 1, df['close'] - 1
+        fast, slow = self.chart.create_line('fast'), self.chart.create_line('slow')
+        self.chart.win.scripts.clear()
+        self.chart.set_many(df)
+        script = self.chart.win.scripts[0]
+        self.assertTrue(script.startswith('Lib.Handler.setMany('))
+        self.assertEqual(script.count('"time"'), 1)
+        for line in (self.chart, fast, slow):
+            self.assertIn(f'[{line.id}.series,{{', script)
+        self.assertFalse(any('setData' in s for s in self.chart.win.scripts))
+        self.assertEqual(list(fast.data['value']), list(df['fast']))
+        self.assertEqual(list(slow.data['time']), list(self.chart.data['time']))
+
+    def test_set_many_with_lod_sends_lines_once(self):
+        df = pd.DataFrame(BARS.copy())
+        df['fast'] = df['close'] + 1
+        fast = self.chart.create_line('fast')
+        self.chart.lod(max_points=100)
+        self.chart.win.scripts.clear()
+        self.chart.set_many(df)
+        self.assertEqual(sum(f'{fast.id}.series.setData(' in s for s in self.chart.win.scripts), 1)
+        self.assertEqual(list(fast.data['value']), list(df['fast']))
+
+    def test_volume_is_derived_from_candles(self):
+        self.chart.set(BARS)
+        self.assertTrue(any('volumeSeries.setData' in s for s in self.chart.win.scripts))
+        self.chart.volume_config(derive=True)
+        self.chart.win.scripts.clear()
+        self.chart.set(BARS)
+        self.assertEqual(sum('volumeSeries' in s for s in self.chart.win.scripts), 0)
+        script = next(s for s in self.chart.win.scripts if '.setCandles(' in s)
+        self.assertIn('"volume":', script)
+        self.assertNotIn('rgba', script)
+        # changing only the colors keeps the volume derived
+        self.chart.volume_config(up_color='green')
+        self.chart.win.scripts.clear()
+        self.chart.set(BARS)
+        self.assertTrue(any('.setCandles(' in s for s in self.chart.win.scripts))
+
+    def test_markers_are_sent_as_deltas(self):
+        self.chart.set(BARS)
+        self.chart.win.scripts.clear()
+        first = self.chart.marker(text='first')
+        ids = self.chart.marker_list([
+            {'time': BARS['date'].iloc[5], 'position': 'above', 'shape': 'circle', 'color': 'red', 'text': str(i)}
+            for i in range(3)
+        ])
+        self.chart.update_marker(ids[0], text='patched')
+        self.chart.remove_marker(first)
+        self.assertEqual(len(self.chart.win.scripts), 4)
+        self.assertIn(f'.addColumns({{"id": ["{ids[0]}", "{ids[1]}", "{ids[2]}"]', self.chart.win.scripts[1])
+        self.assertIn(f'.patch("{ids[0]}", {{"text": "patched"}})', self.chart.win.scripts[2])
+        self.assertIn(f'.remove(["{first}"])', self.chart.win.scripts[3])
+        self.assertEqual(list(self.chart.markers), ids)
+        self.assertEqual(self.chart.markers[ids[0]]['text'], 'patched')
+
+    def test_markers_from_frame(self):
+        self.chart.set(BARS)
+        self.chart.win.scripts.clear()
+        dates = pd.to_datetime(BARS['date'].iloc[[7, 2, 4]]) + pd.Timedelta(hours=5)
+        ids = self.chart.markers_from_frame(pd.DataFrame({
+            'date': dates.to_numpy(),
+            'shape': ['arrow_down', 'circle', 'arrow_down'],
+            'text': ['a', 'b', 'c'],
+        }))
+        self.assertEqual(len(self.chart.win.scripts), 1)
+        self.assertEqual([self.chart.markers[i]['text'] for i in ids], ['a', 'b', 'c'])
+        self.assertEqual(
+            [self.chart.markers[i]['time'] for i in ids],
+            [self.chart._single_datetime_format(d) for d in dates],
+        )
+        self.assertEqual([m['text'] for m in self.chart.markers.values()], ['b', 'c', 'a'])
+        self.assertEqual(self.chart.markers[ids[0]]['shape'], 'arrowDown')
+        self.assertEqual(self.chart.markers[ids[0]]['position'], 'belowBar')
+
+    def test_marker_list_fills_missing_fields(self):
+        self.chart.set(BARS)
+        ids = self.chart.marker_list([
+            {'time': BARS['date'].iloc[5], 'color': 'red'},
+            {'time': BARS['date'].iloc[6], 'shape': 'circle', 'text': 'b'},
+        ])
+        first, second = (self.chart.markers[i] for i in ids)
+        self.assertEqual(first['shape'], 'arrowUp')
+        self.assertEqual(first['position'], 'belowBar')
+        self.assertEqual(first['text'], '')
+        self.assertEqual(second['color'], '#2196F3')
+        self.assertEqual(second['shape'], 'circle')
+        self.assertNotIn('NaN', self.chart.win.scripts[-1])
+
+    def test_tick_matches_update_from_tick(self):
+        start = pd.Timestamp(BARS['date'].iloc[-1])
+        ticks = [
+            (start + pd.Timedelta(hours=h), price, volume)
+            for h, price, volume in [(1, 10.0, 5.0), (2, 12.5, 1.0), (30, 9.0, 2.0), (31, 8.0, 4.0), (50, 11.0, 3.0)]
+        ]
+        results = []
+        for use_tick in (False, True):
+            self.chart.set(BARS)
+            self.chart.win.scripts.clear()
+            for time, price, volume in ticks:
+                if use_tick:
+                    self.chart.tick(time.value, price, volume, cumulative_volume=True)
+                else:
+                    self.chart.update_from_tick(
+                        pd.Series({'time': time, 'price': price, 'volume': volume}), cumulative_volume=True
+                    )
+            last = self.chart._last_bar
+            results.append((self.chart.data.copy(), last[['time', 'open', 'high', 'low', 'close', 'volume']].to_dict(), len(self.chart.win.scripts)))
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        self.assertEqual(results[0][1:], results[1][1:])
+        with self.assertRaises(ValueError):
+            self.chart.tick(start.value, 1.0)
+
+    def test_update_from_ticks_matches_update_from_tick(self):
+        start = pd.Timestamp(BARS['date'].iloc[-1])
+        rng = np.random.default_rng(0)
+        ticks = pd.DataFrame({
+            'time': start + pd.to_timedelta(np.sort(rng.integers(0, 5 * 86400, 200)), unit='s'),
+            'price': rng.normal(100, 5, 200),
+            'volume': rng.integers(1, 10, 200).astype(float),
+        })
+        results = []
+        sma = self.chart.indicator(SMA(5))
+        new_bars = []
+        self.chart.events.new_bar += lambda chart: new_bars.append(chart.data['time'].iloc[-1])
+        for batch in (False, True):
+            self.chart.set(BARS)
+            self.chart.win.scripts.clear()
+            new_bars.clear()
+            if batch:
+                self.chart.update_from_ticks(ticks.iloc[:50], cumulative_volume=True)
+                self.chart.update_from_ticks(
+                    time=ticks['time'].to_numpy()[50:], price=ticks['price'].to_numpy()[50:],
+                    volume=ticks['volume'].to_numpy()[50:], cumulative_volume=True,
+                )
+                self.assertEqual(len(self.chart.win.scripts), 2)
+            else:
+                for _, tick in ticks.iterrows():
+                    self.chart.update_from_tick(tick.copy(), cumulative_volume=True)
+            results.append((
+                self.chart.data.drop(columns='Unnamed: 0').copy(),
+                sma.lines['value']._store.frame().copy(),
+                len(new_bars),
+            ))
+        pd.testing.assert_frame_equal(results[0][0], results[1][0])
+        pd.testing.assert_frame_equal(results[0][1], results[1][1])
+        self.assertEqual(results[0][2], results[1][2])
+        self.assertGreater(results[1][2], 1)
+        self.assertIn(f"{sma.lines['value'].id}.series.update(point)", self.chart.win.scripts[-1])
+        with self.assertRaises(ValueError):
+            self.chart.update_from_ticks(ticks.iloc[::-1])
+
     def test_pane(self):
         result = self.chart.add_pane()
         self.assertIsNone(result)
 
 
+class FakeWindow:
+    def __init__(self):
+        self.scripts = []
+
+    def evaluate_js(self, script):
+        self.scripts.append(script)
+
+
+class TestWebviewHandler(unittest.TestCase):
+    def test_scripts_are_batched(self):
+        handler = WebviewHandler()
+        handler.batching(max_batch_size=3, max_latency=10)
+        for i in range(4):
+            handler.evaluate_js(0, f'script{i}')
+        self.assertEqual(handler.function_call_queue.get(timeout=1), ('batch', [(0, 'script0'), (0, 'script1'), (0, 'script2')]))
+        handler.evaluate_js(0, '_~_~RETURN~_~_1 + 1')
+        self.assertEqual(handler.function_call_queue.get(timeout=1), ('batch', [(0, 'script3')]))
+        self.assertEqual(handler.function_call_queue.get(timeout=1), (0, '_~_~RETURN~_~_1 + 1'))
+        handler.exit()
+
+    def test_batches_are_sent_after_max_latency_by_one_thread(self):
+        handler = WebviewHandler()
+        handler.batching(max_batch_size=100, max_latency=0.01)
+        threads = None
+        for i in range(3):
+            handler.evaluate_js(0, f'script{i}')
+            self.assertEqual(handler.function_call_queue.get(timeout=1), ('batch', [(0, f'script{i}')]))
+            threads = threads or threading.active_count()
+        self.assertEqual(threading.active_count(), threads)
+        flusher = handler._flusher
+        handler.exit()
+        flusher.join(timeout=1)
+        self.assertFalse(flusher.is_alive())
+
+    def test_queued_batches_run_once_per_window(self):
+        pywv = PyWV.__new__(PyWV)
+        pywv.queue = queue.SimpleQueue()
+        pywv.backlog = deque()
+        pywv.captured_scripts = None
+        pywv.windows = [FakeWindow(), FakeWindow()]
+        pywv.queue.put(('batch', [(1, 'c'), (0, 'd')]))
+        pywv.queue.put((0, 'show'))
+        pywv.evaluate_batch([(0, 'a'), (1, 'b')])
+        self.assertEqual(len(pywv.windows[0].scripts), 1)
+        self.assertIn('a', pywv.windows[0].scripts[0])
+        self.assertIn('d', pywv.windows[0].scripts[0])
+        self.assertEqual(len(pywv.windows[1].scripts), 1)
+        self.assertEqual(list(pywv.backlog), [(0, 'show')])
+
+    def test_emit_bridge_delivers_waiting_messages_together(self):
+        async def main():
+            emit_queue = mp.Queue()
+            for message in ('a', 'b', 'exit'):
+                emit_queue.put(message)
+            await asyncio.sleep(0.1)
+            bridge = EmitBridge(emit_queue, asyncio.get_running_loop())
+            return await asyncio.wait_for(bridge.get(), 1)
+
+        self.assertEqual(asyncio.run(main()), ['a', 'b', 'exit'])
+
+    def test_closed_emit_bridge_leaves_messages_for_the_next(self):
+        emit_queue = mp.Queue()
+
+        async def read():
+            bridge = EmitBridge(emit_queue, asyncio.get_running_loop())
+            return bridge, await asyncio.wait_for(bridge.get(), 1)
+
+        emit_queue.put('a')
+        old, messages = asyncio.run(read())
+        self.assertEqual(messages, ['a'])
+        old.close()
+        self.assertFalse(old.alive)
+        emit_queue.put('b')
+        new, messages = asyncio.run(read())
+        self.assertEqual(messages, ['b'])
+        new.close()
+
+    def test_returns_are_matched_by_request_id(self):
+        router = ReturnRouter()
+        return_queue = mp.Queue()
+        router.listen(return_queue)
+        sent = []
+        window = Window(script_func=sent.append)
+        window.loaded = True
+        window._returns = router
+
+        async def main():
+            requests = [asyncio.create_task(window.run_script_and_get_async(f'{i}', 1)) for i in range(3)]
+            await asyncio.sleep(0.05)
+            for script in reversed(sent):
+                request_id, value = script[14:].split('~_~_')
+                return_queue.put((int(request_id), int(value) * 10, None))
+            return await asyncio.gather(*requests)
+
+        self.assertEqual(asyncio.run(main()), [0, 10, 20])
+        with self.assertRaises(TimeoutError):
+            window.run_script_and_get('1', timeout=0.05)
+        self.assertEqual(router._pending, {})
+        router.close()
+
+
 if __name__ == "__main__":
     unittest.main()
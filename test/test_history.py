@@ -0,0 +1,89 @@
+import asyncio
+import pandas as pd
+
+from util import BARS, Tester
+
+
+class TestHistory(Tester):
+    def setUp(self):
+        super().setUp()
+        self.bars = BARS.copy()
+        self.bars['date'] = pd.to_datetime(self.bars['date'])
+        self.requests = []
+
+    async def loader(self, before, limit):
+        self.requests.append(before)
+        await asyncio.sleep(0.01)
+        bars = self.bars if before is None else self.bars[self.bars['date'] < before]
+        return bars.iloc[-limit:]
+
+    def test_pages_are_prepended_once(self):
+        async def main():
+            pager = self.chart.history(self.loader, page_size=100, threshold=20, prefetch=0)
+            await pager.start()
+            await asyncio.gather(pager.on_range(5), pager.on_range(5), pager.on_range(50))
+            return pager
+
+        pager = asyncio.run(main())
+        self.assertEqual(len(self.requests), 2)
+        self.assertEqual(len(self.chart.candle_data), 200)
+        self.assertTrue(self.chart.candle_data['time'].is_monotonic_increasing)
+        self.assertIn('concat', self.chart.win.scripts[-1])
+        self.assertFalse(pager.exhausted)
+
+    def test_pages_are_prefetched(self):
+        async def main():
+            pager = self.chart.history(self.loader, page_size=100, prefetch=2)
+            await pager.start()
+            await asyncio.sleep(0.05)
+            self.assertEqual(len(self.requests), 3)
+            await pager.prepend()
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        self.assertEqual(len(self.chart.candle_data), 200)
+        self.assertEqual(len(self.requests), 4)
+
+    def test_set_cancels_pages_loading(self):
+        async def main():
+            pager = self.chart.history(self.loader, page_size=100)
+            await pager.start()
+            self.chart.set(self.bars.iloc[-50:])
+            await asyncio.sleep(0.05)
+            return pager
+
+        pager = asyncio.run(main())
+        self.assertEqual(pager._pages, {})
+        self.assertEqual(len(self.chart.candle_data), 50)
+
+    def test_history_runs_out(self):
+        async def main():
+            pager = self.chart.history(self.loader, page_size=len(self.bars), prefetch=0)
+            await pager.start()
+            await pager.prepend()
+            return pager
+
+        self.assertTrue(asyncio.run(main()).exhausted)
+
+    def test_range_changes_load_pages_in_a_task(self):
+        async def main():
+            pager = self.chart.history(self.loader, page_size=100, threshold=20, prefetch=0)
+            await pager.start()
+            self.chart._history_range('5')
+            # the handler returns before the page has loaded
+            self.assertEqual(len(self.chart.candle_data), 100)
+            await asyncio.sleep(0.05)
+            self.assertEqual(pager._ranges, set())
+
+        asyncio.run(main())
+        self.assertEqual(len(self.chart.candle_data), 200)
+
+    def test_history_is_subscribed_once(self):
+        self.chart.history(self.loader)
+        self.chart.history(self.loader)
+        scripts = [s for s in self.chart.win.scripts if 'VisibleLogicalRangeChange' in s]
+        self.assertEqual(len(scripts), 2)
+        for script in scripts:
+            self.assertNotIn('let historyTimer', script)
+            self.assertIn(f'timeScale.unsubscribeVisibleLogicalRangeChange({self.chart.id}.historyHandler)', script)
+            self.assertEqual(script.count('timeScale.subscribeVisibleLogicalRangeChange('), 1)
@@ -0,0 +1,82 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from lightweight_charts.indicators import EMA, RSI, SMA, VWAP, BollingerBands, Indicator
+from util import BARS, Tester
+
+
+def indicators():
+    return [SMA(10), EMA(10), RSI(14), BollingerBands(20), VWAP(anchor=5 * 86400)]
+
+
+class TestIndicators(Tester):
+    def expected(self, df):
+        # values computed from the whole frame at once
+        self.chart.set(df)
+        return {
+            line.name: line.data.set_index('time')['value']
+            for indicator in self.chart._indicators
+            for line in indicator.lines.values()
+        }
+
+    def test_updates_match_full_computation(self):
+        for indicator in indicators():
+            self.chart.indicator(indicator)
+        bars = BARS.iloc[:300]
+        expected = self.expected(bars)
+
+        self.chart.set(bars.iloc[:240])
+        for _, bar in bars.iloc[240:].iterrows():
+            # a partial bar first, then its final state
+            partial = bar.copy()
+            partial['close'] = partial['open']
+            self.chart.update(partial)
+            self.chart.update(bar.copy())
+
+        for indicator in self.chart._indicators:
+            for line in indicator.lines.values():
+                actual = line.data.set_index('time')['value']
+                pd.testing.assert_series_equal(actual, expected[line.name], rtol=1e-9, obj=line.name)
+
+    def test_incomplete_indicator_cannot_be_created(self):
+        class Incomplete(Indicator):
+            def compute(self, columns):
+                return {}
+
+        with self.assertRaises(TypeError):
+            Incomplete('incomplete')
+
+    def test_warm_up(self):
+        sma = self.chart.indicator(SMA(10))
+        self.chart.set(BARS.iloc[:5])
+        self.assertEqual(len(sma.lines['value'].data), 0)
+        for _, bar in BARS.iloc[5:12].iterrows():
+            self.chart.update(bar.copy())
+        values = sma.lines['value'].data['value'].to_numpy()
+        np.testing.assert_allclose(values, BARS['close'].iloc[:12].rolling(10).mean().dropna())
+
+    def test_ticks_advance_indicators(self):
+        ema = self.chart.indicator(EMA(5))
+        self.chart.set(BARS.iloc[:20])
+        self.chart.win.scripts.clear()
+        start = pd.Timestamp(BARS['date'].iloc[19]) + pd.Timedelta(days=1)
+        self.chart.tick(start.value, 10.0)
+        self.chart.tick(start.value + 1, 12.0)
+        closes = np.append(BARS['close'].iloc[:20].to_numpy(), 12.0)
+        line = ema.lines['value']
+        self.assertEqual(len(line.data), 17)
+        self.assertAlmostEqual(line.data['value'].iloc[-1], _seeded_ema(closes, 5))
+        self.assertEqual(sum(line.id in script for script in self.chart.win.scripts), 2)
+
+
+def _seeded_ema(x, period):
+    ema = x[:period].mean()
+    for value in x[period:]:
+        ema += 2 / (period + 1) * (value - ema)
+    return ema
+
+
+if __name__ == '__main__':
+    unittest.main()
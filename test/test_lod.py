@@ -0,0 +1,161 @@
+import json
+import unittest
+import numpy as np
+import pandas as pd
+
+from lightweight_charts.bars import BarStore
+from lightweight_charts.lod import LODPyramid
+from util import Tester
+
+
+def candles(n):
+    close = 100 + np.sin(np.arange(n) / 50)
+    return pd.DataFrame({
+        'time': np.arange(n) * 60,
+        'open': close - 0.5,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.ones(n),
+    })
+
+
+class TestLODPyramid(unittest.TestCase):
+    def test_levels_merge_ohlc(self):
+        store = BarStore()
+        store.set(candles(1000))
+        lod = LODPyramid(store, 'ohlc', max_points=100, factor=4)
+        lod.refresh()
+        self.assertEqual(len(lod), 3)
+        level = lod.levels[0]
+        self.assertEqual(level['time'][1], 4 * 60)
+        self.assertEqual(level['open'][1], store.column('open')[4])
+        self.assertEqual(level['close'][1], store.column('close')[7])
+        self.assertEqual(level['high'][1], store.column('high')[4:8].max())
+        self.assertEqual(level['volume'][1], 4)
+        self.assertLessEqual(len(lod.times(2)), 100)
+
+    def test_refresh_only_redoes_changed_buckets(self):
+        store = BarStore()
+        store.set(candles(1000))
+        lod = LODPyramid(store, 'ohlc', max_points=100, factor=4)
+        lod.refresh()
+        for i in range(1000, 1010):
+            store.append({'time': i * 60, 'open': 1.0, 'high': 500.0, 'low': 0.5, 'close': 2.0, 'volume': 1.0})
+            lod.refresh()
+        expected = LODPyramid(store, 'ohlc', max_points=100, factor=4)
+        expected.refresh()
+        for level, other in zip(lod.levels, expected.levels):
+            for key in level:
+                np.testing.assert_array_equal(level[key], other[key])
+
+    def test_setting_new_data_rebuilds_levels(self):
+        store = BarStore()
+        store.set(candles(1000))
+        lod = LODPyramid(store, 'ohlc', max_points=100, factor=4)
+        lod.refresh()
+        df = candles(1000)
+        df['high'] += 10
+        store.set(df)
+        lod.refresh()
+        self.assertEqual(lod.levels[0]['high'][0], df['high'][:4].max())
+
+    def test_dropped_bars_only_redo_the_oldest_buckets(self):
+        for kind in ('ohlc', 'minmax'):
+            store = BarStore(max_length=1000)
+            if kind == 'ohlc':
+                store.set(candles(1000))
+            else:
+                store.set(pd.DataFrame({'time': np.arange(1000) * 60, 'value': np.sin(np.arange(1000.0))}))
+            lod = LODPyramid(store, kind, max_points=100, factor=4)
+            lod.refresh()
+            computed = []
+            buckets = lod._buckets
+
+            def counted(*args):
+                result = buckets(*args)
+                computed.append(len(result['time']))
+                return result
+
+            lod._buckets = counted
+            rng = np.random.default_rng(0)
+            for i in range(1000, 1100):
+                x = float(rng.normal())
+                row = {'time': i * 60, 'open': x, 'high': x + 1, 'low': x - 1, 'close': x, 'volume': 1.0}
+                if kind == 'minmax':
+                    row = {'time': i * 60, 'value': x}
+                store.append(row)
+                if i % 7 == 0:
+                    store.extend(pd.DataFrame([row]).assign(time=(i + 0.5) * 60))
+                lod.refresh()
+            self.assertEqual(store.offset, 115)
+            # the newest and oldest buckets of each of the 3 levels, at most, per refresh
+            self.assertLessEqual(max(computed), 2)
+            self.assertLessEqual(sum(computed), 100 * 3 * 3)
+            expected = LODPyramid(store, kind, max_points=100, factor=4)
+            expected.refresh()
+            self.assertEqual(len(lod.levels), len(expected.levels))
+            for level, other in zip(lod.levels, expected.levels):
+                for key in level:
+                    np.testing.assert_array_equal(level[key], other[key])
+            if kind == 'minmax':
+                frame = lod.load(0, 1100 * 60)
+                self.assertEqual(frame['value'].max(), store.column('value').max())
+                self.assertEqual(frame['value'].min(), store.column('value').min())
+
+    def test_minmax_keeps_extremes(self):
+        store = BarStore()
+        values = np.random.default_rng(0).standard_normal(4000)
+        store.set(pd.DataFrame({'time': np.arange(4000), 'value': values}))
+        lod = LODPyramid(store, 'minmax', max_points=500, factor=4)
+        lod.refresh()
+        frame = lod.load(0, 4000)
+        self.assertEqual(lod.level, 2)
+        self.assertLessEqual(len(frame), 2 * 4000 // 16)
+        self.assertEqual(frame['value'].max(), values.max())
+        self.assertEqual(frame['value'].min(), values.min())
+        self.assertTrue(frame['time'].is_monotonic_increasing)
+
+    def test_needs_load(self):
+        store = BarStore()
+        store.set(candles(10_000))
+        lod = LODPyramid(store, 'ohlc', max_points=100, factor=4)
+        lod.refresh()
+        lod.tail()
+        self.assertFalse(lod.needs_load(9_950 * 60, 9_999 * 60))
+        self.assertTrue(lod.needs_load(9_850 * 60, 9_920 * 60))
+        self.assertTrue(lod.needs_load(0, 9_999 * 60))
+
+
+class TestChartLOD(Tester):
+    def test_only_visible_resolution_is_sent(self):
+        self.chart.lod(max_points=100)
+        df = candles(10_000)
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        self.chart.set(df)
+        script = next(s for s in reversed(self.chart.win.scripts) if '.series.setData(' in s)
+        sent = json.loads(script.split('setData(', 1)[1].rstrip(')'))
+        self.assertEqual(len(sent), 100)
+        self.assertEqual(sent[-1]['time'], 9_999 * 60)
+        self.chart._lod_range('0', str(9_999 * 60))
+        self.assertEqual(self.chart._lod.level, 4)
+        self.assertIn('setVisibleRange', self.chart.win.scripts[-1])
+
+    def test_range_handler_is_subscribed_once(self):
+        self.chart.lod(max_points=100)
+        self.chart.lod(max_points=200)
+        scripts = [s for s in self.chart.win.scripts if 'VisibleTimeRangeChange' in s]
+        self.assertEqual(len(scripts), 2)
+        for script in scripts:
+            self.assertNotIn('let lodTimer', script)
+            self.assertIn(f'timeScale.unsubscribeVisibleTimeRangeChange({self.chart.id}.lodHandler)', script)
+            self.assertEqual(script.count('timeScale.subscribeVisibleTimeRangeChange('), 1)
+        self.chart.lod(None)
+        script = next(s for s in reversed(self.chart.win.scripts) if 'VisibleTimeRangeChange' in s)
+        self.assertIn('unsubscribeVisibleTimeRangeChange', script)
+        self.assertNotIn('timeScale.subscribeVisibleTimeRangeChange(', script)
+        self.assertNotIn(f'lod{self.chart.id}', self.chart.win.handlers)
+
+
+if __name__ == '__main__':
+    unittest.main()
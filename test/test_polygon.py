@@ -0,0 +1,261 @@
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import numpy as np
+import pandas as pd
+
+from lightweight_charts import polygon
+
+HOUR_MS = 3_600_000
+
+
+def bars(ticker, span, start, end):
+    # daily bars start at midnight where the ticker trades, and hourly bars
+    # cover New York's pre-market to after-hours session (4:00 to 20:00)
+    tz = 'UTC' if ticker.startswith(('C:', 'X:')) else 'America/New_York'
+    results = []
+    if span == 'week':
+        # weekly bars start on the first day requested
+        days = pd.date_range(start, end, freq='7D')
+    else:
+        days = pd.date_range(start, end)
+    for day in days:
+        midnight = pd.Timestamp(day, tz=tz).value // 1_000_000
+        hours = range(4, 20) if span == 'hour' else [0]
+        n = (day - pd.Timestamp('1970-01-01')).days
+        results += [
+            {'t': midnight + hour * HOUR_MS, 'o': float(n), 'h': n + 1.0, 'l': n - 1.0, 'c': float(hour), 'v': 10.0}
+            for hour in hours
+        ]
+    return results
+
+
+class FakeAggs(BaseHTTPRequestHandler):
+    # at most `page_size` bars a page
+    protocol_version = 'HTTP/1.1'
+    page_size = 50_000
+    requests = []
+    connections = set()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        *_, ticker, _, _, span, start, end = url.path.split('/')
+        query = parse_qs(url.query)
+        cursor = int(query.get('cursor', [0])[0])
+        size = min(int(query['limit'][0]), self.page_size)
+        FakeAggs.requests.append((start, end))
+        FakeAggs.connections.add(self.client_address)
+        results = bars(ticker, span, start, end)
+        data = {'status': 'OK', 'results': results[cursor:cursor + size]}
+        if cursor + size < len(results):
+            host, port = self.server.server_address
+            data['next_url'] = f'http://{host}:{port}{url.path}?cursor={cursor + size}&limit={size}'
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPolygonCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAggs)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        polygon.PolygonAPI.base_url(f'http://127.0.0.1:{cls.server.server_port}')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        polygon.PolygonAPI.base_url('https://api.polygon.io')
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        polygon.PolygonAPI.cache(self.directory.name)
+        FakeAggs.requests.clear()
+        FakeAggs.connections.clear()
+        FakeAggs.page_size = 50_000
+
+    def tearDown(self):
+        polygon.PolygonAPI.cache(None)
+        self.directory.cleanup()
+
+    def get(self, start, end, ticker='AAPL', limit=5_000, timeframe='D'):
+        return polygon.get_bar_data(ticker, timeframe, start, end, limit)
+
+    def test_repeat_requests_are_served_from_disk(self):
+        first = self.get('2023-01-01', '2023-01-10')
+        second = self.get('2023-01-01', '2023-01-10')
+        self.assertEqual(FakeAggs.requests, [('2023-01-01', '2023-01-10')])
+        self.assertEqual(len(first), 10)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual(list(first.columns), ['open', 'high', 'low', 'close', 'time', 'volume'])
+
+    def test_only_missing_days_are_fetched(self):
+        self.get('2023-01-01', '2023-01-10')
+        df = self.get('2022-12-25', '2023-01-15')
+        self.assertEqual(FakeAggs.requests[1:], [('2022-12-25', '2022-12-31'), ('2023-01-11', '2023-01-15')])
+        self.assertEqual(len(df), 22)
+        self.assertTrue(df['time'].is_monotonic_increasing)
+        self.assertEqual(df['time'].iloc[0], pd.Timestamp('2022-12-25 05:00'))
+
+    def test_intraday_bars_are_kept_by_exchange_day(self):
+        df = self.get('2023-01-03', '2023-01-04', timeframe='H')
+        self.assertEqual(len(df), 32)
+        # the last after-hours bar of the 3rd starts at midnight UTC on the 4th
+        df = self.get('2023-01-03', '2023-01-03', timeframe='H')
+        self.assertEqual(len(FakeAggs.requests), 1)
+        self.assertEqual(list(df['close']), list(np.arange(4, 20.0)))
+        self.assertEqual(df['time'].iloc[-1], pd.Timestamp('2023-01-04 00:00'))
+        df = self.get('2023-07-03', '2023-07-03', timeframe='H')
+        self.assertEqual(df['time'].iloc[-1], pd.Timestamp('2023-07-03 23:00'))
+        df = self.get('2023-01-03', '2023-01-03', ticker='X:BTCUSD', timeframe='H')
+        self.assertEqual(df['time'].iloc[0], pd.Timestamp('2023-01-03 04:00'))
+
+    def test_weekly_bars_are_kept_per_request(self):
+        first = self.get('2023-01-02', '2023-03-31', timeframe='W')
+        second = self.get('2023-01-04', '2023-03-31', timeframe='W')
+        self.assertEqual(len(FakeAggs.requests), 2)
+        self.assertEqual(len(first), 13)
+        self.assertEqual(len(second), 13)
+        self.assertEqual(second['time'].iloc[0], pd.Timestamp('2023-01-04 05:00'))
+        self.assertTrue((second['time'].dt.dayofweek == 2).all())
+        pd.testing.assert_frame_equal(first, self.get('2023-01-02', '2023-03-31', timeframe='W'))
+        self.assertEqual(len(FakeAggs.requests), 2)
+
+    def test_today_is_not_covered(self):
+        today = polygon._today
+        polygon._today = lambda tz: polygon._day('2023-01-04')
+        try:
+            self.get('2023-01-03', '2023-01-04', timeframe='H')
+            self.get('2023-01-03', '2023-01-04', timeframe='H')
+        finally:
+            polygon._today = today
+        self.assertEqual(FakeAggs.requests, [('2023-01-03', '2023-01-04'), ('2023-01-04', '2023-01-04')])
+
+    def test_pages_are_followed(self):
+        FakeAggs.page_size = 4
+        df = self.get('2023-01-01', '2023-01-10')
+        self.assertEqual(len(FakeAggs.requests), 3)
+        self.assertEqual(list(df['open']), list(np.arange(19358, 19368.0)))
+
+    def test_long_ranges_are_split(self):
+        df = self.get('2023-01-01', '2023-01-10', limit=3)
+        self.assertEqual(
+            sorted(FakeAggs.requests),
+            [('2023-01-01', '2023-01-03'), ('2023-01-04', '2023-01-06'),
+             ('2023-01-07', '2023-01-09'), ('2023-01-10', '2023-01-10')],
+        )
+        self.assertEqual(len(df), 10)
+        self.assertTrue(df['time'].is_monotonic_increasing)
+
+    def test_connections_are_reused(self):
+        for ticker in ('AAPL', 'MSFT', 'TSLA'):
+            self.get('2023-01-01', '2023-01-10', ticker=ticker)
+        self.assertEqual(len(FakeAggs.requests), 3)
+        self.assertEqual(len(FakeAggs.connections), 1)
+
+    def test_offline(self):
+        self.get('2023-01-01', '2023-01-10')
+        polygon.PolygonAPI.cache(self.directory.name, offline=True)
+        df = self.get('2023-01-05', '2023-01-20')
+        self.assertEqual(len(FakeAggs.requests), 1)
+        self.assertEqual(len(df), 6)
+        self.assertIsNone(self.get('2023-01-05', '2023-01-20', ticker='MSFT'))
+
+    def test_least_recently_used_are_evicted(self):
+        self.get('2023-01-01', '2023-01-10', ticker='AAPL')
+        size = os.path.getsize(os.path.join(self.directory.name, 'AAPL_1_day.npz'))
+        polygon.PolygonAPI.cache(self.directory.name, max_size=2 * size)
+        self.get('2023-01-01', '2023-01-10', ticker='MSFT')
+        self.get('2023-01-01', '2023-01-10', ticker='AAPL')
+        self.get('2023-01-01', '2023-01-10', ticker='X:BTCUSD')
+        self.assertEqual(
+            sorted(os.listdir(self.directory.name)), ['AAPL_1_day.npz', 'X%3ABTCUSD_1_day.npz']
+        )
+
+
+def quote_frame(symbol, prices, start_ms=1_700_000_000_000, volumes=()):
+    messages = [
+        {'ev': 'Q', 'sym': symbol, 'bp': price - 0.01, 'ap': price + 0.01, 't': start_ms + i}
+        for i, price in enumerate(prices)
+    ]
+    messages += [{'ev': 'A', 'sym': symbol, 'v': volume} for volume in volumes]
+    return json.dumps(messages)
+
+
+class TestPolygonStream(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+    def tearDown(self):
+        polygon._lasts.clear()
+        polygon._pending.clear()
+
+    def subscribe(self, symbol, func):
+        polygon._lasts[symbol] = {'price': 0, 'funcs': [(func, (), True)], 'precision': 2, 'volume': 0}
+
+    def test_frames_are_delivered_once_per_symbol(self):
+        for symbol in ('AAPL', 'MSFT'):
+            self.subscribe(symbol, lambda *args, symbol=symbol: self.calls.append((symbol, *args)))
+
+        async def main():
+            frame = json.loads(quote_frame('AAPL', np.arange(100, 110.0), volumes=(5, 7)))
+            frame += json.loads(quote_frame('MSFT', [300.0, 301.0]))
+            polygon._handle_frame(json.dumps(frame), 'sym')
+            await asyncio.sleep(0)
+
+        asyncio.run(main())
+        self.assertEqual(self.calls, [
+            ('AAPL', 1_700_000_000_009_000_000, 109.0, 12),
+            ('MSFT', 1_700_000_000_001_000_000, 301.0, 0),
+        ])
+
+    def test_subscriber_errors_are_logged(self):
+        def failing(time_ns, price, volume):
+            self.calls.append(price)
+            if len(self.calls) == 1:
+                raise ValueError('failed')
+
+        self.subscribe('AAPL', failing)
+
+        async def main():
+            for price in (100.0, 101.0):
+                polygon._handle_frame(quote_frame('AAPL', [price]), 'sym')
+                await asyncio.sleep(0)
+
+        with self.assertLogs('polygon', 'ERROR') as logs:
+            asyncio.run(main())
+        self.assertIn('ValueError: failed', logs.output[0])
+        self.assertEqual(self.calls, [100.0, 101.0])
+
+    def test_frames_are_merged_while_subscribers_are_busy(self):
+        async def slow(time_ns, price, volume):
+            self.calls.append((price, volume))
+            await asyncio.sleep(0.02)
+
+        self.subscribe('AAPL', slow)
+
+        async def main():
+            for i in range(5):
+                polygon._handle_frame(quote_frame('AAPL', [100.0 + i], volumes=(1,)), 'sym')
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.05)
+
+        asyncio.run(main())
+        self.assertLess(len(self.calls), 5)
+        self.assertEqual(self.calls[-1][0], 104.0)
+        self.assertEqual(sum(volume for _, volume in self.calls), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from lightweight_charts import Resampler
+from util import Tester
+
+
+def minute_bars(count, start='2024-01-02 09:30'):
+    rng = np.random.default_rng(0)
+    close = 100 + np.cumsum(rng.normal(0, 0.1, count))
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=count, freq='1min'),
+        'open': close + rng.normal(0, 0.05, count),
+        'high': close + 0.2,
+        'low': close - 0.2,
+        'close': close,
+        'volume': rng.integers(1, 100, count).astype(float),
+    })
+
+
+def resampled(df, rule):
+    return df.resample(rule, on='time').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum'}
+    ).dropna()
+
+
+class TestResampler(Tester):
+    def setUp(self):
+        super().setUp()
+        self.resampler = Resampler()
+        self.charts = {
+            rule: self.resampler.attach(
+                self.chart if rule == '1min' else self.chart.create_subchart(), rule
+            )
+            for rule in ('1min', '5min', '1h')
+        }
+
+    def assert_matches(self, df):
+        for rule, chart in self.charts.items():
+            expected = resampled(df, rule)
+            data = chart.data
+            self.assertEqual(len(data), len(expected), rule)
+            np.testing.assert_allclose(data['time'], expected.index.as_unit('s').asi8)
+            for key in ('open', 'high', 'low', 'close', 'volume'):
+                np.testing.assert_allclose(data[key], expected[key], err_msg=f'{rule} {key}')
+
+    def test_backfill(self):
+        df = minute_bars(600)
+        self.resampler.backfill(df)
+        self.assert_matches(df)
+        self.assertEqual(self.charts['1h']._interval, 3600)
+
+    def test_updates_continue_backfill(self):
+        df = minute_bars(200)
+        self.resampler.backfill(df.iloc[:101])
+        # the last backfilled bar is updated again, then the rest arrive live
+        for row in df.iloc[100:].itertuples():
+            self.resampler.update(row.time.value, row.open, row.high, row.low, row.close, row.volume / 2)
+            self.resampler.update(row.time.value, row.open, row.high, row.low, row.close, row.volume)
+        self.assert_matches(df)
+
+    def test_ticks(self):
+        self.resampler.backfill(minute_bars(10))
+        start = minute_bars(10)['time'].iloc[-1]
+        for second in range(0, 900, 30):
+            self.resampler.tick((start + pd.Timedelta(seconds=second)).value, 100.0 + second / 100, 1.0)
+        self.assertEqual(self.charts['5min'].data['time'].iloc[-1], (start + pd.Timedelta(minutes=14)).floor('5min').timestamp())
+        self.assertEqual(self.charts['1h'].data['volume'].iloc[-1], minute_bars(10)['volume'].sum() + 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+import multiprocessing as mp
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from lightweight_charts.ring import BarRing, RingFeed
+from util import Tester
+
+T0 = 1_700_000_040 * 10**9
+MINUTE = 60 * 10**9
+
+
+def produce(name, count):
+    ring = BarRing.attach(name)
+    for i in range(count):
+        # each bar is written twice, as it would be while it is still open
+        ring.update(T0 + i * MINUTE, 1.0, 2.0, 0.0, i, 1.0)
+        ring.update(T0 + i * MINUTE, 1.0, 2.0, 0.0, i + 0.5, 2.0)
+    ring.close()
+
+
+class TestRing(Tester):
+    def setUp(self):
+        super().setUp()
+        self.ring = BarRing.create(64)
+        self.feed = RingFeed(self.chart, self.ring, interval=60)
+
+    def tearDown(self):
+        super().tearDown()
+        self.ring.close()
+        self.ring.unlink()
+
+    def test_only_new_and_changed_bars_are_pushed(self):
+        for i in range(3):
+            self.ring.update(T0 + i * MINUTE, 1.0, 2.0, 0.0, i, 1.0)
+        self.assertEqual(self.feed.poll(), 3)
+        self.assertEqual(len(self.chart.candle_data), 3)
+        self.assertEqual(self.feed.poll(), 0)
+        self.ring.update(T0 + 2 * MINUTE, 1.0, 3.0, 0.0, 5.0, 4.0)
+        self.ring.update(T0 + 3 * MINUTE, 1.0, 2.0, 0.0, 6.0)
+        self.assertEqual(self.feed.poll(), 2)
+        df = self.chart.candle_data
+        self.assertEqual(list(df['close']), [0.0, 1.0, 5.0, 6.0])
+        self.assertEqual(df['high'].iloc[2], 3.0)
+        self.assertEqual(df['time'].iloc[-1], (T0 + 3 * MINUTE) / 10**9)
+
+    def test_first_poll_sets_the_chart(self):
+        df = pd.DataFrame({
+            'time': pd.date_range(pd.Timestamp(T0), periods=100, freq='1min'),
+            'open': 1.0, 'high': 2.0, 'low': 0.0, 'close': np.arange(100.0), 'volume': 1.0,
+        })
+        self.ring.extend(df)
+        self.assertEqual(self.ring.count, 100)
+        self.assertEqual(self.feed.poll(), 64)
+        self.assertEqual(list(self.chart.candle_data['close']), list(np.arange(36.0, 100)))
+
+    def test_timezone_aware_times(self):
+        times = pd.date_range(pd.Timestamp(T0, tz='UTC'), periods=3, freq='1min')
+        df = pd.DataFrame({'time': times.tz_convert('America/New_York'), 'open': 1.0, 'high': 2.0, 'low': 0.0, 'close': 1.0})
+        self.ring.extend(df)
+        self.assertEqual(list(self.ring.frame()['time']), list(times.tz_localize(None)))
+
+    def test_lapped_bars_are_skipped(self):
+        self.ring.update(T0, 1.0, 2.0, 0.0, 0.0, 1.0)
+        self.feed.poll()
+        for i in range(1, 100):
+            self.ring.update(T0 + i * MINUTE, 1.0, 2.0, 0.0, float(i), 1.0)
+        self.assertEqual(self.feed.poll(), 64)
+        self.assertEqual(self.chart.candle_data['close'].iloc[-1], 99.0)
+
+    def test_bars_from_another_process(self):
+        self.ring.close()
+        self.ring.unlink()
+        self.ring = BarRing.create(1024)
+        self.feed = RingFeed(self.chart, self.ring, interval=60)
+        process = mp.get_context('spawn').Process(target=produce, args=(self.ring.name, 500))
+        process.start()
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            version = self.ring.wait(self.feed._version or 0, timeout=0.01)
+            self.feed.poll()
+            if not process.is_alive() and version == self.ring.version:
+                break
+        process.join()
+        self.feed.poll()
+        df = self.chart.candle_data
+        self.assertEqual(len(df), 500)
+        self.assertEqual(list(df['close']), list(np.arange(500) + 0.5))
+        self.assertEqual(list(df['volume']), [2.0] * 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
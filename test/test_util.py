@@ -0,0 +1,106 @@
+import json
+import unittest
+from base64 import b64decode
+import numpy as np
+import pandas as pd
+
+from lightweight_charts.abstract import Window
+from lightweight_charts.util import UpdateScheduler, infer_interval, js_data, js_columns, time_ns
+
+
+class TestUtil(unittest.TestCase):
+    def test_js_data_drops_nulls(self):
+        df = pd.DataFrame({
+            'time': [1, 2, 3],
+            'value': [1.5, np.nan, 3.0],
+            'color': ['red', None, 'blue'],
+        })
+        self.assertEqual(json.loads(js_data(df)), [
+            {'time': 1, 'value': 1.5, 'color': 'red'},
+            {'time': 2},
+            {'time': 3, 'value': 3.0, 'color': 'blue'},
+        ])
+
+    def test_js_data_matches_records(self):
+        df = pd.DataFrame({
+            'time': pd.date_range('2023-01-01', periods=4, freq='D'),
+            'open': [1.0, 2.25, 1e-7, 1e20],
+            'volume': np.arange(4),
+            'flag': [True, False, True, False],
+        })
+        expected = [
+            {'time': int(t.timestamp()), 'open': o, 'volume': int(v), 'flag': bool(f)}
+            for t, o, v, f in df.itertuples(index=False)
+        ]
+        self.assertEqual(json.loads(js_data(df)), expected)
+        self.assertNotIn(' ', js_data(df))
+
+    def test_js_data_empty(self):
+        self.assertEqual(js_data(pd.DataFrame()), '[]')
+
+    def test_js_columns_packs_typed_arrays(self):
+        df = pd.DataFrame({
+            'time': [1_600_000_000, 1_600_000_060],
+            'close': [1.5, np.nan],
+            'color': ['red', None],
+        })
+        script = js_columns(df)
+        self.assertTrue(script.startswith('Lib.Handler.unpackColumns('))
+        payload = json.loads(script[len('Lib.Handler.unpackColumns('):-1])
+        columns = payload['columns']
+        self.assertEqual(payload['length'], 2)
+        self.assertEqual(columns['time'][0], 'i4')
+        self.assertEqual(np.frombuffer(b64decode(columns['time'][1]), '<i4').tolist(), df['time'].tolist())
+        close = np.frombuffer(b64decode(columns['close'][1]), '<f8')
+        self.assertEqual(close[0], 1.5)
+        self.assertTrue(np.isnan(close[1]))
+        self.assertEqual(columns['color'], ['json', ['red', None]])
+
+    def test_infer_interval_and_offset(self):
+        times = pd.Series(pd.date_range('2023-01-01 09:30', periods=50, freq='h')).drop([3, 4, 20])
+        self.assertEqual(infer_interval(*time_ns(times)), (3600, 1800))
+        daily = pd.Series(pd.date_range('2023-01-01', periods=10, freq='D', tz='UTC'))
+        self.assertEqual(infer_interval(*time_ns(daily)), (86400, 0))
+        self.assertIsNone(infer_interval(*time_ns(daily[:1])))
+
+    def test_infer_interval_samples_long_frames(self):
+        times = pd.Series(pd.date_range('2023-01-01 00:00:15', periods=100_000, freq='min'))
+        self.assertEqual(infer_interval(*time_ns(times), sample_size=100), (60, 15))
+
+    def test_scheduler_keeps_latest_update_per_key(self):
+        scripts = []
+        scheduler = UpdateScheduler(scripts.append)
+        scheduler.rate = 1
+        scheduler.add(('a', 1), 'a1')
+        scheduler.add(('b', 1), 'b1')
+        scheduler.add(('a', 1), 'a1 again')
+        scheduler.add(('a', 2), 'a2')
+        scheduler.flush()
+        self.assertEqual(scripts, ['a1 again\nb1\na2'])
+        self.assertEqual(scheduler.metrics, {'received': 4, 'merged': 1, 'flushes': 1, 'pending': 0})
+
+    def test_scheduler_appends_deltas(self):
+        scripts = []
+        scheduler = UpdateScheduler(scripts.append)
+        scheduler.rate = 1
+        scheduler.add('markers', 'add', append=True)
+        scheduler.add('bar', 'b1')
+        scheduler.add('markers', 'remove', append=True)
+        scheduler.flush()
+        # the bars are updated before the markers which refer to them
+        self.assertEqual(scripts, ['b1\nadd\nremove'])
+        self.assertEqual(scheduler.metrics['merged'], 0)
+
+
+    def test_pending_updates_run_before_bulk_scripts(self):
+        sent = []
+        window = Window(script_func=sent.append)
+        window.loaded = True
+        window.coalesce_updates(1)
+        window._queue_update('bar', 'b1')
+        with window.bulk_run:
+            window.run_script('direct')
+        self.assertEqual(sent, ['b1', 'direct'])
+
+if __name__ == '__main__':
+    unittest.main()